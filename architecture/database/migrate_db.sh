@@ -0,0 +1,8 @@
+source .env
+
+for migration in migrations/*.sql; do
+    echo "Running $migration ..."
+    psql -h $DB_HOST -U $DB_USER -d $DB_NAME -p $DB_PORT -v ON_ERROR_STOP=1 -f $migration || exit 1
+done
+
+echo "Database migrations complete."
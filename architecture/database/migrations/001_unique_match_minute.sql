@@ -0,0 +1,34 @@
+-- Deduplicates match_minute_stats, keeping the latest row for each
+-- (match_id, match_minute, half), then adds the unique constraint
+-- the pipeline upserts against.
+-- Events linked to a removed duplicate are moved onto the kept row.
+-- Safe to run more than once.
+
+BEGIN;
+
+CREATE TEMP TABLE match_minute_keep ON COMMIT DROP AS
+SELECT
+    match_minute_stats_id,
+    MAX(match_minute_stats_id) OVER (
+        PARTITION BY match_id, match_minute, half
+    ) AS keep_id
+FROM match_minute_stats;
+
+UPDATE match_event AS me
+SET match_minute_stats_id = k.keep_id
+FROM match_minute_keep AS k
+WHERE me.match_minute_stats_id = k.match_minute_stats_id
+AND k.match_minute_stats_id <> k.keep_id;
+
+DELETE FROM match_minute_stats AS mms
+USING match_minute_keep AS k
+WHERE mms.match_minute_stats_id = k.match_minute_stats_id
+AND k.match_minute_stats_id <> k.keep_id;
+
+ALTER TABLE match_minute_stats
+DROP CONSTRAINT IF EXISTS unique_match_minute;
+
+ALTER TABLE match_minute_stats
+ADD CONSTRAINT unique_match_minute UNIQUE (match_id, match_minute, half);
+
+COMMIT;
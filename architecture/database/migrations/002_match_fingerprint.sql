@@ -0,0 +1,12 @@
+-- Adds the table the pipeline keeps each match's last payload fingerprint in,
+-- used when FINGERPRINT_STORE=database.
+-- Safe to run more than once.
+
+CREATE TABLE IF NOT EXISTS match_fingerprint (
+    match_id INT NOT NULL,
+    fingerprint CHAR(40) NOT NULL,
+    flags JSONB NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (match_id),
+    FOREIGN KEY (match_id) REFERENCES match(match_id) ON DELETE CASCADE
+);
@@ -0,0 +1,10 @@
+-- Adds the table the pipeline shares each minute's in-play feed in,
+-- used when LIVESCORE_CACHE=database.
+-- Safe to run more than once.
+
+CREATE TABLE IF NOT EXISTS livescore_cache (
+    minute INT NOT NULL,
+    fixtures JSONB NOT NULL,
+    fetched_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (minute)
+);
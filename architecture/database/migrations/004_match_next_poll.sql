@@ -0,0 +1,6 @@
+-- Adds the time each match is next due to be polled to match_fingerprint,
+-- so lambda_handler can skip the API on a scheduled run that comes early,
+-- used when FINGERPRINT_STORE=database.
+-- Safe to run more than once.
+
+ALTER TABLE match_fingerprint ADD COLUMN IF NOT EXISTS next_poll_at DOUBLE PRECISION;
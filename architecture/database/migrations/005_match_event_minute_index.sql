@@ -0,0 +1,5 @@
+-- Indexes match_event by its minute, so the pipeline can read the events
+-- stored for a match to find the ones the API has removed, e.g. after VAR.
+-- Safe to run more than once.
+
+CREATE INDEX IF NOT EXISTS match_event_minute_idx ON match_event (match_minute_stats_id);
@@ -1,3 +1,5 @@
+DROP TABLE IF EXISTS livescore_cache;
+DROP TABLE IF EXISTS match_fingerprint;
 DROP TABLE IF EXISTS player_match_event;
 DROP TABLE IF EXISTS player;
 DROP TABLE IF EXISTS match_event;
@@ -114,7 +116,8 @@ CREATE TABLE match_minute_stats (
     total_crosses_away SMALLINT,
     PRIMARY KEY (match_minute_stats_id),
     FOREIGN KEY (match_id) REFERENCES match(match_id),
-    CONSTRAINT valid_half_value CHECK (half IN (1,2,3,4,5))
+    CONSTRAINT valid_half_value CHECK (half IN (1,2,3,4,5)),
+    CONSTRAINT unique_match_minute UNIQUE (match_id, match_minute, half)
 );
 
 CREATE TABLE match_event (
@@ -128,6 +131,8 @@ CREATE TABLE match_event (
     FOREIGN KEY (team_id) REFERENCES team(team_id)
 );
 
+CREATE INDEX match_event_minute_idx ON match_event (match_minute_stats_id);
+
 CREATE TABLE player (
     player_id INT NOT NULL,
     player_name VARCHAR(50) NOT NULL,
@@ -146,6 +151,23 @@ CREATE TABLE player_match_event (
     CONSTRAINT unique_event UNIQUE (match_event_id, player_id)
 );
 
+CREATE TABLE match_fingerprint (
+    match_id INT NOT NULL,
+    fingerprint CHAR(40) NOT NULL,
+    flags JSONB NOT NULL,
+    next_poll_at DOUBLE PRECISION,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (match_id),
+    FOREIGN KEY (match_id) REFERENCES match(match_id) ON DELETE CASCADE
+);
+
+CREATE TABLE livescore_cache (
+    minute INT NOT NULL,
+    fixtures JSONB NOT NULL,
+    fetched_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (minute)
+);
+
 INSERT INTO event_type (event_type_id, type_name) VALUES
 (10, 'var'),
 (14, 'goal'),
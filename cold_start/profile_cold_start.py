@@ -0,0 +1,171 @@
+"""
+Measures the cold start of each Lambda handler: the time to import its module
+in a fresh interpreter, the time to also import what its first invocation loads
+with its default configuration, and the peak memory (RSS) at each point.
+With --check, exits with a failure when a handler exceeds its budget in budgets.json.
+"""
+
+from argparse import ArgumentParser
+from json import loads, load
+from os.path import dirname, join, abspath
+from statistics import median
+import re
+import subprocess
+import sys
+
+REPO_ROOT = dirname(dirname(abspath(__file__)))
+BUDGETS_PATH = join(dirname(abspath(__file__)), "budgets.json")
+
+SERVICES = ["pipeline", "scheduler", "stop_trigger",
+            "notification", "seed_master_data", "report"]
+
+# What each handler loads on its first invocation with its default configuration,
+# beyond its own import, e.g. pandas and the type map for the pipeline's pandas engine.
+FIRST_INVOCATION = {
+    "pipeline": "import transform; transform.get_compiled_type_mapping()",
+    "report": "from xhtml2pdf import pisa; from boto3 import client",
+}
+
+IMPORT_SCRIPT = """
+import json, resource, time
+start = time.perf_counter()
+import {module}
+import_ms = (time.perf_counter() - start) * 1000
+rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+{first_invocation}
+first_invocation_ms = (time.perf_counter() - start) * 1000
+first_invocation_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps({{"import_ms": import_ms, "rss_mb": rss_mb,
+                  "first_invocation_ms": first_invocation_ms,
+                  "first_invocation_rss_mb": first_invocation_rss_mb}}))
+"""
+MEASURES = ("import_ms", "rss_mb", "first_invocation_ms", "first_invocation_rss_mb")
+
+
+def get_handler_module(service: str) -> str:
+    """Returns the module of a service's handler, read from the CMD of its Dockerfile."""
+
+    with open(join(REPO_ROOT, service, "Dockerfile"), "r", encoding="utf-8") as f:
+        match = re.search(r'CMD\s*\[\s*"([\w.]+)\.\w+"\s*\]', f.read())
+
+    if not match:
+        raise ValueError(f"No handler CMD found in {service}/Dockerfile.")
+    return match.group(1)
+
+
+def get_slowest_imports(importtime_output: str, count: int) -> list[tuple[str, float]]:
+    """
+    Returns the modules imported directly by the handler module
+    with the largest cumulative import time, in ms.
+    In -X importtime output, these are indented one level below the handler.
+    """
+
+    imports = []
+    for line in importtime_output.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+
+        name = parts[2].rstrip()
+        if len(name) - len(name.lstrip()) != 3:
+            continue
+        imports.append((name.strip(), int(parts[1]) / 1000))
+
+    return sorted(imports, key=lambda item: item[1], reverse=True)[:count]
+
+
+def profile_handler(service: str) -> dict:
+    """
+    Imports a handler module, and what its first invocation loads, once in a fresh interpreter
+    and returns its cold start cost.
+    """
+
+    module = get_handler_module(service)
+    script = IMPORT_SCRIPT.format(module=module,
+                                  first_invocation=FIRST_INVOCATION.get(service, "pass"))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=join(REPO_ROOT, service), capture_output=True, text=True, check=False)
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {service}/{module} failed:\n{result.stderr[-2000:]}")
+
+    profile = loads(result.stdout.strip().splitlines()[-1])
+    profile["slowest_imports"] = get_slowest_imports(result.stderr, 5)
+    return profile
+
+
+def profile_services(services: list[str], runs: int) -> dict[str, dict]:
+    """Returns the median cold start of each service over several runs."""
+
+    profiles = {}
+    for service in services:
+        samples = [profile_handler(service) for _ in range(runs)]
+        profiles[service] = {measure: median(sample[measure] for sample in samples)
+                             for measure in MEASURES}
+        profiles[service]["slowest_imports"] = samples[-1]["slowest_imports"]
+
+    return profiles
+
+
+def get_budget_failures(profiles: dict[str, dict], budgets: dict[str, dict]) -> list[str]:
+    """Returns a message for every measurement over its budget."""
+
+    failures = []
+    for service, profile in profiles.items():
+        for measure in MEASURES:
+            budget = budgets.get(service, {}).get(measure)
+
+            if budget is not None and profile[measure] > budget:
+                failures.append(f"{service} {measure} {profile[measure]:.1f} "
+                                f"is over its budget of {budget}.")
+
+    return failures
+
+
+def print_profiles(profiles: dict[str, dict], budgets: dict[str, dict]) -> None:
+    """Prints each handler's cold start against its budget, and its slowest imports."""
+
+    columns = [("import (ms)", "import_ms"), ("RSS (MB)", "rss_mb"),
+               ("first call (ms)", "first_invocation_ms"),
+               ("first RSS (MB)", "first_invocation_rss_mb")]
+    print(f"{'handler':<18}" + "".join(f"{title:>16}{'budget':>8}" for title, _ in columns))
+    for service, profile in profiles.items():
+        budget = budgets.get(service, {})
+        print(f"{service:<18}" + "".join(f"{profile[measure]:>16.1f}{budget.get(measure, '-'):>8}"
+                                         for _, measure in columns))
+
+    print("\nSlowest imports by each handler module (cumulative ms):")
+    for service, profile in profiles.items():
+        slowest = ", ".join(f"{name} {ms:.0f}" for name, ms in profile["slowest_imports"])
+        print(f"{service:<18}{slowest}")
+
+
+def main() -> int:
+    """Profiles the handlers, returning a failing exit code when --check finds a budget exceeded."""
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("services", nargs="*", default=SERVICES)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--check", action="store_true",
+                        help="fail if any handler is over its budget")
+    args = parser.parse_args()
+
+    with open(BUDGETS_PATH, "r", encoding="utf-8") as f:
+        budgets = load(f)
+
+    profiles = profile_services(args.services, args.runs)
+    print_profiles(profiles, budgets)
+
+    if not args.check:
+        return 0
+
+    failures = get_budget_failures(profiles, budgets)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+
+    sys.exit(main())
@@ -0,0 +1,60 @@
+# pylint: skip-file
+"""Tests for the profile_cold_start.py script."""
+
+from profile_cold_start import (get_handler_module, get_slowest_imports,
+                                get_budget_failures, SERVICES)
+
+
+def test_get_handler_module_reads_every_dockerfile():
+
+    modules = {service: get_handler_module(service) for service in SERVICES}
+
+    assert modules["pipeline"] == "pipeline"
+    assert modules["notification"] == "goal_notification"
+    assert modules["seed_master_data"] == "handler"
+    assert modules["report"] == "report"
+
+
+def test_get_slowest_imports_only_counts_direct_imports():
+
+    output = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       100 |        150 |     numpy.core",
+        "import time:       200 |     400000 |   pandas",
+        "import time:        50 |      20000 |   dotenv",
+        "import time:      1000 |     421000 | pipeline",
+    ])
+
+    assert get_slowest_imports(output, 5) == [("pandas", 400.0), ("dotenv", 20.0)]
+
+
+def test_get_budget_failures_reports_each_exceeded_measure():
+
+    profiles = {"pipeline": {"import_ms": 350.0, "rss_mb": 30.0},
+                "notification": {"import_ms": 10.0, "rss_mb": 30.0}}
+    budgets = {"pipeline": {"import_ms": 300, "rss_mb": 45},
+               "notification": {"import_ms": 60, "rss_mb": 25}}
+
+    failures = get_budget_failures(profiles, budgets)
+
+    assert len(failures) == 2
+    assert failures[0].startswith("pipeline import_ms")
+    assert failures[1].startswith("notification rss_mb")
+
+
+def test_get_budget_failures_ignores_missing_budgets():
+
+    assert get_budget_failures({"report": {"import_ms": 1.0, "rss_mb": 1.0}}, {}) == []
+
+
+def test_get_budget_failures_checks_first_invocation_budgets():
+
+    profiles = {"pipeline": {"import_ms": 150.0, "rss_mb": 28.0,
+                             "first_invocation_ms": 1500.0, "first_invocation_rss_mb": 115.0}}
+    budgets = {"pipeline": {"import_ms": 300, "rss_mb": 45,
+                            "first_invocation_ms": 1200, "first_invocation_rss_mb": 140}}
+
+    failures = get_budget_failures(profiles, budgets)
+
+    assert len(failures) == 1
+    assert failures[0].startswith("pipeline first_invocation_ms")
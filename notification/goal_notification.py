@@ -3,8 +3,7 @@
 from os import environ as ENV
 import logging
 
-import boto3
-from dotenv import load_dotenv
+from profiling import profile_handler
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(
@@ -14,10 +13,12 @@ logging.basicConfig(
 )
 
 
+@profile_handler
 def lambda_handler(event=None, context=None):
-    """Lambda function for the creation of goal notifications."""
-
-    client = boto3.client('sns')
+    """
+    Lambda function for the creation of goal notifications.
+    Most runs have no new goals, so boto3 is only imported once there is one to send.
+    """
 
     flags = event["flags"]
     goal_info = flags.get("goal_check", [])
@@ -29,6 +30,9 @@ def lambda_handler(event=None, context=None):
             "status": "No new goals found."
         }
 
+    import boto3  # pylint: disable=import-outside-toplevel
+    client = boto3.client('sns')
+
     messages_sent = []
     for goal in goal_info:
 
@@ -58,4 +62,5 @@ def create_goal_message(goal: dict) -> str:
 
 if __name__ == "__main__":
 
+    from dotenv import load_dotenv
     load_dotenv()
@@ -0,0 +1,185 @@
+"""
+An append-only archive of the raw API snapshots of a match.
+Snapshots are appended to match_<id>.ndjson.gz as one JSON line per gzip member,
+so the whole file still reads as newline-delimited JSON with zcat or gzip.open,
+and match_<id>.idx records the minute, offset and length of each one,
+so any snapshot can be read without decompressing the rest.
+"""
+
+from argparse import ArgumentParser
+from json import dumps, loads, load
+from os import listdir, path, SEEK_END
+import gzip
+import re
+
+from match_state import get_active_period
+
+ARCHIVE_SUFFIX = ".ndjson.gz"
+INDEX_SUFFIX = ".idx"
+SCRAPE_FILE = re.compile(r"^scrape_(\d+)\.json$")
+
+
+def get_snapshot_minute(snapshot: dict) -> int:
+    """Returns the minute of a snapshot, or -1 for errors and games not started."""
+
+    fixture = snapshot.get("data")
+    if isinstance(fixture, list):
+        fixture = fixture[0] if fixture else None
+
+    if not fixture or not fixture.get("periods"):
+        return -1
+    return get_active_period(fixture["periods"]).get("minutes", -1)
+
+
+def parse_index_line(line: str) -> tuple[int, int, int] | None:
+    """Returns the minute, offset and length of an index line, or None if it is incomplete."""
+
+    parts = line.split()
+    if len(parts) != 3:
+        return None
+    try:
+        minute, offset, length = map(int, parts)
+    except ValueError:
+        return None
+    return minute, offset, length
+
+
+class SnapshotArchive:
+    """
+    Appends snapshots to and reads them from the archive at a base path, e.g. match_19348530.
+    Appending writes the compressed snapshot before its index line, so a snapshot
+    interrupted mid-write is never indexed and is ignored by the reader,
+    and an index line cut short is ended before the next one is written.
+    """
+
+    def __init__(self, base_path: str):
+        self.archive_path = base_path + ARCHIVE_SUFFIX
+        self.index_path = base_path + INDEX_SUFFIX
+
+    def append(self, snapshot: dict) -> None:
+        """Appends a snapshot, in constant time whatever the size of the archive."""
+
+        block = gzip.compress(
+            (dumps(snapshot, separators=(",", ":")) + "\n").encode("utf-8"))
+
+        with open(self.archive_path, "ab") as archive:
+            offset = archive.tell()
+            archive.write(block)
+
+        entry = f"{get_snapshot_minute(snapshot)} {offset} {len(block)}\n".encode("utf-8")
+        with open(self.index_path, "a+b") as index:
+            if index.seek(0, SEEK_END):
+                index.seek(-1, SEEK_END)
+                if index.read(1) != b"\n":
+                    entry = b"\n" + entry
+            index.write(entry)
+
+    def read_index(self) -> list[tuple[int, int, int]]:
+        """Returns the minute, offset and length of every snapshot, in the order appended."""
+
+        if not path.exists(self.index_path):
+            return []
+
+        with open(self.index_path, "r", encoding="utf-8") as index:
+            return [entry for line in index if (entry := parse_index_line(line))]
+
+    def read_entry(self, archive, entry: tuple[int, int, int]) -> dict:
+        """Reads the snapshot at an index entry from an open archive file."""
+
+        _, offset, length = entry
+        archive.seek(offset)
+        return loads(gzip.decompress(archive.read(length)))
+
+    def __len__(self) -> int:
+        return len(self.read_index())
+
+    def __iter__(self):
+        """Yields every snapshot in the order appended."""
+
+        entries = self.read_index()
+        if not entries:
+            return
+
+        with open(self.archive_path, "rb") as archive:
+            for entry in entries:
+                yield self.read_entry(archive, entry)
+
+    def get(self, position: int) -> dict:
+        """Returns the snapshot at a position, negative positions counting from the end."""
+
+        entry = self.read_index()[position]
+        with open(self.archive_path, "rb") as archive:
+            return self.read_entry(archive, entry)
+
+    def get_minute(self, minute: int) -> dict | None:
+        """Returns the last snapshot taken at a minute, or None if there is none."""
+
+        entries = [entry for entry in self.read_index() if entry[0] == minute]
+        if not entries:
+            return None
+
+        with open(self.archive_path, "rb") as archive:
+            return self.read_entry(archive, entries[-1])
+
+
+def get_base_path(archive_path: str) -> str:
+    """Returns the base path of an archive given with or without either suffix."""
+
+    return archive_path.removesuffix(ARCHIVE_SUFFIX).removesuffix(INDEX_SUFFIX)
+
+
+def is_archive(base_path: str) -> bool:
+    """Returns True if an archive exists at a base path."""
+
+    return path.exists(base_path + INDEX_SUFFIX)
+
+
+def get_scrape_files(match_dir: str) -> list[str]:
+    """Returns the scrape files in a match directory, in the order they were scraped."""
+
+    numbered = [(int(match.group(1)), name) for name in listdir(match_dir)
+                if (match := SCRAPE_FILE.match(name))]
+
+    return [path.join(match_dir, name) for _, name in sorted(numbered)]
+
+
+def convert_scrape_directory(match_dir: str, base_path: str) -> int:
+    """Appends the scrape files in a match directory to an archive, returning how many."""
+
+    archive = SnapshotArchive(base_path)
+    files = get_scrape_files(match_dir)
+
+    for file_path in files:
+        with open(file_path, "r", encoding="utf-8") as f:
+            archive.append(load(f))
+
+    return len(files)
+
+
+def main() -> None:
+    """Prints a snapshot from an archive, or converts a directory of scrapes into one."""
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("base_path", help="the archive without its suffix, e.g. match_19348530")
+    parser.add_argument("--minute", type=int, help="print the last snapshot of this minute")
+    parser.add_argument("--convert", metavar="MATCH_DIR",
+                        help="append the scrape_N.json files of a directory to the archive")
+    args = parser.parse_args()
+    base_path = get_base_path(args.base_path)
+
+    if args.convert:
+        count = convert_scrape_directory(args.convert, base_path)
+        print(f"Archived {count} snapshots to {base_path}{ARCHIVE_SUFFIX}.")
+        return
+
+    archive = SnapshotArchive(base_path)
+    if args.minute is None:
+        print(f"{len(archive)} snapshots, minutes: "
+              f"{sorted({entry[0] for entry in archive.read_index()})}")
+        return
+
+    print(dumps(archive.get_minute(args.minute), indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Micro-benchmarks converting an event DataFrame into insert values,
+comparing the old row by row iterrows loop with get_values_from_dataframe.
+"""
+
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from load import get_values_from_dataframe
+
+ROW_COUNTS = [10, 1_000, 100_000]
+
+
+def get_values_with_iterrows(df: pd.DataFrame) -> list[tuple]:
+    """The row by row conversion insert_dataframe used before get_values_from_dataframe."""
+
+    values = []
+    for _, row in df.iterrows():
+        processed_row = []
+        for item in row:
+            if pd.isna(item):
+                processed_row.append(None)
+            elif isinstance(item, float) and item.is_integer():
+                processed_row.append(int(item))
+            else:
+                processed_row.append(item)
+        values.append(tuple(processed_row))
+    return values
+
+
+def build_event_df(row_count: int) -> pd.DataFrame:
+    """Returns an event DataFrame with the nulls a live match usually has."""
+
+    ids = np.arange(row_count)
+    related_player_ids = np.where(ids % 3 == 0, ids + 5000.0, np.nan)
+
+    return pd.DataFrame({
+        "match_event_id": ids + 100_000,
+        "match_minute_stats_id": 7,
+        "event_type_id": np.where(ids % 4 == 0, 14, 19),
+        "team_id": np.where(ids % 2 == 0, 10, 20),
+        "player_id": ids + 1000.0,
+        "related_player_id": related_player_ids,
+        "addition": np.where(ids % 5 == 0, "1st Goal", None),
+        "player_name": [f"Player {i}" for i in ids]
+    })
+
+
+def time_conversion(function, df: pd.DataFrame) -> float:
+    """Returns the best time in milliseconds of converting the DataFrame."""
+
+    runs = 5 if len(df) < 100_000 else 1
+    best = float("inf")
+    for _ in range(runs):
+        start = perf_counter()
+        function(df)
+        best = min(best, perf_counter() - start)
+    return best * 1000
+
+
+def run_benchmark() -> None:
+    """Prints the conversion time of both approaches for each row count."""
+
+    print(f"{'rows':>8}{'iterrows (ms)':>16}{'columns (ms)':>15}{'speedup':>10}")
+    for row_count in ROW_COUNTS:
+        df = build_event_df(row_count)
+
+        if get_values_with_iterrows(df) != get_values_from_dataframe(df):
+            raise ValueError(f"Conversions differ for {row_count} rows.")
+
+        iterrows_ms = time_conversion(get_values_with_iterrows, df)
+        columns_ms = time_conversion(get_values_from_dataframe, df)
+        print(f"{row_count:>8}{iterrows_ms:>16.2f}{columns_ms:>15.2f}"
+              f"{iterrows_ms / columns_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+
+    run_benchmark()
@@ -0,0 +1,77 @@
+"""
+Reports the cache hit rate and API calls saved by the shared live score cache.
+Simulates every live match's execution polling at once each minute, against the
+fake API, with and without the cache, and counts the requests the API receives.
+Uses the SQLite cache, with each execution opening its own connection to it.
+"""
+
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+from tempfile import TemporaryDirectory
+
+from extract import build_scrape_url, fetch_live_fixtures, scrape_live_match
+from fake_sportmonks import FakeSportmonks
+from livescore_cache import SqliteLiveScoreCache, get_live_fixture
+from sportmonks import BUCKETS
+
+
+def poll_uncached(fake: FakeSportmonks, match_id: int, minute: int) -> bool:  # pylint: disable=unused-argument
+    """Requests the match on its own, as each execution does without the cache."""
+
+    conn = fake.connect()
+    scrape_live_match(build_scrape_url(match_id, "x"), conn)
+    conn.close()
+    return False
+
+
+def poll_cached(fake: FakeSportmonks, match_id: int, minute: int, cache_path: str) -> bool:
+    """Reads the match from the minute's cached in-play feed, returning if it was a hit."""
+
+    conn = fake.connect()
+    _, hit = get_live_fixture(SqliteLiveScoreCache(cache_path), match_id,
+                              lambda: fetch_live_fixtures("x", conn), minute)
+    conn.close()
+    return hit
+
+
+def simulate(poll, matches: int, minutes: int) -> tuple[int, int]:
+    """Runs every match's execution at once each minute, returning the API requests and hits."""
+
+    BUCKETS.clear()
+    fixtures = [{"id": match_id, "result_info": None, "periods": [{"minutes": 1}]}
+                for match_id in range(1, matches + 1)]
+
+    with FakeSportmonks(fixtures) as fake, ThreadPoolExecutor(matches) as executor:
+        hits = sum(sum(executor.map(lambda match_id, m=minute: poll(fake, match_id, m),
+                                    range(1, matches + 1)))
+                   for minute in range(minutes))
+        return len(fake.requests), hits
+
+
+def main() -> None:
+    """Prints the API requests with and without the cache, the hit rate and the savings."""
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--matches", type=int, default=10)
+    parser.add_argument("--minutes", type=int, default=5)
+    args = parser.parse_args()
+
+    executions = args.matches * args.minutes
+    uncached, _ = simulate(poll_uncached, args.matches, args.minutes)
+
+    with TemporaryDirectory() as directory:
+        cache_path = path.join(directory, "livescore_cache.db")
+        cached, hits = simulate(
+            lambda fake, match_id, minute: poll_cached(fake, match_id, minute, cache_path),
+            args.matches, args.minutes)
+
+    print(f"{args.matches} matches for {args.minutes} minutes: {executions} executions")
+    print(f"API requests without cache: {uncached}")
+    print(f"API requests with cache:    {cached}")
+    print(f"Cache hit rate:             {hits / executions:.1%}")
+    print(f"API calls saved:            {uncached - cached} ({1 - cached / uncached:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Benchmarks load throughput of the execute_values and COPY engines.
+Runs against the database in the environment variables, seeding and then
+removing a fake match, so point it at a local or scratch database.
+"""
+
+from time import perf_counter
+
+from dotenv import load_dotenv
+import pandas as pd
+from psycopg2.extensions import connection
+
+from load import get_connection, LOAD_ENGINES
+
+BENCHMARK_MATCH_ID = 990_001
+BENCHMARK_TEAM_IDS = (990_001, 990_002)
+ID_OFFSET = 900_000_000
+ROW_COUNTS = [100, 1_000, 10_000]
+
+
+def seed_benchmark_match(db_conn: connection) -> None:
+    """Inserts the teams and match the benchmark rows belong to."""
+
+    with db_conn.cursor() as cursor:
+        cursor.executemany(
+            """INSERT INTO team (team_id, team_name) VALUES (%s, %s)
+            ON CONFLICT DO NOTHING""",
+            [(team_id, f"Benchmark {team_id}") for team_id in BENCHMARK_TEAM_IDS])
+        cursor.execute(
+            """INSERT INTO match (match_id, home_team_id, away_team_id)
+            VALUES (%s, %s, %s) ON CONFLICT DO NOTHING""",
+            (BENCHMARK_MATCH_ID, *BENCHMARK_TEAM_IDS))
+    db_conn.commit()
+
+
+def clear_benchmark_rows(db_conn: connection, remove_match: bool = False) -> None:
+    """Deletes every row the benchmark inserted."""
+
+    with db_conn.cursor() as cursor:
+        cursor.execute(
+            "DELETE FROM match_minute_stats WHERE match_id = %s", (BENCHMARK_MATCH_ID,))
+        cursor.execute(
+            "DELETE FROM player WHERE player_id >= %s", (ID_OFFSET,))
+        if remove_match:
+            cursor.execute(
+                "DELETE FROM match WHERE match_id = %s", (BENCHMARK_MATCH_ID,))
+            cursor.execute(
+                "DELETE FROM team WHERE team_id IN %s", (BENCHMARK_TEAM_IDS,))
+    db_conn.commit()
+
+
+def build_tables(row_count: int) -> dict[str, pd.DataFrame]:
+    """Returns DataFrames shaped like each pipeline table, with nulls where the pipeline has them."""
+
+    ids = pd.RangeIndex(row_count)
+
+    minute_df = pd.DataFrame({
+        "match_id": BENCHMARK_MATCH_ID,
+        "match_minute": ids % 120,
+        "half": 1,
+        "shots_home": (ids % 20).astype(float),
+        "shots_away": [None if i % 3 else float(i % 20) for i in ids],
+        "possession_home": 50
+    })
+
+    event_df = pd.DataFrame({
+        "match_event_id": ID_OFFSET + ids,
+        "event_type_id": 19,
+        "team_id": BENCHMARK_TEAM_IDS[0]
+    })
+
+    player_df = pd.DataFrame({
+        "player_id": ID_OFFSET + ids,
+        "player_name": [f"Player {i}" for i in ids]
+    })
+
+    link_df = pd.DataFrame({
+        "match_event_id": ID_OFFSET + ids,
+        "player_id": ID_OFFSET + ids,
+        "related_player_id": [None if i % 2 else ID_OFFSET + (i + 1) % row_count
+                              for i in ids]
+    })
+
+    return {"minute": minute_df, "event": event_df,
+            "player": player_df, "link": link_df}
+
+
+def time_engine(engine: str, tables: dict[str, pd.DataFrame],
+                db_conn: connection) -> dict[str, float]:
+    """Returns the seconds each table took to load with the given engine."""
+
+    insert = LOAD_ENGINES[engine]
+    timings = {}
+
+    start = perf_counter()
+    minute_ids = insert(tables["minute"], "match_minute_stats",
+                        db_conn, "match_minute_stats_id")
+    timings["match_minute_stats"] = perf_counter() - start
+
+    event_df = tables["event"].copy()
+    event_df["match_minute_stats_id"] = minute_ids[0][0]
+
+    start = perf_counter()
+    insert(event_df, "match_event", db_conn,
+           "match_event_id", "match_event_id")
+    timings["match_event"] = perf_counter() - start
+
+    start = perf_counter()
+    insert(tables["player"], "player", db_conn,
+           returning="player_id", conflict="player_id")
+    timings["player"] = perf_counter() - start
+
+    start = perf_counter()
+    insert(tables["link"], "player_match_event", db_conn,
+           conflict=["match_event_id", "player_id"])
+    timings["player_match_event"] = perf_counter() - start
+
+    return timings
+
+
+def run_benchmark() -> None:
+    """Prints rows per second for each table, engine and row count."""
+
+    db_conn = get_connection()
+    seed_benchmark_match(db_conn)
+
+    print(f"{'rows':>8} {'table':<20}{'values (rows/s)':>18}{'copy (rows/s)':>16}")
+    try:
+        for row_count in ROW_COUNTS:
+            tables = build_tables(row_count)
+            results = {}
+
+            for engine in LOAD_ENGINES:
+                clear_benchmark_rows(db_conn)
+                results[engine] = time_engine(engine, tables, db_conn)
+
+            for table in results["values"]:
+                values_rate = row_count / results["values"][table]
+                copy_rate = row_count / results["copy"][table]
+                print(f"{row_count:>8} {table:<20}{values_rate:>18,.0f}{copy_rate:>16,.0f}")
+    finally:
+        clear_benchmark_rows(db_conn, remove_match=True)
+        db_conn.close()
+
+
+if __name__ == "__main__":
+
+    load_dotenv()
+    run_benchmark()
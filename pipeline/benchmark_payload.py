@@ -0,0 +1,147 @@
+"""
+Measures the bytes per poll of a fixture before and after trimming the request,
+with and without gzip. Trimming asks the API only for the fields, statistic types
+and event types in columns.py.
+Reads the last snapshot of a recorded match (an archive or a directory of scrapes),
+or builds a synthetic full payload, and trims it locally the way the API would.
+With --live MATCH_ID, it requests both versions from the API instead, using TOKEN.
+"""
+
+from argparse import ArgumentParser
+from http.client import HTTPSConnection
+from json import dumps, load
+from os import environ as ENV, path
+import gzip
+
+from archive import SnapshotArchive, get_base_path, get_scrape_files, is_archive
+from benchmark_type_map import build_sample_payload
+from columns import trim_fixture
+from extract import build_scrape_url
+from sportmonks import API_HOST, API_PREFIX
+from type_map import TYPE_MAP
+
+FIXTURE_BULK = {
+    "sport_id": 1, "league_id": 8, "season_id": 23614, "stage_id": 77471288,
+    "group_id": None, "aggregate_id": None, "round_id": 339235, "state_id": 2,
+    "venue_id": 8909, "name": "Liverpool vs Chelsea", "starting_at": "2025-01-11 19:00:00",
+    "leg": "1/1", "details": None, "length": 90, "placeholder": False,
+    "has_odds": True, "has_premium_odds": True, "starting_at_timestamp": 1736622000
+}
+
+UNSTORED_STATISTICS = ["accurate_crosses", "ball_safe", "goal_attempts", "goal_kicks",
+                       "injuries", "long_passes", "shots_off_target", "throwins",
+                       "assists", "goals", "substitutions", "yellowcards", "redcards"]
+
+
+def build_full_payload() -> dict:
+    """Returns a synthetic fixture as the untrimmed request returns it."""
+
+    fixture = {**FIXTURE_BULK, **build_sample_payload(19411877)}
+    names = {name: type_id for type_id, name in reversed(TYPE_MAP.items())}
+
+    fixture["statistics"] += [
+        {"id": 1000 + index, "fixture_id": fixture["id"], "type_id": names[name],
+         "participant_id": 10 if location == "home" else 20,
+         "data": {"value": index}, "location": location}
+        for index, (name, location) in enumerate(
+            (name, location) for name in UNSTORED_STATISTICS for location in ("home", "away"))]
+
+    fixture["periods"] = [{"id": 1, "fixture_id": fixture["id"], "type_id": 1,
+                           "started": 1736622000, "ended": None, "counts_from": 0,
+                           "ticking": True, "sort_order": 1, "description": "1st-half",
+                           "time_added": None, "period_length": 45, "minutes": 45,
+                           "seconds": 12, "has_timer": True}]
+    return {"data": fixture}
+
+
+def load_recorded_snapshot(source: str) -> dict:
+    """Returns the last snapshot with data of an archive or a directory of scrapes."""
+
+    if is_archive(get_base_path(source)):
+        snapshots = list(SnapshotArchive(get_base_path(source)))
+    else:
+        snapshots = []
+        for file_path in get_scrape_files(source):
+            with open(file_path, "r", encoding="utf-8") as f:
+                snapshots.append(load(f))
+
+    return [snapshot for snapshot in snapshots if "data" in snapshot][-1]
+
+
+def get_sizes(body: bytes) -> tuple[int, int]:
+    """Returns the size of a response body, raw and gzip compressed."""
+
+    return len(body), len(gzip.compress(body))
+
+
+def measure_local(snapshot: dict) -> dict[str, tuple[int, int]]:
+    """Returns the raw and gzip bytes of a snapshot, untrimmed and trimmed locally."""
+
+    fixture = snapshot["data"]
+    if isinstance(fixture, list):
+        fixture = fixture[0]
+
+    return {
+        "untrimmed": get_sizes(dumps({"data": fixture}).encode("utf-8")),
+        "trimmed": get_sizes(dumps({"data": trim_fixture(fixture)}).encode("utf-8"))
+    }
+
+
+def fetch_size(url: str, compressed: bool) -> int:
+    """Returns the bytes the API sends for a url."""
+
+    conn = HTTPSConnection(API_HOST)
+    headers = {"Accept-Encoding": "gzip"} if compressed else {}
+    conn.request("GET", f"{API_PREFIX}{url}", "", headers)
+    size = len(conn.getresponse().read())
+    conn.close()
+    return size
+
+
+def measure_live(match_id: int, token: str) -> dict[str, tuple[int, int]]:
+    """Returns the raw and gzip bytes the API sends for a match, untrimmed and trimmed."""
+
+    return {
+        name: (fetch_size(url, False), fetch_size(url, True))
+        for name, url in (("untrimmed", build_scrape_url(match_id, token, trimmed=False)),
+                          ("trimmed", build_scrape_url(match_id, token)))
+    }
+
+
+def print_sizes(sizes: dict[str, tuple[int, int]]) -> None:
+    """Prints the bytes per poll of each request, and the saving against the original."""
+
+    baseline = sizes["untrimmed"][0]
+    print(f"{'bytes per poll':<16}{'raw':>10}{'gzip':>10}{'of original':>14}")
+    for name, (raw, compressed) in sizes.items():
+        print(f"{name:<16}{raw:>10}{compressed:>10}{compressed / baseline:>14.1%}")
+
+
+def main() -> None:
+    """Measures the recorded match, live match or synthetic payload asked for."""
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("source", nargs="?",
+                        help="a match_<id> archive or directory of scrapes")
+    parser.add_argument("--live", type=int, metavar="MATCH_ID",
+                        help="request a match from the API instead, using TOKEN")
+    args = parser.parse_args()
+
+    if args.live:
+        print_sizes(measure_live(args.live, ENV["TOKEN"]))
+        return
+
+    if args.source and not path.exists(args.source) and not is_archive(
+            get_base_path(args.source)):
+        parser.error(f"{args.source} is not an archive or directory of scrapes.")
+
+    snapshot = load_recorded_snapshot(args.source) if args.source else build_full_payload()
+    print_sizes(measure_local(snapshot))
+
+
+if __name__ == "__main__":
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    main()
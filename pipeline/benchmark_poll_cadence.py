@@ -0,0 +1,135 @@
+"""
+Reports the API calls saved per match by polling at the cadence each match's state asks for,
+against the schedule's one poll a minute from kick off to MAX_MATCH_HOURS after it,
+both for the worker, which polls at that cadence, and for lambda_handler, which is still
+invoked each minute but skips the API until the match is due.
+Replays recorded matches (archives or directories of scrapes), taking each snapshot as
+one minute after the last, or a synthetic match with a delayed start, stoppage time,
+a half-time break and goals and a red card.
+"""
+
+from argparse import ArgumentParser
+from json import load
+
+from archive import SnapshotArchive, get_base_path, get_scrape_files, is_archive
+from match_state import get_poll_interval, POLL_TOLERANCE_SECONDS
+
+MAX_MATCH_HOURS = 3
+FIXED_POLLS = MAX_MATCH_HOURS * 60
+
+
+def load_timeline(source: str) -> list[dict | None]:
+    """Returns the fixture of each minute of a recorded match, or None where a scrape failed."""
+
+    if is_archive(get_base_path(source)):
+        snapshots = list(SnapshotArchive(get_base_path(source)))
+    else:
+        snapshots = []
+        for file_path in get_scrape_files(source):
+            with open(file_path, "r", encoding="utf-8") as f:
+                snapshots.append(load(f))
+
+    timeline = []
+    for snapshot in snapshots:
+        fixture = snapshot.get("data")
+        if isinstance(fixture, list):
+            fixture = fixture[0] if fixture else None
+        timeline.append(fixture if isinstance(fixture, dict) else None)
+    return timeline
+
+
+def build_synthetic_timeline(delay: int = 6, first_stoppage: int = 3, break_minutes: int = 15,
+                             second_stoppage: int = 5) -> list[dict]:
+    """Returns the fixture of each minute of a synthetic match, ending at full time."""
+
+    events = [{"type_id": 14, "minute": 23}, {"type_id": 19, "minute": 58},
+              {"type_id": 14, "minute": 67}, {"type_id": 20, "minute": 80}]
+
+    def build_fixture(periods: list[dict], result_info: str = None) -> dict:
+        minute = periods[-1]["minutes"] if periods else 0
+        return {"result_info": result_info, "periods": periods,
+                "events": [event for event in events if event["minute"] <= minute]}
+
+    timeline = [build_fixture([]) for _ in range(delay)]
+    first_half = {"type_id": 1, "ticking": True}
+    timeline += [build_fixture([{**first_half, "minutes": minute}])
+                 for minute in range(1, 46 + first_stoppage)]
+
+    first_half = {**first_half, "ticking": False, "minutes": 45 + first_stoppage}
+    timeline += [build_fixture([first_half]) for _ in range(break_minutes)]
+
+    second_half = {"type_id": 2, "ticking": True}
+    timeline += [build_fixture([first_half, {**second_half, "minutes": minute}])
+                 for minute in range(46, 91 + second_stoppage)]
+    timeline.append(build_fixture(
+        [first_half, {**second_half, "ticking": False, "minutes": 90 + second_stoppage}],
+        "Game ended in draw."))
+    return timeline
+
+
+def count_adaptive_polls(timeline: list[dict | None]) -> int:
+    """
+    Returns the polls of a match at the cadence its state asks for,
+    polling until full time, the end of the timeline or MAX_MATCH_HOURS.
+    """
+
+    seconds = polls = 0
+    while seconds < min(len(timeline), FIXED_POLLS) * 60:
+        polls += 1
+        fixture = timeline[int(seconds // 60)]
+        poll_seconds = get_poll_interval(fixture) if fixture else 60
+        if poll_seconds is None:
+            break
+        seconds += poll_seconds
+    return polls
+
+
+def count_scheduled_polls(timeline: list[dict | None]) -> int:
+    """
+    Returns the API calls of a match invoked each minute by the schedule,
+    when each invocation before the match is due skips the API.
+    """
+
+    polls = 0
+    next_poll_at = 0
+    for minute, fixture in enumerate(timeline[:FIXED_POLLS]):
+        if minute * 60 < next_poll_at - POLL_TOLERANCE_SECONDS:
+            continue
+        polls += 1
+        poll_seconds = get_poll_interval(fixture) if fixture else 60
+        if poll_seconds is None:
+            break
+        next_poll_at = minute * 60 + poll_seconds
+    return polls
+
+
+def print_report(timelines: dict[str, list[dict | None]]) -> None:
+    """Prints the fixed, adaptive and scheduled polls of each match, and the calls saved."""
+
+    print(f"{'match':<24}{'fixed':>8}{'adaptive':>10}{'saved':>8}{'of fixed':>10}"
+          f"{'lambda':>8}{'saved':>8}{'of fixed':>10}")
+    for name, timeline in timelines.items():
+        adaptive = count_adaptive_polls(timeline)
+        scheduled = count_scheduled_polls(timeline)
+        saved = FIXED_POLLS - adaptive
+        scheduled_saved = FIXED_POLLS - scheduled
+        print(f"{name:<24}{FIXED_POLLS:>8}{adaptive:>10}{saved:>8}{saved / FIXED_POLLS:>10.1%}"
+              f"{scheduled:>8}{scheduled_saved:>8}{scheduled_saved / FIXED_POLLS:>10.1%}")
+
+
+def main() -> None:
+    """Reports the recorded matches given, or a synthetic match."""
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("sources", nargs="*",
+                        help="match_<id> archives or directories of scrapes")
+    args = parser.parse_args()
+
+    if args.sources:
+        print_report({source: load_timeline(source) for source in args.sources})
+    else:
+        print_report({"synthetic": build_synthetic_timeline()})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Measures the peak memory of decoding a gzipped multi-fixture response as the number
+of live fixtures grows, comparing decoding the whole body at once, as get_json does,
+against decoding one fixture at a time as the response is read, as stream_json does.
+The response is read from memory, so the measurement is only the decoding.
+"""
+
+from io import BytesIO
+from json import dumps, loads
+from time import perf_counter
+import gzip
+import tracemalloc
+
+from benchmark_payload import build_full_payload
+from metrics import start_run
+from sportmonks import iter_items, read_body, read_chunks
+
+FIXTURE_COUNTS = [10, 100, 1000]
+
+
+class RecordedResponse(BytesIO):
+    """A gzipped response body in memory, read like an HTTPResponse."""
+
+    def getheader(self, name: str) -> str | None:
+        """Returns the response's headers, which only say it is gzipped."""
+        return "gzip" if name == "Content-Encoding" else None
+
+
+def build_body(count: int) -> bytes:
+    """Returns a gzipped response body with count synthetic untrimmed fixtures."""
+
+    fixture = build_full_payload()["data"]
+    fixtures = [{**fixture, "id": match_id} for match_id in range(count)]
+    return gzip.compress(dumps({"data": fixtures, "rate_limit": {"remaining": 2999}}).encode())
+
+
+def decode_whole(body: bytes) -> int:
+    """Decodes the whole response at once, returning the number of fixtures."""
+
+    return len(loads(read_body(RecordedResponse(body)))["data"])
+
+
+def decode_streamed(body: bytes) -> int:
+    """Decodes the response one fixture at a time, returning the number of fixtures."""
+
+    return sum(1 for _ in iter_items(read_chunks(RecordedResponse(body))))
+
+
+def measure(decode, body: bytes) -> tuple[float, float]:
+    """Returns the peak memory in MB and the time in ms of a decode."""
+
+    tracemalloc.start()
+    start = perf_counter()
+    decode(body)
+    elapsed = (perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 ** 2, elapsed
+
+
+if __name__ == "__main__":
+
+    start_run("benchmark")
+    print(f"{'fixtures':>8}{'whole MB':>10}{'stream MB':>11}{'whole ms':>10}{'stream ms':>11}")
+    for fixture_count in FIXTURE_COUNTS:
+        response_body = build_body(fixture_count)
+        whole_mb, whole_ms = measure(decode_whole, response_body)
+        stream_mb, stream_ms = measure(decode_streamed, response_body)
+        print(f"{fixture_count:>8}{whole_mb:>10.2f}{stream_mb:>11.2f}"
+              f"{whole_ms:>10.1f}{stream_ms:>11.1f}")
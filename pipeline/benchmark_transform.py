@@ -0,0 +1,80 @@
+"""
+Benchmarks the two transform engines on a single live fixture,
+from the decoded API response to the rows sent to the database,
+and the pandas engine on a poll of many fixtures, one at a time against one pass.
+"""
+
+import logging
+
+from transform import get_dataframe_from_response, transform_data, transform_fixtures
+from dict_transform import transform_fixture
+from load import get_values_from_dataframe, get_players_df, get_player_rows
+from benchmark_type_map import build_sample_payload, time_runs
+
+RUNS = 200
+FIXTURE_COUNTS = [10, 100, 300]
+MULTI_RUNS = 5
+
+
+def run_pandas_engine(payload: dict) -> None:
+    """Transforms the payload with pandas, and converts it to rows as load does."""
+
+    minute_df, event_df, _ = transform_data(
+        get_dataframe_from_response({"data": payload}))
+    get_values_from_dataframe(minute_df)
+    get_values_from_dataframe(event_df)
+    get_values_from_dataframe(get_players_df(event_df))
+
+
+def run_dict_engine(payload: dict) -> None:
+    """Transforms the payload with plain dicts, building the same rows."""
+
+    minute_row, event_rows, _ = transform_fixture(payload)
+    tuple(minute_row.values())
+    get_player_rows(event_rows)
+
+
+def run_per_fixture(payloads: list[dict]) -> None:
+    """Transforms each fixture of a poll on its own with pandas."""
+
+    for payload in payloads:
+        transform_data(get_dataframe_from_response({"data": payload}))
+
+
+def run_one_pass(payloads: list[dict]) -> None:
+    """Transforms every fixture of a poll in one pass with pandas."""
+
+    transform_fixtures(get_dataframe_from_response({"data": payloads}))
+
+
+def run_multi_fixture_benchmark() -> None:
+    """Prints the cost of transforming a poll of many fixtures with pandas."""
+
+    print(f"\n{'fixtures per poll':<28}{'each (ms)':>14}{'one pass (ms)':>16}{'speedup':>10}")
+    for count in FIXTURE_COUNTS:
+        payloads = [build_sample_payload(match_id) for match_id in range(1, count + 1)]
+        each_run = time_runs(lambda p=payloads: run_per_fixture(p), MULTI_RUNS)
+        one_pass_run = time_runs(lambda p=payloads: run_one_pass(p), MULTI_RUNS)
+        print(f"{count:<28}{each_run:>14.1f}{one_pass_run:>16.1f}"
+              f"{each_run / one_pass_run:>9.1f}x")
+
+
+def run_benchmark() -> None:
+    """Prints the per-fixture cost of both transform engines."""
+
+    payload = build_sample_payload()
+    run_pandas_engine(payload)
+
+    pandas_run = time_runs(lambda: run_pandas_engine(payload), RUNS)
+    dict_run = time_runs(lambda: run_dict_engine(payload), RUNS)
+
+    print(f"{'':<28}{'pandas (ms)':>14}{'dict (ms)':>12}")
+    print(f"{'transform per fixture':<28}{pandas_run:>14.3f}{dict_run:>12.3f}")
+    print(f"{'speedup':<28}{pandas_run / dict_run:>14.1f}x")
+
+
+if __name__ == "__main__":
+
+    logging.disable(logging.INFO)
+    run_benchmark()
+    run_multi_fixture_benchmark()
@@ -0,0 +1,87 @@
+"""
+Benchmarks the type map load per pipeline invocation,
+comparing parsing types_map_api.xlsx against the compiled type_map module.
+"""
+
+from time import perf_counter
+
+import pandas as pd
+
+from transform import (get_type_mapping, get_compiled_type_mapping,
+                       transform_data)
+
+XLSX_PATH = "types_map_api.xlsx"
+RUNS = 20
+
+
+def build_sample_payload(match_id: int = 1) -> dict:
+    """Returns a live fixture as decoded from the API, with a typical amount of statistics and events."""
+
+    stat_type_ids = [34, 41, 42, 43, 44, 45, 49, 50, 51, 55, 56, 57, 58,
+                     64, 65, 78, 80, 81, 86, 98, 100, 106, 108, 109, 117]
+    statistics = [{"id": index, "fixture_id": match_id, "type_id": type_id,
+                   "participant_id": 10 if location == "home" else 20,
+                   "data": {"value": index}, "location": location}
+                  for index, (type_id, location) in enumerate(
+                      (type_id, location) for type_id in stat_type_ids
+                      for location in ("home", "away"))]
+
+    events = [{"id": 100 + index, "fixture_id": match_id, "period_id": 1,
+               "participant_id": 10, "type_id": type_id, "section": "event",
+               "player_id": 1000 + index, "related_player_id": None,
+               "player_name": f"Player {index}", "related_player_name": None,
+               "result": None, "info": None, "addition": None,
+               "minute": 10 + index, "extra_minute": None, "injured": None,
+               "on_bench": False, "coach_id": None, "sub_type_id": None,
+               "detailed_period_id": None, "sort_order": index}
+              for index, type_id in enumerate([19, 14, 18, 19, 14, 18])]
+
+    return {
+        "id": match_id,
+        "result_info": None,
+        "statistics": statistics,
+        "events": events,
+        "periods": [{"type_id": 1, "minutes": 45, "ticking": True, "started": 1}]
+    }
+
+
+def build_sample_fixture(match_id: int = 1) -> pd.DataFrame:
+    """Returns a DataFrame for a live fixture with a typical amount of statistics and events."""
+
+    return pd.DataFrame([build_sample_payload(match_id)])
+
+
+def time_runs(function, runs: int = RUNS) -> float:
+    """Returns the mean time in milliseconds of calling the function."""
+
+    start = perf_counter()
+    for _ in range(runs):
+        function()
+    return (perf_counter() - start) * 1000 / runs
+
+
+def run_benchmark() -> None:
+    """Prints the per-invocation cost of both type map sources."""
+
+    fixture = build_sample_fixture()
+
+    cold_start = perf_counter()
+    get_compiled_type_mapping()
+    compiled_cold = (perf_counter() - cold_start) * 1000
+
+    xlsx_load = time_runs(lambda: get_type_mapping(XLSX_PATH))
+    compiled_load = time_runs(get_compiled_type_mapping)
+
+    xlsx_run = time_runs(lambda: transform_data(
+        fixture, get_type_mapping(XLSX_PATH)))
+    compiled_run = time_runs(lambda: transform_data(fixture))
+
+    print(f"{'':<28}{'xlsx (ms)':>12}{'compiled (ms)':>16}")
+    print(f"{'type map load':<28}{xlsx_load:>12.2f}{compiled_load:>16.4f}")
+    print(f"{'first load in container':<28}{xlsx_load:>12.2f}{compiled_cold:>16.2f}")
+    print(f"{'transform_data invocation':<28}{xlsx_run:>12.2f}{compiled_run:>16.2f}")
+
+
+if __name__ == "__main__":
+
+    run_benchmark()
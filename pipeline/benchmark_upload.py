@@ -0,0 +1,85 @@
+"""
+Benchmarks the latency of uploading one live minute,
+comparing table by table inserts with the single statement upload.
+Runs against the database in the environment variables, seeding and then
+removing a fake match, so point it at a local or scratch database.
+"""
+
+from time import perf_counter
+from statistics import median, quantiles
+
+from dotenv import load_dotenv
+import pandas as pd
+
+from load import get_connection, upload_all_data
+from benchmark_load import (seed_benchmark_match, clear_benchmark_rows,
+                            BENCHMARK_MATCH_ID, BENCHMARK_TEAM_IDS, ID_OFFSET)
+
+MINUTES = 90
+EVENTS_PER_MATCH = 30
+
+
+def build_minute(minute: int) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Returns the minute and cumulative event DataFrames the transform gives at a minute."""
+
+    minute_df = pd.DataFrame([{
+        "match_id": BENCHMARK_MATCH_ID, "match_minute": minute, "half": 1,
+        "possession_home": 50.0, "shots_home": minute // 10, "shots_away": None
+    }])
+
+    event_count = EVENTS_PER_MATCH * minute // MINUTES
+    event_df = pd.DataFrame([{
+        "match_event_id": ID_OFFSET + index,
+        "match_id": BENCHMARK_MATCH_ID,
+        "team_id": BENCHMARK_TEAM_IDS[index % 2],
+        "event_type_id": 14 if index % 5 == 0 else 19,
+        "type_name": "goal" if index % 5 == 0 else "yellowcard",
+        "player_id": ID_OFFSET + index,
+        "player_name": f"Player {index}",
+        "related_player_id": None if index % 2 else ID_OFFSET + index + 1,
+        "related_player_name": None if index % 2 else f"Player {index + 1}",
+        "minute": index * 3
+    } for index in range(event_count)], columns=[
+        "match_event_id", "match_id", "team_id", "event_type_id", "type_name",
+        "player_id", "player_name", "related_player_id", "related_player_name", "minute"])
+
+    return minute_df, event_df
+
+
+def time_match(engine: str, db_conn) -> list[float]:
+    """Returns the upload latency in milliseconds of every minute of a match."""
+
+    clear_benchmark_rows(db_conn)
+    latencies = []
+
+    for minute in range(1, MINUTES + 1):
+        minute_df, event_df = build_minute(minute)
+
+        start = perf_counter()
+        upload_all_data(minute_df, db_conn, event_df, engine=engine)
+        latencies.append((perf_counter() - start) * 1000)
+
+    return latencies
+
+
+def run_benchmark() -> None:
+    """Prints the median and 95th percentile minute upload latency of both paths."""
+
+    db_conn = get_connection()
+    seed_benchmark_match(db_conn)
+
+    print(f"{'engine':<12}{'p50 (ms)':>10}{'p95 (ms)':>10}")
+    try:
+        for engine in ("values", "statement"):
+            latencies = time_match(engine, db_conn)
+            p95 = quantiles(latencies, n=20)[-1]
+            print(f"{engine:<12}{median(latencies):>10.2f}{p95:>10.2f}")
+    finally:
+        clear_benchmark_rows(db_conn, remove_match=True)
+        db_conn.close()
+
+
+if __name__ == "__main__":
+
+    load_dotenv()
+    run_benchmark()
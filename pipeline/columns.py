@@ -0,0 +1,151 @@
+"""
+The fields we store, shared by both transform engines and the extract.
+The extract only requests these fields, statistic types and event types from the API,
+and the transforms keep only these, so recorded or unfiltered payloads give the same rows.
+"""
+
+from type_map import TYPE_MAP
+
+API_FIXTURE_FIELDS = [
+    "id",
+    "result_info"
+]
+
+STATISTIC_FIELDS = [
+    "type_id",
+    "participant_id",
+    "data",
+    "location"
+]
+
+PERIOD_FIELDS = [
+    "type_id",
+    "started",
+    "ended",
+    "minutes",
+    "ticking"
+]
+
+EVENT_FIELDS = [
+    "id",
+    "fixture_id",
+    "participant_id",
+    "type_id",
+    "player_id",
+    "related_player_id",
+    "player_name",
+    "related_player_name",
+    "minute"
+]
+
+INCLUDES = {
+    "statistics": STATISTIC_FIELDS,
+    "periods": PERIOD_FIELDS,
+    "events": EVENT_FIELDS
+}
+
+FIXTURE_FIELDS = [*API_FIXTURE_FIELDS, *INCLUDES, "request_timestamp"]
+
+# The event types seeded in the event_type table.
+EVENT_TYPE_IDS = [10, 14, 15, 16, 17, 18, 19, 20]
+
+# The statistic columns of match_minute_stats.
+MINUTE_STAT_COLUMNS = [
+    "possession_home",
+    "shots_home",
+    "shots_away",
+    "shots_on_target_home",
+    "shots_on_target_away",
+    "fouls_home",
+    "fouls_away",
+    "corners_home",
+    "corners_away",
+    "tackles_home",
+    "tackles_away",
+    "attacks_home",
+    "attacks_away",
+    "danger_attacks_home",
+    "danger_attacks_away",
+    "shots_outside_home",
+    "shots_outside_away",
+    "shots_inside_home",
+    "shots_inside_away",
+    "hit_woodwork_home",
+    "hit_woodwork_away",
+    "passes_home",
+    "passes_away",
+    "successful_passes_home",
+    "successful_passes_away",
+    "key_passes_home",
+    "key_passes_away",
+    "saves_home",
+    "saves_away",
+    "big_chances_created_home",
+    "big_chances_created_away",
+    "big_chances_missed_home",
+    "big_chances_missed_away",
+    "successful_dribbles_home",
+    "successful_dribbles_away",
+    "dribbled_attempts_home",
+    "dribbled_attempts_away",
+    "duels_won_home",
+    "duels_won_away",
+    "free_kicks_home",
+    "free_kicks_away",
+    "interceptions_home",
+    "interceptions_away",
+    "offsides_home",
+    "offsides_away",
+    "shots_blocked_home",
+    "shots_blocked_away",
+    "successful_headers_home",
+    "successful_headers_away",
+    "total_crosses_home",
+    "total_crosses_away"
+]
+
+MINUTE_RENAMES = {
+    "ball_possession_home": "possession_home",
+    "dangerous_attacks_away": "danger_attacks_away",
+    "dangerous_attacks_home": "danger_attacks_home",
+    "shots_insidebox_home": "shots_inside_home",
+    "shots_insidebox_away": "shots_inside_away",
+    "shots_outsidebox_home": "shots_outside_home",
+    "shots_outsidebox_away": "shots_outside_away",
+    "shots_total_home": "shots_home",
+    "shots_total_away": "shots_away"
+}
+
+EVENT_RENAMES = {
+    "id": "match_event_id",
+    "fixture_id": "match_id",
+    "participant_id": "team_id",
+    "statistic_name": "type_name",
+    "type_id": "event_type_id"
+}
+
+
+def get_minute_column(statistic_name: str) -> str:
+    """Returns the match_minute_stats column of a statistic name with its location suffix."""
+
+    return MINUTE_RENAMES.get(statistic_name, statistic_name)
+
+
+# The statistic types with a home or away column in match_minute_stats.
+STATISTIC_TYPE_IDS = sorted(
+    type_id for type_id, name in TYPE_MAP.items()
+    if {get_minute_column(name + "_home"), get_minute_column(name + "_away")}
+    & set(MINUTE_STAT_COLUMNS))
+
+
+def trim_fixture(fixture: dict) -> dict:
+    """Returns a fixture with only the fields and types the extract requests from the API."""
+
+    type_ids = {"statistics": set(STATISTIC_TYPE_IDS), "events": set(EVENT_TYPE_IDS)}
+    trimmed = {field: fixture[field] for field in API_FIXTURE_FIELDS if field in fixture}
+
+    for include, fields in INCLUDES.items():
+        trimmed[include] = [{field: item[field] for field in fields if field in item}
+                            for item in fixture.get(include) or []
+                            if include not in type_ids or item.get("type_id") in type_ids[include]]
+    return trimmed
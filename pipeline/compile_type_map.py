@@ -0,0 +1,48 @@
+"""
+Compiles types_map_api.xlsx into the type_map.py lookup module.
+Run this whenever the spreadsheet changes, so the pipeline never
+needs to parse the spreadsheet at runtime.
+"""
+
+import logging
+
+from transform import get_type_mapping
+
+XLSX_PATH = "types_map_api.xlsx"
+OUTPUT_PATH = "type_map.py"
+
+MODULE_HEADER = '''"""
+Type map compiled from types_map_api.xlsx by compile_type_map.py.
+Do not edit by hand, regenerate it with `python compile_type_map.py`.
+"""
+# pylint: skip-file
+
+'''
+
+
+def build_type_map_source(type_map: dict[int, str]) -> str:
+    """Returns the source of a module holding the given type map."""
+
+    lines = [f"    {type_id}: {statistic_name!r},"
+             for type_id, statistic_name in sorted(type_map.items())]
+
+    return MODULE_HEADER + "TYPE_MAP = {\n" + "\n".join(lines) + "\n}\n"
+
+
+def compile_type_map(xlsx_path: str, output_path: str) -> dict[int, str]:
+    """Writes the type map module for the given spreadsheet."""
+
+    df_mapping = get_type_mapping(xlsx_path)
+    type_map = dict(zip(df_mapping["type_id"].astype(int),
+                        df_mapping["statistic_name"]))
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(build_type_map_source(type_map))
+
+    logging.info("Compiled %s types to %s.", len(type_map), output_path)
+    return type_map
+
+
+if __name__ == "__main__":
+
+    compile_type_map(XLSX_PATH, OUTPUT_PATH)
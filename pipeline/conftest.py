@@ -0,0 +1,76 @@
+# pylint: skip-file
+from pytest import fixture
+
+
+@fixture
+def sample_fixture():
+    """A live fixture as returned by the API, with the edge cases both transform engines handle."""
+    return {
+        "id": 19411877,
+        "name": "Liverpool vs Chelsea",
+        "league_id": 8,
+        "state_id": 2,
+        "result_info": None,
+        "statistics": [
+            {"id": 1, "fixture_id": 19411877, "type_id": 34, "participant_id": 8,
+                "data": {"value": 3}, "location": "home"},
+            {"id": 2, "fixture_id": 19411877, "type_id": 34, "participant_id": 18,
+                "data": {"value": 1}, "location": "away"},
+            {"id": 3, "fixture_id": 19411877, "type_id": 45, "participant_id": 8,
+                "data": {"value": 61}, "location": "home"},
+            {"id": 4, "fixture_id": 19411877, "type_id": 45, "participant_id": 18,
+                "data": {"value": 39}, "location": "away"},
+            {"id": 5, "fixture_id": 19411877, "type_id": 42, "participant_id": 8,
+                "data": {"value": 9}, "location": "home"},
+            {"id": 6, "fixture_id": 19411877, "type_id": 42, "participant_id": 18,
+                "data": {"value": 4}, "location": "away"},
+            {"id": 7, "fixture_id": 19411877, "type_id": 44, "participant_id": 8,
+                "data": {"value": 40}, "location": "home"},
+            {"id": 8, "fixture_id": 19411877, "type_id": 41, "participant_id": 8,
+                "data": {"value": 2}, "location": "home"},
+            {"id": 9, "fixture_id": 19411877, "type_id": 52, "participant_id": 8,
+                "data": {"value": 1}, "location": "home"},
+            {"id": 10, "fixture_id": 19411877, "type_id": 56, "participant_id": 18,
+                "data": {"value": 5}, "location": "away"},
+            {"id": 11, "fixture_id": 19411877, "type_id": 56, "participant_id": 18,
+                "data": {"value": 6}, "location": "away"},
+            {"id": 12, "fixture_id": 19411877, "type_id": 1234567, "participant_id": 8,
+                "data": {"value": 7}, "location": "home"}
+        ],
+        "events": [
+            {"id": 101, "fixture_id": 19411877, "period_id": 1, "participant_id": 8,
+                "type_id": 19, "section": "event", "player_id": 1001,
+                "related_player_id": None, "player_name": "Virgil van Dijk",
+                "related_player_name": None, "result": None, "info": "Foul",
+                "addition": "1st Yellow Card", "minute": 12, "extra_minute": None,
+                "injured": None, "on_bench": False, "coach_id": None, "sub_type_id": None,
+                "detailed_period_id": None, "sort_order": 1},
+            {"id": 102, "fixture_id": 19411877, "period_id": 1, "participant_id": 8,
+                "type_id": 14, "section": "event", "player_id": 1002,
+                "related_player_id": 1003, "player_name": "Mohamed Salah",
+                "related_player_name": "Trent Alexander-Arnold", "result": "1-0",
+                "info": "Shot", "addition": "1st Goal", "minute": 30, "extra_minute": None,
+                "injured": None, "on_bench": False, "coach_id": None, "sub_type_id": None,
+                "detailed_period_id": None, "sort_order": 2},
+            {"id": 103, "fixture_id": 19411877, "period_id": 1, "participant_id": 18,
+                "type_id": 9999, "section": "event", "player_id": None,
+                "related_player_id": None, "player_name": None,
+                "related_player_name": None, "result": None, "info": None,
+                "addition": None, "minute": 33, "extra_minute": None,
+                "injured": None, "on_bench": False, "coach_id": None, "sub_type_id": None,
+                "detailed_period_id": None, "sort_order": 3},
+            {"id": 104, "fixture_id": 19411877, "period_id": 1, "participant_id": 18,
+                "type_id": 18, "section": "event", "player_id": 1004,
+                "related_player_id": 1005, "player_name": "Cole Palmer",
+                "related_player_name": "Nicolas Jackson", "minute": 40,
+                "sort_order": 4},
+            {"id": 105, "fixture_id": 19411877, "period_id": 1, "participant_id": 8,
+                "type_id": 19, "section": "event", "player_id": 1002,
+                "related_player_id": None, "player_name": "Mohamed Salah",
+                "related_player_name": None, "minute": 41, "sort_order": 5}
+        ],
+        "periods": [
+            {"id": 1, "fixture_id": 19411877, "type_id": 1, "started": 1736622000,
+                "ended": None, "minutes": 42, "ticking": True}
+        ]
+    }
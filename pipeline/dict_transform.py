@@ -0,0 +1,115 @@
+"""
+Transform engine working on the decoded API response with plain dicts.
+Produces the same match_minute_stats row, match_event rows and flags as
+transform.transform_data, without building any DataFrames.
+"""
+
+import logging
+
+from type_map import TYPE_MAP
+from columns import (EVENT_FIELDS, EVENT_TYPE_IDS, MINUTE_STAT_COLUMNS,
+                     EVENT_RENAMES, get_minute_column)
+from match_state import get_period_state
+
+logger = logging.getLogger(__name__)
+
+LOCATION_SUFFIXES = {"home": "_home", "away": "_away"}
+STORED_STATS = frozenset(MINUTE_STAT_COLUMNS)
+STORED_EVENT_TYPES = frozenset(EVENT_TYPE_IDS)
+
+
+def get_number(value: float) -> int | float:
+    """Returns whole numbers as ints, matching the values load sends for floats."""
+
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def get_statistic_values(statistics: list[dict]) -> dict[str, int | float]:
+    """
+    Returns the mean value of each statistic, named by type and location.
+    Statistics with an unknown type, location or value are skipped.
+    """
+
+    totals = {}
+    for statistic in statistics:
+        name = TYPE_MAP.get(statistic.get("type_id"))
+        suffix = LOCATION_SUFFIXES.get(statistic.get("location"))
+        value = (statistic.get("data") or {}).get("value")
+
+        if name is None or suffix is None or value is None:
+            continue
+
+        total, count = totals.get(name + suffix, (0, 0))
+        totals[name + suffix] = (total + value, count + 1)
+
+    return {name: get_number(total / count)
+            for name, (total, count) in totals.items()}
+
+
+def get_minute_row(fixture: dict, period_state: tuple[bool, int, int]) -> dict:
+    """Returns the match_minute_stats row, with columns in the same order as the pandas engine."""
+
+    _, half, minute = period_state
+    statistics = get_statistic_values(fixture.get("statistics") or [])
+
+    row = {"match_id": fixture["id"], "match_minute": minute, "half": half}
+    for name in sorted(statistics):
+        column = get_minute_column(name)
+        if column in STORED_STATS:
+            row[column] = statistics[name]
+
+    logger.info("Created the match_minute_stats row.")
+    return row
+
+
+def get_event_rows(events: list[dict]) -> list[dict]:
+    """Returns the match_event rows for the event types we store."""
+
+    events = [event for event in events
+              if event.get("type_id") in STORED_EVENT_TYPES]
+
+    columns = []
+    for event in events:
+        columns.extend(key for key in event
+                       if key in EVENT_FIELDS and key not in columns)
+
+    rows = []
+    for event in events:
+        row = {EVENT_RENAMES.get(key, key): event.get(key) for key in columns}
+        row["type_name"] = TYPE_MAP[event["type_id"]]
+        rows.append(row)
+
+    logger.info("Created %s match_event rows.", len(rows))
+    return rows
+
+
+def get_flags(fixture: dict, period_state: tuple[bool, int, int]) -> dict:
+    """Returns a dict of the game state flags."""
+
+    return {
+        "half_live": bool(period_state[0]),
+        "game_over": fixture["result_info"] is not None
+    }
+
+
+def transform_fixture(fixture: dict,
+                      events: list[dict] = None) -> tuple[dict, list[dict], dict]:
+    """
+    Runs the transformation process on a single fixture.
+    When events are given, only those are transformed instead of every event in the fixture.
+    """
+
+    if events is None:
+        events = fixture.get("events") or []
+
+    period_state = get_period_state(fixture["periods"])
+
+    minute_row = get_minute_row(fixture, period_state)
+    event_rows = get_event_rows(events)
+    game_status = get_flags(fixture, period_state)
+
+    logger.info("Is game over: %s", game_status["game_over"])
+    logger.info("Transform handing off to load ...")
+    return minute_row, event_rows, game_status
@@ -1,45 +1,56 @@
 """Extracting from the Sportsmonks API."""
 
+from collections.abc import Iterator
 from datetime import datetime, timezone
 import logging
 from http.client import HTTPSConnection
-from json import loads
 from os import environ as ENV
 
-from dotenv import load_dotenv
+from columns import (API_FIXTURE_FIELDS, INCLUDES, STATISTIC_TYPE_IDS,
+                     EVENT_TYPE_IDS)
+from metrics import timed
+from sportmonks import get_json, stream_json
 
 
 def scrape_live_match(url: str, conn: HTTPSConnection) -> dict:
-    """Returns a dict of scraped information for a specified match."""
+    """
+    Returns a dict of scraped information for a specified match,
+    through the rate limited client, which retries failed requests.
+    """
 
-    payload = ''
-    headers = {}
+    return get_json(conn, url)
 
-    conn.request(
-        "GET", f"/v3/football/{url}", payload, headers)
-    res = conn.getresponse()
-    data = res.read()
-    data_str = data.decode("utf-8")
 
-    if res.status == 200:
+def build_fields_query(filters: list[str] = None, trimmed: bool = True) -> str:
+    """
+    Returns the query selecting the includes we need.
+    When trimmed, only the fields, statistic types and event types we store are
+    requested, as defined in columns.py, so the API leaves out everything we drop.
+    """
 
-        logging.info("Got successful response from API: %s", res.status)
-        return loads(data_str)
+    filters = list(filters or [])
 
-    logging.info(
-        "API Request unsuccessful. Status code: %s. Reason: %s.", res.status, res.reason)
-    return {"error": True,
-            "status": res.status,
-            "reason": res.reason}
+    if trimmed:
+        includes = ";".join(f"{name}:{','.join(fields)}" for name, fields in INCLUDES.items())
+        filters += [f"fixtureStatisticTypes:{','.join(map(str, STATISTIC_TYPE_IDS))}",
+                    f"eventTypes:{','.join(map(str, EVENT_TYPE_IDS))}"]
+        query = f"select={','.join(API_FIXTURE_FIELDS)}&include={includes}"
+    else:
+        query = f"include={';'.join(INCLUDES)}"
 
+    if filters:
+        query += f"&filters={';'.join(filters)}"
+    return query
 
-def build_scrape_url(match_identifier: str | int, token: str) -> str:
+
+def build_scrape_url(match_identifier: str | int, token: str, trimmed: bool = True) -> str:
     """Returns the url required based on the given identifier."""
 
     if isinstance(match_identifier, str):
-        url = f"livescores/inplay?api_token={token}&include=statistics;periods;events&filters=participantSearch:{match_identifier}"
+        query = build_fields_query([f"participantSearch:{match_identifier}"], trimmed)
+        url = f"livescores/inplay?api_token={token}&{query}"
     elif isinstance(match_identifier, int):
-        url = f"fixtures/{match_identifier}?api_token={token}&include=statistics;periods;events"
+        url = f"fixtures/{match_identifier}?api_token={token}&{build_fields_query(trimmed=trimmed)}"
     else:
         raise TypeError(
             f"{match_identifier} is not a valid string or integer.")
@@ -48,6 +59,22 @@ def build_scrape_url(match_identifier: str | int, token: str) -> str:
     return url
 
 
+def build_batch_scrape_url(match_ids: list[int] | None, token: str) -> str:
+    """
+    Returns the url for several fixtures in one request.
+    With no match ids given, every fixture currently in play is requested.
+    """
+
+    if match_ids:
+        ids = ",".join(str(match_id) for match_id in match_ids)
+        url = f"fixtures/multi/{ids}?api_token={token}&{build_fields_query()}"
+    else:
+        url = f"livescores/inplay?api_token={token}&{build_fields_query()}"
+
+    logging.info("Built batch url: %s.", url)
+    return url
+
+
 def prepare_data(data: dict) -> dict:
     """
     Removes unwanted keys from our api call and adds info.
@@ -59,12 +86,15 @@ def prepare_data(data: dict) -> dict:
     for dict_key in ("subscription", "timezone"):
         data.pop(dict_key, None)
 
-    if "data" in data:
-        data["data"]["request_timestamp"] = datetime.now(
-            timezone.utc).timestamp()
-    else:
+    if "data" not in data:
         raise KeyError("data key not in received data.")
 
+    request_timestamp = datetime.now(timezone.utc).timestamp()
+    fixtures = data["data"] if isinstance(
+        data["data"], list) else [data["data"]]
+    for fixture in fixtures:
+        fixture["request_timestamp"] = request_timestamp
+
     logging.info("Request data successfully stripped of unwanted keys.")
     return data
 
@@ -88,8 +118,56 @@ def run_extract(match_identifier: str | int,
     return data
 
 
+def timestamp_fixtures(fixtures: Iterator[dict],
+                       request_timestamp: float) -> Iterator[dict]:
+    """
+    Yields each fixture with the time it was requested, as it is decoded.
+    Decoding happens while the fixtures are read, so its time is added to extract_ms.
+    """
+
+    while True:
+        with timed("extract_ms"):
+            fixture = next(fixtures, None)
+        if fixture is None:
+            return
+
+        fixture["request_timestamp"] = request_timestamp
+        yield fixture
+
+
+def run_batch_extract(match_ids: list[int] | None,
+                      token: str, conn: HTTPSConnection) -> Iterator[dict]:
+    """
+    Returns the fixtures of a single request, decoded one at a time as the response
+    is read, so memory stays flat however many fixtures are live.
+    Raises a ValueError if the request fails.
+    """
+
+    now = datetime.now(timezone.utc).timestamp()
+    url = build_batch_scrape_url(match_ids, token)
+
+    fixtures, body = stream_json(conn, url)
+    if "error" in body:
+        raise ValueError(
+            f"API Request unsuccessful. Status code: {body['status']}. Reason: {body['reason']}.")
+
+    logging.info("Batch data passed off successfully.")
+    return timestamp_fixtures(fixtures, now)
+
+
+def fetch_live_fixtures(token: str, conn: HTTPSConnection) -> dict[int, dict] | None:
+    """Returns every in-play fixture by id from a single request, or None if it fails."""
+
+    try:
+        return {fixture["id"]: fixture for fixture in run_batch_extract(None, token, conn)}
+    except ValueError as e:
+        logging.info("In-play feed unavailable: %s", e)
+        return None
+
+
 if __name__ == "__main__":
 
+    from dotenv import load_dotenv
     load_dotenv()
     api_token = ENV["TOKEN"]
     api_conn = HTTPSConnection("api.sportmonks.com")
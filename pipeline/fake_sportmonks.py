@@ -0,0 +1,131 @@
+"""
+A local stand-in for the Sportmonks API, for testing API clients without using quota.
+It serves fixtures from memory over HTTP on localhost, with the same rate_limit
+metadata as the real API, gzip compressed when asked for,
+answers 429 once an entity's hourly quota is used up,
+and can be told to fail the next requests with given statuses.
+"""
+
+from http.client import HTTPConnection
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from json import dumps
+from threading import Thread, Lock
+import gzip
+
+from sportmonks import API_PREFIX, HOURLY_LIMIT, get_entity
+
+
+class FakeSportmonksHandler(BaseHTTPRequestHandler):
+    """Answers GET requests from the FakeSportmonks it belongs to."""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Sends the fake API's response to the request."""
+
+        status, body, headers = self.server.fake.handle(self.path)
+        data = dumps(body).encode("utf-8")
+
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            data = gzip.compress(data)
+            headers = {**headers, "Content-Encoding": "gzip"}
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Keeps test output quiet."""
+
+
+class FakeSportmonks:
+    """
+    A fake Sportmonks API serving the given fixtures by id, by date, in play and in bulk.
+    Use it as a context manager, and open connections to it with connect().
+    """
+
+    def __init__(self, fixtures: list[dict] = None, limit: int = HOURLY_LIMIT,
+                 resets_in_seconds: int = 3600):
+        self.fixtures = {fixture["id"]: fixture for fixture in fixtures or []}
+        self.limit = limit
+        self.resets_in_seconds = resets_in_seconds
+        self.used: dict[str, int] = {}
+        self.requests: list[str] = []
+        self.failures: list[tuple[int, dict]] = []
+        self.lock = Lock()
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeSportmonksHandler)
+        self.server.fake = self
+        self.thread = Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def port(self) -> int:
+        """The port the fake API is listening on."""
+        return self.server.server_address[1]
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def connect(self) -> HTTPConnection:
+        """Returns a new connection to the fake API."""
+        return HTTPConnection("127.0.0.1", self.port)
+
+    def fail_next(self, *statuses: int, retry_after: int = None) -> None:
+        """Makes the next requests fail with these statuses, in order."""
+
+        headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+        self.failures.extend((status, headers) for status in statuses)
+
+    def get_rate_limit(self, entity: str) -> dict:
+        """Returns the rate_limit metadata the API adds to a response."""
+
+        return {"resets_in_seconds": self.resets_in_seconds,
+                "remaining": self.limit - self.used.get(entity, 0),
+                "requested_entity": entity}
+
+    def handle(self, path: str) -> tuple[int, dict, dict]:
+        """Returns the status, body and headers for a request path."""
+
+        with self.lock:
+            self.requests.append(path)
+            url = path.removeprefix(API_PREFIX)
+            entity = get_entity(url)
+
+            if self.failures:
+                status, headers = self.failures.pop(0)
+                return status, {"message": "Fake failure."}, headers
+
+            if self.used.get(entity, 0) >= self.limit:
+                return 429, {"message": "You have reached the rate limit.",
+                             "rate_limit": self.get_rate_limit(entity)}, {}
+
+            self.used[entity] = self.used.get(entity, 0) + 1
+            data = self.get_data(url.split("?")[0])
+
+            if data is None:
+                return 404, {"message": "No result(s) found."}, {}
+            return 200, {"data": data, "rate_limit": self.get_rate_limit(entity)}, {}
+
+    def get_data(self, resource: str) -> dict | list | None:
+        """Returns the fixtures a resource asks for, or None if it is unknown."""
+
+        parts = resource.split("/")
+
+        if parts[0] == "livescores" or parts[:2] == ["fixtures", "date"]:
+            return list(self.fixtures.values())
+
+        if parts[:2] == ["fixtures", "multi"]:
+            ids = {int(match_id) for match_id in parts[2].split(",")}
+            return [fixture for match_id, fixture in self.fixtures.items() if match_id in ids]
+
+        if parts[0] == "fixtures" and len(parts) == 2 and parts[1].isdigit():
+            return self.fixtures.get(int(parts[1]))
+
+        return None
@@ -0,0 +1,140 @@
+"""
+Fingerprints of the extracted payload, so a run can be skipped
+when the API returns the same match state as the previous poll,
+and the time each match is next due to be polled, so an early run can skip the API.
+"""
+
+from hashlib import sha1
+from json import dumps
+from os import environ as ENV
+import logging
+
+from psycopg2.extras import Json
+
+FINGERPRINT_KEYS = ("statistics", "events", "periods", "result_info")
+
+
+def get_payload_fingerprint(fixture: dict) -> str:
+    """Returns a hash of the parts of a fixture the transform uses."""
+
+    relevant_data = {key: fixture.get(key) for key in FINGERPRINT_KEYS}
+    serialised = dumps(relevant_data, sort_keys=True,
+                       separators=(",", ":"), default=str)
+
+    return sha1(serialised.encode("utf-8")).hexdigest()
+
+
+class InMemoryFingerprintStore:
+    """Keeps the last fingerprint of each match in the container's memory."""
+
+    def __init__(self):
+        self.fingerprints = {}
+        self.next_polls = {}
+
+    def get(self, match_id: int) -> tuple[str, dict | str] | None:
+        """Returns the last fingerprint and flags stored for the match."""
+        return self.fingerprints.get(match_id)
+
+    def put(self, match_id: int, fingerprint: str, flags: dict | str) -> None:
+        """Stores the fingerprint and flags of the latest run for the match."""
+        self.fingerprints[match_id] = (fingerprint, flags)
+
+    def get_next_poll(self, match_id: int) -> float | None:
+        """Returns the timestamp the match is next due to be polled at."""
+        return self.next_polls.get(match_id)
+
+    def put_next_poll(self, match_id: int, next_poll_at: float) -> None:
+        """Stores the timestamp the match is next due to be polled at."""
+        self.next_polls[match_id] = next_poll_at
+
+
+class DatabaseFingerprintStore:
+    """
+    Keeps the last fingerprint of each match in the match_fingerprint table,
+    so it is shared between containers and survives cold starts.
+    """
+
+    def __init__(self, get_db_connection):
+        self.get_db_connection = get_db_connection
+
+    def get(self, match_id: int) -> tuple[str, dict | str] | None:
+        """Returns the last fingerprint and flags stored for the match."""
+
+        db_conn = self.get_db_connection()
+        with db_conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT fingerprint, flags FROM match_fingerprint WHERE match_id = %s",
+                (match_id,))
+            row = cursor.fetchone()
+        db_conn.rollback()
+
+        return (row[0], row[1]) if row else None
+
+    def put(self, match_id: int, fingerprint: str, flags: dict | str) -> None:
+        """Stores the fingerprint and flags of the latest run for the match."""
+
+        db_conn = self.get_db_connection()
+        with db_conn.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO match_fingerprint (match_id, fingerprint, flags)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (match_id) DO UPDATE SET
+                    fingerprint = EXCLUDED.fingerprint,
+                    flags = EXCLUDED.flags,
+                    updated_at = CURRENT_TIMESTAMP
+                """, (match_id, fingerprint, Json(flags)))
+        db_conn.commit()
+
+    def get_next_poll(self, match_id: int) -> float | None:
+        """Returns the timestamp the match is next due to be polled at."""
+
+        db_conn = self.get_db_connection()
+        with db_conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT next_poll_at FROM match_fingerprint WHERE match_id = %s", (match_id,))
+            row = cursor.fetchone()
+        db_conn.rollback()
+
+        return row[0] if row else None
+
+    def put_next_poll(self, match_id: int, next_poll_at: float) -> None:
+        """
+        Stores the timestamp the match is next due to be polled at,
+        on the row its fingerprint was stored in.
+        """
+
+        db_conn = self.get_db_connection()
+        with db_conn.cursor() as cursor:
+            cursor.execute(
+                "UPDATE match_fingerprint SET next_poll_at = %s WHERE match_id = %s",
+                (next_poll_at, match_id))
+        db_conn.commit()
+
+
+def create_fingerprint_store(store_type: str, get_db_connection=None):
+    """Returns the fingerprint store for the given type, either memory or database."""
+
+    if store_type == "memory":
+        return InMemoryFingerprintStore()
+
+    if store_type == "database":
+        return DatabaseFingerprintStore(get_db_connection)
+
+    raise ValueError(f"Unknown fingerprint store: {store_type}.")
+
+
+def get_store_type() -> str:
+    """Returns the fingerprint store type configured by FINGERPRINT_STORE."""
+
+    store_type = ENV.get("FINGERPRINT_STORE", "memory")
+    logging.info("Using %s fingerprint store.", store_type)
+    return store_type
+
+
+def get_unchanged_flags(flags: dict | str) -> dict | str:
+    """Returns the flags of a skipped run, which can never hold new goals."""
+
+    if isinstance(flags, dict):
+        return {**flags, "goal_check": []}
+    return flags
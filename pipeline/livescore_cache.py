@@ -0,0 +1,211 @@
+"""
+A cache of the in-play feed shared by every match's execution, with single-flight fetches.
+livescores/inplay returns every live fixture in one response, so the first execution
+in a minute fetches it for everyone, and the others read their fixture from the cache.
+Fetches are single-flight: executions that miss wait on the one fetching,
+rather than all requesting the same feed.
+"""
+
+from contextlib import contextmanager
+from json import dumps, loads
+from os import environ as ENV
+from threading import Lock
+from time import time
+import fcntl
+import logging
+import sqlite3
+
+from psycopg2.extras import Json
+
+KEEP_MINUTES = 5
+
+
+def get_minute(now: float = None) -> int:
+    """Returns the minute since the epoch the cache is keyed by."""
+
+    return int((time() if now is None else now) // 60)
+
+
+class InMemoryLiveScoreCache:
+    """Keeps the in-play feed in the container's memory, shared by its threads."""
+
+    def __init__(self):
+        self.feeds: dict[int, dict] = {}
+        self.lock = Lock()
+
+    def get(self, minute: int, match_id: int) -> tuple[bool, dict | None]:
+        """Returns whether the minute's feed is cached, and the match's fixture in it."""
+
+        feed = self.feeds.get(minute)
+        return feed is not None, (feed or {}).get(str(match_id))
+
+    def put(self, minute: int, fixtures: dict[str, dict]) -> None:
+        """Stores the minute's feed, and forgets feeds older than KEEP_MINUTES."""
+
+        self.feeds[minute] = fixtures
+        for old_minute in [old for old in self.feeds if old < minute - KEEP_MINUTES]:
+            del self.feeds[old_minute]
+
+    @contextmanager
+    def single_flight(self, minute: int):  # pylint: disable=unused-argument
+        """Holds the lock only one fetch at a time can hold."""
+
+        with self.lock:
+            yield
+
+
+class SqliteLiveScoreCache:
+    """
+    Keeps the in-play feed in a local SQLite file, shared by every process on the machine.
+    Fetches are serialised with a lock on a file beside it. Used for tests and local runs.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None,
+                                    check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS livescore_cache (minute INTEGER PRIMARY KEY, fixtures TEXT)")
+
+    def get(self, minute: int, match_id: int) -> tuple[bool, dict | None]:
+        """Returns whether the minute's feed is cached, and the match's fixture in it."""
+
+        row = self.conn.execute(
+            "SELECT json_extract(fixtures, ?) FROM livescore_cache WHERE minute = ?",
+            (f'$."{match_id}"', minute)).fetchone()
+
+        if row is None:
+            return False, None
+        return True, loads(row[0]) if row[0] else None
+
+    def put(self, minute: int, fixtures: dict[str, dict]) -> None:
+        """Stores the minute's feed, and forgets feeds older than KEEP_MINUTES."""
+
+        self.conn.execute("INSERT OR REPLACE INTO livescore_cache VALUES (?, ?)",
+                          (minute, dumps(fixtures)))
+        self.conn.execute("DELETE FROM livescore_cache WHERE minute < ?",
+                          (minute - KEEP_MINUTES,))
+
+    @contextmanager
+    def single_flight(self, minute: int):  # pylint: disable=unused-argument
+        """Holds an exclusive lock on the cache's lock file."""
+
+        with open(f"{self.path}.lock", "w", encoding="utf-8") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class DatabaseLiveScoreCache:
+    """
+    Keeps the in-play feed in the livescore_cache table, shared by every container.
+    Fetches are serialised with a Postgres advisory lock on the minute,
+    which is released if the container dies holding it.
+    """
+
+    def __init__(self, get_db_connection):
+        self.get_db_connection = get_db_connection
+
+    def get(self, minute: int, match_id: int) -> tuple[bool, dict | None]:
+        """Returns whether the minute's feed is cached, and the match's fixture in it."""
+
+        db_conn = self.get_db_connection()
+        with db_conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT fixtures -> %s FROM livescore_cache WHERE minute = %s",
+                (str(match_id), minute))
+            row = cursor.fetchone()
+        db_conn.rollback()
+
+        if row is None:
+            return False, None
+        return True, row[0]
+
+    def put(self, minute: int, fixtures: dict[str, dict]) -> None:
+        """Stores the minute's feed, and forgets feeds older than KEEP_MINUTES."""
+
+        db_conn = self.get_db_connection()
+        with db_conn.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO livescore_cache (minute, fixtures)
+                VALUES (%s, %s)
+                ON CONFLICT (minute) DO UPDATE SET fixtures = EXCLUDED.fixtures
+                """, (minute, Json(fixtures)))
+            cursor.execute("DELETE FROM livescore_cache WHERE minute < %s",
+                           (minute - KEEP_MINUTES,))
+        db_conn.commit()
+
+    @contextmanager
+    def single_flight(self, minute: int):
+        """Holds a session advisory lock on the minute, which outlives the commits inside it."""
+
+        db_conn = self.get_db_connection()
+        with db_conn.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_lock(hashtext('livescore_cache'), %s)", (minute,))
+        db_conn.rollback()
+
+        try:
+            yield
+        finally:
+            with db_conn.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(hashtext('livescore_cache'), %s)",
+                               (minute,))
+            db_conn.rollback()
+
+
+def get_live_fixture(cache, match_id: int, fetch,
+                     minute: int = None) -> tuple[dict | None, bool]:
+    """
+    Returns a match's fixture from the minute's in-play feed, and whether it was a cache hit.
+    On a miss, the first caller runs fetch() for the feed, as a dict of fixtures by id,
+    while the others wait for it and then read the cache.
+    The fixture is None if the match is not in play, or the fetch failed, returning None.
+    """
+
+    minute = get_minute() if minute is None else minute
+
+    cached, fixture = cache.get(minute, match_id)
+    if cached:
+        return fixture, True
+
+    with cache.single_flight(minute):
+        cached, fixture = cache.get(minute, match_id)
+        if cached:
+            return fixture, True
+
+        fixtures = fetch()
+        if fixtures is None:
+            return None, False
+
+        fixtures = {str(fixture_id): fixture for fixture_id, fixture in fixtures.items()}
+        cache.put(minute, fixtures)
+        logging.info("Cached the in-play feed of %s fixtures for minute %s.",
+                     len(fixtures), minute)
+        return fixtures.get(str(match_id)), False
+
+
+def create_livescore_cache(cache_type: str, get_db_connection=None, path: str = None):
+    """Returns the live score cache for the given type, either memory, sqlite or database."""
+
+    if cache_type == "memory":
+        return InMemoryLiveScoreCache()
+
+    if cache_type == "sqlite":
+        return SqliteLiveScoreCache(path or "/tmp/livescore_cache.db")
+
+    if cache_type == "database":
+        return DatabaseLiveScoreCache(get_db_connection)
+
+    raise ValueError(f"Unknown live score cache: {cache_type}.")
+
+
+def get_cache_type() -> str | None:
+    """Returns the live score cache type configured by LIVESCORE_CACHE, or None if it is off."""
+
+    cache_type = ENV.get("LIVESCORE_CACHE")
+    if cache_type:
+        logging.info("Using %s live score cache.", cache_type)
+    return cache_type
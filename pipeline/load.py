@@ -1,14 +1,26 @@
-"""Loading to database."""
+"""
+Loading to database.
+pandas and numpy are only imported by the DataFrame functions,
+so the dict transform engine can load rows without them.
+"""
+from __future__ import annotations
+
 from os import environ as ENV
+from io import StringIO
+from csv import writer
+from typing import TYPE_CHECKING
 import logging
 
-from dotenv import load_dotenv
-import pandas as pd
 import psycopg2
 from psycopg2.extras import execute_values
 from psycopg2.extensions import connection
 
-from transform import get_dataframe_from_json, transform_data
+from metrics import add_metric, timed
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+MINUTE_KEY = ["match_id", "match_minute", "half"]
 
 
 def get_connection() -> connection:
@@ -23,66 +35,409 @@ def get_connection() -> connection:
     )
 
 
+def get_column_values(column: pd.Series) -> list:
+    """
+    Returns a column as Python values ready for psycopg2.
+    Nulls become None, and whole number floats become ints,
+    as a single null turns an integer column into floats.
+    """
+
+    import numpy as np  # pylint: disable=import-outside-toplevel
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    if pd.api.types.is_float_dtype(column.dtype):
+        floats = column.to_numpy(dtype=float, na_value=np.nan)
+        nulls = np.isnan(floats)
+        values = floats.astype(object)
+
+        whole = ~nulls & np.isfinite(floats) & (floats == np.floor(floats))
+        values[whole] = floats[whole].astype(np.int64).tolist()
+
+    else:
+        values = np.array(column.to_numpy(dtype=object), dtype=object)
+        nulls = pd.isna(values)
+
+        if (pd.api.types.is_object_dtype(column.dtype)
+                and pd.api.types.infer_dtype(values, skipna=True) in (
+                    "floating", "mixed-integer-float", "mixed")):
+            whole = np.array([isinstance(value, float) and value.is_integer()
+                              for value in values], dtype=bool)
+            values[whole] = [int(value) for value in values[whole]]
+
+    values[nulls] = None
+    return values.tolist()
+
+
+def get_values_from_dataframe(df: pd.DataFrame) -> list[tuple]:
+    """Returns the rows of a DataFrame as tuples, converting column by column."""
+
+    columns = [get_column_values(column) for _, column in df.items()]
+
+    return list(zip(*columns))
+
+
 def insert_dataframe(df: pd.DataFrame, table_name: str, db_conn: connection,
-                     returning=None, conflict=None) -> list[tuple] | None:
-    """Insert data from a pandas Dataframe into a PostgreSQL table."""
+                     returning=None, conflict=None, update=False) -> list[tuple] | None:
+    """
+    Insert data from a pandas Dataframe into a PostgreSQL table.
+    With update, rows conflicting on the conflict columns are refreshed in place.
+    """
 
     columns = ", ".join(df.columns)
 
-    if df.isnull().any().any():
-        logging.info("DataFrame for table %s found null values.", table_name)
-        values = []
-        for _, row in df.iterrows():
-            processed_row = []
-            for item in row:
-                if pd.isna(item):
-                    processed_row.append(None)
-                elif isinstance(item, float) and item.is_integer():
-                    processed_row.append(int(item))
-                else:
-                    processed_row.append(item)
-            values.append(tuple(processed_row))
-    else:
-        logging.info(
-            "DataFrame for table %s found no null values.", table_name)
-        values = df.to_records(index=False).tolist()
+    logging.info("Converting DataFrame for table %s to values.", table_name)
+    values = get_values_from_dataframe(df)
 
     insert_query = f"INSERT INTO {table_name} ({columns}) VALUES %s"
+    insert_query += build_query_suffix(
+        returning, conflict, list(df.columns) if update else None)
+
+    try:
+        with db_conn.cursor() as cursor:
+
+            logging.info("Running execute_values ...")
+            with timed(f"insert_{table_name}_ms"):
+                execute_values(cursor, insert_query, values)
+                result = cursor.fetchall() if returning else None
+
+            with timed("commit_ms"):
+                db_conn.commit()
+            add_metric(f"{table_name}_rows", len(values))
+
+            logging.info("Upload successful.")
+            return result
+
+    except psycopg2.Error as e:
+        db_conn.rollback()
+        logging.error("Error inserting data: %s", e)
+        return None
+
+
+def build_query_suffix(returning=None, conflict=None, update_columns=None) -> str:
+    """
+    Returns the ON CONFLICT and RETURNING clauses for an insert.
+    Conflicting rows are skipped, or refreshed in place when update_columns
+    are given, so RETURNING still gives the id of the existing row.
+    """
+
+    suffix = ""
 
     if conflict:
-        if isinstance(conflict, (list, tuple)):
-            conflict = ", ".join(conflict)
-        insert_query += f" ON CONFLICT ({conflict}) DO NOTHING"
+        if isinstance(conflict, str):
+            conflict = [conflict]
+        suffix += f" ON CONFLICT ({', '.join(conflict)})"
+
+        if update_columns is None:
+            suffix += " DO NOTHING"
+        else:
+            update_columns = [column for column in update_columns
+                              if column not in conflict] or conflict[:1]
+            suffix += " DO UPDATE SET " + ", ".join(
+                f"{column} = EXCLUDED.{column}" for column in update_columns)
 
     if returning:
-        insert_query += f" RETURNING {returning}"
+        suffix += f" RETURNING {returning}"
+
+    return suffix
+
+
+def get_copy_buffer(df: pd.DataFrame) -> StringIO:
+    """Returns the DataFrame as CSV ready for COPY, with the same values as insert_dataframe."""
+
+    buffer = StringIO()
+    writer(buffer, lineterminator="\n").writerows(get_values_from_dataframe(df))
+    buffer.seek(0)
+    return buffer
+
+
+def copy_dataframe(df: pd.DataFrame, table_name: str, db_conn: connection,
+                   returning=None, conflict=None, update=False) -> list[tuple] | None:
+    """
+    Insert data from a pandas DataFrame into a PostgreSQL table using COPY.
+    Rows are streamed into a temporary staging table, then merged into the
+    table with the same conflict handling as insert_dataframe.
+    """
+
+    columns = ", ".join(df.columns)
+    staging_table = f"staging_{table_name}"
+
+    merge_query = (f"INSERT INTO {table_name} ({columns}) "
+                   f"SELECT {columns} FROM {staging_table}")
+    merge_query += build_query_suffix(
+        returning, conflict, list(df.columns) if update else None)
 
     try:
         with db_conn.cursor() as cursor:
 
-            logging.info("Running execute_values ...")
-            execute_values(cursor, insert_query, values)
+            with timed(f"insert_{table_name}_ms"):
+                cursor.execute(
+                    f"""CREATE TEMP TABLE {staging_table} ON COMMIT DROP AS
+                    SELECT {columns} FROM {table_name} WITH NO DATA""")
 
-            result = cursor.fetchall() if returning else None
+                logging.info("Running copy_expert ...")
+                cursor.copy_expert(
+                    f"COPY {staging_table} ({columns}) FROM STDIN WITH (FORMAT csv)",
+                    get_copy_buffer(df))
 
-            db_conn.commit()
+                cursor.execute(merge_query)
+                result = cursor.fetchall() if returning else None
+
+            with timed("commit_ms"):
+                db_conn.commit()
+            add_metric(f"{table_name}_rows", len(df))
 
             logging.info("Upload successful.")
             return result
 
     except psycopg2.Error as e:
         db_conn.rollback()
-        logging.error("Error inserting data: %s", e)
+        logging.error("Error copying data: %s", e)
+        return None
+
+
+ANNOUNCED_GOALS: dict[int, set[int]] = {}
+
+# Stored for players the API sends without a name, until a later event names them.
+UNKNOWN_PLAYER_NAME = "Unknown"
+
+LOAD_ENGINES = {
+    "values": insert_dataframe,
+    "copy": copy_dataframe
+}
+
+
+def render_values(cursor, rows: list[tuple], placeholders: str) -> str:
+    """Returns rows rendered into a VALUES list, escaped by psycopg2."""
+
+    return ", ".join(cursor.mogrify(placeholders, row).decode("utf-8")
+                     for row in rows)
+
+
+def build_upload_statement(cursor, minute_columns: list[str], minute_rows: list[tuple],
+                           event_rows: list[tuple], player_rows: list[tuple],
+                           link_rows: list[tuple], removed_event_ids: list[int] = None) -> str:
+    """
+    Returns one statement writing a minute to every table, as a chain of CTEs.
+    A minute already stored is refreshed in place, keeping its id for events.
+    Events already stored are updated when their type or team has been amended,
+    and their player links are replaced when the player has changed.
+    Removed events are deleted, along with their player links.
+    Events and player links with a type missing from event_type are skipped,
+    and players without a name are stored as UNKNOWN_PLAYER_NAME until one is sent,
+    so one unknown event cannot block the rest of the minute.
+    The statement returns the ids of newly inserted events.
+    """
+
+    minute_placeholders = "(" + ", ".join(["%s"] * len(minute_columns)) + ")"
+    minute_suffix = build_query_suffix(
+        "match_minute_stats_id", MINUTE_KEY, minute_columns)
+    ctes = [f"""minute AS (
+        INSERT INTO match_minute_stats ({", ".join(minute_columns)})
+        VALUES {render_values(cursor, minute_rows, minute_placeholders)}
+        {minute_suffix}
+    )"""]
+
+    if removed_event_ids:
+        ctes.append(cursor.mogrify("""removed AS (
+            DELETE FROM match_event WHERE match_event_id = ANY(%s)
+        )""", (list(removed_event_ids),)).decode("utf-8"))
+
+    if not event_rows:
+        return "WITH " + ", ".join(ctes) + " SELECT match_minute_stats_id FROM minute WHERE false"
+
+    ctes.append(f"""events AS (
+        INSERT INTO match_event (match_event_id, match_minute_stats_id, event_type_id, team_id)
+        SELECT e.match_event_id, minute.match_minute_stats_id, e.event_type_id, e.team_id
+        FROM (VALUES {render_values(cursor, event_rows, "(%s::int, %s::smallint, %s::int)")})
+            AS e (match_event_id, event_type_id, team_id)
+        JOIN event_type USING (event_type_id)
+        CROSS JOIN minute
+        ON CONFLICT (match_event_id) DO UPDATE SET
+            event_type_id = EXCLUDED.event_type_id,
+            team_id = EXCLUDED.team_id
+        WHERE (match_event.event_type_id, match_event.team_id)
+            IS DISTINCT FROM (EXCLUDED.event_type_id, EXCLUDED.team_id)
+        RETURNING match_event_id, (xmax = 0) AS inserted
+    )""")
+
+    if player_rows:
+        ctes.append(f"""players AS (
+            INSERT INTO player (player_id, player_name)
+            SELECT p.player_id, COALESCE(p.player_name, '{UNKNOWN_PLAYER_NAME}')
+            FROM (VALUES {render_values(cursor, player_rows, "(%s::int, %s::text)")})
+                AS p (player_id, player_name)
+            ON CONFLICT (player_id) DO UPDATE SET player_name = EXCLUDED.player_name
+            WHERE player.player_name = '{UNKNOWN_PLAYER_NAME}'
+            AND EXCLUDED.player_name <> '{UNKNOWN_PLAYER_NAME}'
+        )""")
+
+    players_by_event = {row[0]: row[2] for row in link_rows}
+    event_players = [(row[0], players_by_event.get(row[0])) for row in event_rows]
+    ctes.append(f"""stale_links AS (
+        DELETE FROM player_match_event AS p
+        USING (VALUES {render_values(cursor, event_players, "(%s::int, %s::int)")})
+            AS s (match_event_id, player_id)
+        WHERE p.match_event_id = s.match_event_id
+        AND p.player_id IS DISTINCT FROM s.player_id
+    )""")
+
+    if link_rows:
+        ctes.append(f"""links AS (
+            INSERT INTO player_match_event (match_event_id, player_id, related_player_id)
+            SELECT l.match_event_id, l.player_id, l.related_player_id
+            FROM (VALUES {render_values(cursor, link_rows, "(%s::int, %s::smallint, %s::int, %s::int)")})
+                AS l (match_event_id, event_type_id, player_id, related_player_id)
+            JOIN event_type USING (event_type_id)
+            ON CONFLICT (match_event_id, player_id) DO UPDATE SET
+                related_player_id = EXCLUDED.related_player_id
+        )""")
+
+    return "WITH " + ", ".join(ctes) + " SELECT match_event_id FROM events WHERE inserted"
+
+
+def upload_rows(db_conn: connection, minute_columns: list[str], minute_rows: list[tuple],
+                event_rows: list[tuple], player_rows: list[tuple],
+                link_rows: list[tuple], removed_event_ids: list[int] = None) -> list[int] | None:
+    """
+    Writes a minute to every table in a single statement and transaction.
+    Returns the ids of newly inserted events, or None if nothing was written.
+    """
+
+    try:
+        with db_conn.cursor() as cursor:
+
+            logging.info("Running single statement upload ...")
+            with timed("insert_statement_ms"):
+                cursor.execute(build_upload_statement(
+                    cursor, minute_columns, minute_rows,
+                    event_rows, player_rows, link_rows, removed_event_ids))
+                inserted_event_ids = [row[0] for row in cursor.fetchall()]
+
+            with timed("commit_ms"):
+                db_conn.commit()
+
+            for table, rows in (("match_minute_stats", minute_rows), ("match_event", event_rows),
+                                ("player", player_rows), ("player_match_event", link_rows)):
+                add_metric(f"{table}_rows", len(rows))
+
+            logging.info("Upload successful.")
+            return inserted_event_ids
+
+    except psycopg2.Error as e:
+        db_conn.rollback()
+        logging.error("Error uploading minute: %s", e)
         return None
 
 
+def upload_all_data_in_one_statement(minute_df: pd.DataFrame, db_conn: connection,
+                                     event_df: pd.DataFrame,
+                                     removed_event_ids: list[int] = None) -> list[dict] | None:
+    """
+    Uploads transformed data to all tables in one round trip, returning new goals.
+    Returns None if the upload failed and nothing was written.
+    """
+
+    minute_rows = get_values_from_dataframe(minute_df)
+
+    if event_df.empty:
+        inserted_event_ids = upload_rows(db_conn, list(minute_df.columns), minute_rows,
+                                         [], [], [], removed_event_ids)
+        return None if inserted_event_ids is None else []
+
+    event_rows = get_values_from_dataframe(
+        event_df[["match_event_id", "event_type_id", "team_id"]])
+    player_rows = get_values_from_dataframe(get_players_df(event_df))
+    link_rows = [row for row in get_values_from_dataframe(
+        event_df[["match_event_id", "event_type_id", "player_id", "related_player_id"]])
+        if row[2] is not None]
+
+    inserted_event_ids = upload_rows(db_conn, list(minute_df.columns), minute_rows,
+                                     event_rows, player_rows, link_rows, removed_event_ids)
+
+    if inserted_event_ids is None:
+        return None
+
+    if not inserted_event_ids:
+        return []
+
+    goals_df = event_df[(event_df["type_name"].str.lower() == "goal")
+                        & event_df["match_event_id"].isin(inserted_event_ids)]
+
+    return goals_df[[
+        "match_event_id", "match_id", "team_id", "player_name", "minute", "type_name"
+    ]].to_dict(orient="records")
+
+
+def get_player_rows(event_rows: list[dict]) -> list[tuple]:
+    """Returns each player and related player in the events once, as get_players_df does."""
+
+    players = {}
+    for id_key, name_key in (("player_id", "player_name"),
+                             ("related_player_id", "related_player_name")):
+        for event in event_rows:
+            if event.get(id_key) is not None:
+                players.setdefault(event[id_key], event.get(name_key))
+
+    return list(players.items())
+
+
+def upload_all_rows(minute_row: dict, event_rows: list[dict], db_conn: connection,
+                    removed_event_ids: list[int] = None) -> list[dict] | None:
+    """
+    Uploads rows from the dict transform engine to all tables in one round trip,
+    returning new goals. Returns None if the upload failed and nothing was written.
+    """
+
+    events = [(event["match_event_id"], event["event_type_id"], event["team_id"])
+              for event in event_rows]
+    links = [(event["match_event_id"], event["event_type_id"],
+              event.get("player_id"), event.get("related_player_id"))
+             for event in event_rows if event.get("player_id") is not None]
+
+    inserted_event_ids = upload_rows(
+        db_conn, list(minute_row), [tuple(minute_row.values())],
+        events, get_player_rows(event_rows) if event_rows else [], links,
+        removed_event_ids)
+
+    if inserted_event_ids is None:
+        return None
+
+    return [{key: event.get(key) for key in (
+        "match_event_id", "match_id", "team_id", "player_name", "minute", "type_name")}
+        for event in event_rows
+        if event["type_name"].lower() == "goal"
+        and event["match_event_id"] in inserted_event_ids]
+
+
 def upload_all_data(minute_df: pd.DataFrame, db_conn: connection,
-                    event_df: pd.DataFrame = None) -> list[dict]:
-    """Upload transformed data to all relevant tables."""
+                    event_df: pd.DataFrame = None, engine: str = "statement",
+                    removed_event_ids: list[int] = None) -> list[dict] | None:
+    """
+    Upload transformed data to all relevant tables, deleting removed events.
+    The default "statement" engine writes every table in one transaction
+    and round trip, and upserts amended events.
+    The "values" and "copy" engines write table by table,
+    with execute_values or COPY into staging tables, and copy is faster
+    for backfills and replays. These only insert events not yet stored.
+    Returns None if the upload failed, or if the minute or events failed with values or copy.
+    """
+
+    if engine == "statement":
+        return upload_all_data_in_one_statement(
+            minute_df, db_conn, event_df, removed_event_ids)
+
+    insert = LOAD_ENGINES[engine]
+
+    if removed_event_ids:
+        delete_events(removed_event_ids, db_conn)
 
     logging.info("Uploading to match_minute_stats ...")
-    match_minute_stats_id = insert_dataframe(
-        minute_df, "match_minute_stats", db_conn, "match_minute_stats_id")
+    match_minute_stats_id = insert(
+        minute_df, "match_minute_stats", db_conn, "match_minute_stats_id",
+        MINUTE_KEY, update=True)
+
+    if match_minute_stats_id is None:
+        return None
 
     if not event_df.empty:
         if isinstance(match_minute_stats_id, list):
@@ -94,14 +449,16 @@ def upload_all_data(minute_df: pd.DataFrame, db_conn: connection,
         goal_check = get_if_goal_scored_this_run(event_df, db_conn)
 
         logging.info("Uploading to match_event ...")
-        insert_dataframe(match_event_df, "match_event",
-                         db_conn, "match_event_id", "match_event_id")
+        if insert(match_event_df, "match_event",
+                  db_conn, "match_event_id", "match_event_id") is None:
+            return None
+        record_announced_goals(event_df)
 
         player_df = get_players_df(event_df)
 
         logging.info("Uploading to player ...")
-        insert_dataframe(player_df, "player", db_conn,
-                         returning="player_id", conflict="player_id")
+        insert(player_df, "player", db_conn,
+               returning="player_id", conflict="player_id")
 
         player_match_event_df = event_df[["match_event_id",
                                           "player_id", "related_player_id"]].copy()
@@ -111,16 +468,45 @@ def upload_all_data(minute_df: pd.DataFrame, db_conn: connection,
             float).astype('Int64')
 
         logging.info("Uploading to player_match_event ...")
-        insert_dataframe(player_match_event_df, "player_match_event",
-                         db_conn, conflict=["match_event_id", "player_id"])
+        insert(player_match_event_df, "player_match_event",
+               db_conn, conflict=["match_event_id", "player_id"])
 
         return goal_check
     return []
 
 
+def get_stored_event_ids(match_id: int, db_conn: connection) -> set[int]:
+    """Returns the ids of every event stored for a match, through its minutes."""
+
+    with db_conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT me.match_event_id FROM match_event AS me
+            JOIN match_minute_stats AS mms USING (match_minute_stats_id)
+            WHERE mms.match_id = %s
+            """, (match_id,))
+        stored_ids = {row[0] for row in cursor.fetchall()}
+    db_conn.rollback()
+
+    return stored_ids
+
+
+def delete_events(match_event_ids: list[int], db_conn: connection) -> None:
+    """Deletes events, and their player links, that the API no longer returns."""
+
+    with db_conn.cursor() as cursor:
+        cursor.execute("DELETE FROM match_event WHERE match_event_id = ANY(%s)",
+                       (list(match_event_ids),))
+    db_conn.commit()
+
+    logging.info("Deleted %s removed events.", len(match_event_ids))
+
+
 def get_players_df(event_df: pd.DataFrame):
     """Uploads the match event data."""
 
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
     players = pd.concat([
         event_df[["player_id", "player_name"]].rename(
             columns={"player_id": "id",
@@ -138,24 +524,39 @@ def get_players_df(event_df: pd.DataFrame):
 
 
 def get_if_goal_scored_this_run(event_df: pd.DataFrame, db_conn: connection) -> list[dict]:
-    """Returns information on if a goal was recorded for this minute."""
+    """
+    Returns information on if a goal was recorded for this minute.
+    Goals already loaded by this container are skipped without a query,
+    and only the remaining candidate ids are looked up, using the
+    match_event primary key, so the cost does not grow with goal history.
+    Used by the values and copy engines, which check goals before inserting events.
+    The statement engine reads new goals from the rows its insert returns instead.
+    """
 
     goals_df = event_df[event_df["type_name"].str.lower() == "goal"]
-    goal_event_ids = set(goals_df["match_event_id"])
+    goal_event_ids = set(int(event_id)
+                         for event_id in goals_df["match_event_id"])
 
     if not goal_event_ids:
         return []
 
+    match_id = int(goals_df["match_id"].iloc[0])
+    candidate_ids = goal_event_ids - ANNOUNCED_GOALS.get(match_id, set())
+
+    if not candidate_ids:
+        return []
+
     with db_conn.cursor() as curs:
         curs.execute(
             """
             SELECT m.match_event_id FROM match_event as m
             JOIN event_type as e USING (event_type_id)
             WHERE e.type_name = 'goal'
-            """)
+            AND m.match_event_id = ANY(%s)
+            """, (sorted(candidate_ids),))
         known_goal_ids = set(row[0] for row in curs.fetchall())
 
-    new_goals = goal_event_ids - known_goal_ids
+    new_goals = candidate_ids - known_goal_ids
 
     if not new_goals:
         return []
@@ -169,8 +570,22 @@ def get_if_goal_scored_this_run(event_df: pd.DataFrame, db_conn: connection) ->
     return new_goals_info
 
 
+def record_announced_goals(event_df: pd.DataFrame) -> None:
+    """Remembers a minute's goals once its events are loaded, so they are not looked up again."""
+
+    goals_df = event_df[event_df["type_name"].str.lower() == "goal"]
+    if goals_df.empty:
+        return
+
+    ANNOUNCED_GOALS.setdefault(int(goals_df["match_id"].iloc[0]), set()).update(
+        int(event_id) for event_id in goals_df["match_event_id"])
+
+
 if __name__ == "__main__":
 
+    from dotenv import load_dotenv
+    from transform import get_dataframe_from_json, transform_data
+
     load_dotenv()
 
     base_df = get_dataframe_from_json("match_19348530/scrape_101.json")
@@ -0,0 +1,143 @@
+"""
+Match state shared by both transform engines, without pandas:
+the period in play, the events already loaded for each match,
+and how soon the match should be polled again.
+"""
+
+from json import dumps
+from hashlib import sha1
+import logging
+
+from columns import EVENT_FIELDS
+
+logger = logging.getLogger(__name__)
+
+PROCESSED_EVENTS: dict[int, dict[int, str]] = {}
+
+DEFAULT_POLL_SECONDS = 60
+FAST_POLL_SECONDS = 30
+BREAK_POLL_SECONDS = 120
+NOT_STARTED_POLL_SECONDS = 120
+# How early a scheduled run can be and still poll, as invocations start a few seconds late.
+POLL_TOLERANCE_SECONDS = 5
+
+# The match minute each period type is scheduled to end at, after which is stoppage time.
+PERIOD_END_MINUTES = {1: 45, 2: 90, 3: 105, 4: 120}
+
+# VAR, goals, penalties and red cards, after which more is likely to happen soon.
+DANGEROUS_EVENT_TYPE_IDS = {10, 14, 15, 16, 17, 20}
+RECENT_EVENT_MINUTES = 2
+
+
+def get_active_period(periods: list[dict]) -> dict:
+    """Returns the current period that is in play."""
+
+    for period in periods:
+        if period.get("ticking", False):
+
+            logger.info("Found active period.")
+            return period
+
+    for period in reversed(periods):
+        if 'started' in period:
+
+            logger.info("Found last active period.")
+            return period
+
+    return periods[-1]
+
+
+def get_period_state(periods: list[dict]) -> tuple[bool, int, int]:
+    """Returns the the state of the half, the current half and the minute."""
+
+    active_period = get_active_period(periods)
+
+    ticking = active_period.get("ticking", False)
+    type_id = active_period.get("type_id", -1)
+    minute = active_period.get("minutes", -1)
+
+    logger.info("Is half live: %s. Current half: %s. Current minute: %s.",
+                ticking, type_id, minute)
+    return (ticking, type_id, minute)
+
+
+def has_recent_dangerous_event(events: list[dict], minute: int) -> bool:
+    """Returns True if a dangerous event happened in the last RECENT_EVENT_MINUTES."""
+
+    return any(event.get("type_id") in DANGEROUS_EVENT_TYPE_IDS
+               and (event.get("minute") or 0) >= minute - RECENT_EVENT_MINUTES
+               for event in events)
+
+
+def get_poll_interval(fixture: dict) -> int | None:
+    """
+    Returns the seconds until a match should next be polled, from its state,
+    or None once it is over.
+    Matches are polled less often before kick off and during breaks,
+    and more often in stoppage time and just after a dangerous event.
+    """
+
+    if fixture.get("result_info") is not None:
+        return None
+
+    periods = fixture.get("periods") or []
+    if not periods:
+        return NOT_STARTED_POLL_SECONDS
+
+    ticking, type_id, minute = get_period_state(periods)
+    if not ticking:
+        return BREAK_POLL_SECONDS
+
+    if (minute >= PERIOD_END_MINUTES.get(type_id, minute + 1)
+            or has_recent_dangerous_event(fixture.get("events") or [], minute)):
+        return FAST_POLL_SECONDS
+
+    return DEFAULT_POLL_SECONDS
+
+
+def get_event_digest(event: dict) -> str:
+    """Returns a hash of the parts of an event we store."""
+
+    stored_fields = {key: value for key, value in event.items()
+                     if key in EVENT_FIELDS}
+    return sha1(dumps(stored_fields, sort_keys=True, default=str)
+                .encode("utf-8")).hexdigest()
+
+
+def get_event_changes(match_id: int, events: list[dict],
+                      stored_ids: set[int] = None) -> tuple[list[dict], list[int]]:
+    """
+    Returns the events that are new or amended since the last recorded run,
+    and the ids of stored events the API no longer returns, e.g. after VAR.
+    Events above the match's high-water mark are new, and events at or below
+    it are only returned when their content has changed.
+    Removals are taken from stored_ids, the events stored for the match, when given,
+    as a container only remembers the events it loaded itself.
+    An empty event list never removes events, as it is more likely a bad poll.
+    """
+
+    processed = PROCESSED_EVENTS.get(match_id, {})
+    high_water_mark = max(processed, default=0)
+
+    changed_events = [event for event in events
+                      if event["id"] > high_water_mark
+                      or processed.get(event["id"]) != get_event_digest(event)]
+
+    current_ids = {event["id"] for event in events}
+    known_ids = set(processed) if stored_ids is None else set(stored_ids)
+    removed_ids = sorted(known_ids - current_ids) if events else []
+
+    logger.info("%s new or amended events, %s removed events.",
+                len(changed_events), len(removed_ids))
+    return changed_events, removed_ids
+
+
+def record_processed_events(match_id: int, events: list[dict],
+                            removed_ids: list[int]) -> None:
+    """Records events as loaded, so later runs only send their changes."""
+
+    processed = PROCESSED_EVENTS.setdefault(match_id, {})
+    processed.update({event["id"]: get_event_digest(event) for event in events})
+
+    for event_id in removed_ids:
+        processed.pop(event_id, None)
@@ -1,14 +1,28 @@
 """Main Pipeline Script."""
 
+from __future__ import annotations
 from os import environ as ENV
-from http.client import HTTPSConnection
+from time import time
+from typing import TYPE_CHECKING
 import logging
 
-from dotenv import load_dotenv
+from psycopg2.extensions import connection
 
-from extract import run_extract
-from transform import get_dataframe_from_response, transform_data
-from load import get_connection, upload_all_data
+from extract import run_extract, run_batch_extract, fetch_live_fixtures
+from match_state import (get_event_changes, record_processed_events,
+                         get_poll_interval, PROCESSED_EVENTS, POLL_TOLERANCE_SECONDS)
+from load import (get_connection, get_stored_event_ids, upload_all_data, upload_all_rows,
+                  ANNOUNCED_GOALS)
+from dict_transform import transform_fixture
+from metrics import start_run, add_metric, timed, finish_run
+from profiling import profile_handler
+from resources import get_cached_db_connection, request_with_reconnect
+from fingerprint import (get_payload_fingerprint, create_fingerprint_store,
+                         get_store_type, get_unchanged_flags)
+from livescore_cache import create_livescore_cache, get_cache_type, get_live_fixture
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(
@@ -17,46 +31,424 @@ logging.basicConfig(
     datefmt="%Y-%m-%dT%H:%M:%S"
 )
 
+FINGERPRINT_STORES = {}
+LIVESCORE_CACHES = {}
 
-def lambda_handler(event=None, context=None):
-    """Runs the ETL Pipeline."""
 
-    logger.info("Lambda function started.")
-    match_id = event["match_id"]
+def get_fingerprint_store():
+    """Returns the fingerprint store, created once per container."""
+
+    if "store" not in FINGERPRINT_STORES:
+        FINGERPRINT_STORES["store"] = create_fingerprint_store(
+            get_store_type(), lambda: get_cached_db_connection(get_connection))
+
+    return FINGERPRINT_STORES["store"]
 
-    api_token = ENV["TOKEN"]
-    api_conn = HTTPSConnection(ENV["BASE_URL"])
-    db_conn = get_connection()
 
-    raw_data = run_extract(match_id, api_token, api_conn)
-    api_conn.close()
+def get_livescore_cache():
+    """Returns the live score cache, created once per container, or None if it is off."""
 
-    df = get_dataframe_from_response(raw_data)
+    if "cache" not in LIVESCORE_CACHES:
+        cache_type = get_cache_type()
+        LIVESCORE_CACHES["cache"] = cache_type and create_livescore_cache(
+            cache_type, lambda: get_cached_db_connection(get_connection),
+            ENV.get("LIVESCORE_CACHE_PATH"))
+    return LIVESCORE_CACHES["cache"]
 
-    if df["periods"].map(bool).any():
-        minute_df, event_df, flags = transform_data(df)
 
-        if flags["half_live"] and not flags["game_over"]:
+def extract_match(match_id: int, api_token: str) -> dict:
+    """
+    Returns the API response for a match.
+    With a live score cache, the fixture is read from the minute's in-play feed,
+    fetched once for every match, falling back to requesting the match on its own
+    when it is not in play, e.g. before kick off.
+    """
 
-            new_goals = upload_all_data(minute_df, db_conn, event_df)
+    cache = get_livescore_cache()
+    if cache:
+        fixture, hit = get_live_fixture(cache, match_id, lambda: request_with_reconnect(
+            ENV["BASE_URL"], lambda api_conn: fetch_live_fixtures(api_token, api_conn)))
+        add_metric("livescore_cache_hits" if hit else "livescore_cache_misses", 1)
+
+        if fixture is not None:
+            return {"data": fixture}
+        add_metric("livescore_cache_fallbacks", 1)
+
+    return request_with_reconnect(
+        ENV["BASE_URL"], lambda api_conn: run_extract(match_id, api_token, api_conn))
+
+
+def get_not_started_output(match_id: int) -> dict:
+    """Returns the Step Functions output for a game that has not started."""
+
+    logger.info("%s game has not started yet.", match_id)
+    return {
+        "flags": "Game has not started yet.",
+        "match_id": match_id
+    }
+
+
+def get_match_event_changes(match_id: int, events: list[dict],
+                            db_conn: connection) -> tuple[list[dict], list[int]]:
+    """
+    Returns the new or amended events of a match, and the ids of the events stored for it
+    that the API no longer returns, read from the database, so a container that has not
+    seen the match before still deletes them.
+    """
+
+    stored_ids = get_stored_event_ids(match_id, db_conn) if events else set()
+    return get_event_changes(match_id, events, stored_ids)
+
+
+def load_fixture(match_id: int, flags: dict, changed_events: list[dict],
+                 removed_ids: list[int], upload) -> dict:
+    """
+    Runs the upload while a half is live, recording the events it loaded,
+    and returns the Step Functions output, with an error if the upload failed.
+    """
+
+    new_goals = []
+    error = None
+    if flags["half_live"] and not flags["game_over"]:
+
+        new_goals = upload()
+
+        if new_goals is None:
+            logger.error("%s upload failed, events will be resent next run.", match_id)
+            error = "Upload failed."
+            new_goals = []
+        else:
+            record_processed_events(match_id, changed_events, removed_ids)
             logger.info("ETL pipeline run successful.")
 
-        db_conn.close()
+    if flags["game_over"]:
+        PROCESSED_EVENTS.pop(match_id, None)
+        ANNOUNCED_GOALS.pop(match_id, None)
 
-    else:
-        logger.info("%s game has not started yet.", match_id)
-        return {
-            "flags": "Game has not started yet.",
+    flags["goal_check"] = new_goals
+    output = {
+        "flags": flags,
+        "match_id": match_id
+    }
+    if error:
+        output["error"] = error
+    return output
+
+
+def process_fixture(df: pd.DataFrame, match_id: int, db_conn: connection,
+                    df_map: pd.DataFrame = None) -> dict:
+    """
+    Transforms and loads a single fixture, returning the Step Functions output.
+    The pandas engine is imported on first use, so the dict engine never loads pandas.
+    """
+
+    from transform import transform_data  # pylint: disable=import-outside-toplevel
+
+    if not df["periods"].map(bool).any():
+        return get_not_started_output(match_id)
+
+    changed_events, removed_ids = get_match_event_changes(
+        match_id, df.at[0, "events"], db_conn)
+    with timed("transform_ms"):
+        minute_df, event_df, flags = transform_data(df, df_map, changed_events)
+
+    return load_fixture(match_id, flags, changed_events, removed_ids,
+                        lambda: upload_all_data(minute_df, db_conn, event_df,
+                                                removed_event_ids=removed_ids))
+
+
+def process_fixture_rows(fixture: dict, match_id: int, db_conn: connection) -> dict:
+    """
+    Transforms and loads a single fixture with the dict transform engine,
+    returning the same Step Functions output as process_fixture.
+    """
+
+    if not fixture.get("periods"):
+        return get_not_started_output(match_id)
+
+    changed_events, removed_ids = get_match_event_changes(match_id, fixture["events"], db_conn)
+    with timed("transform_ms"):
+        minute_row, event_rows, flags = transform_fixture(fixture, changed_events)
+
+    return load_fixture(match_id, flags, changed_events, removed_ids,
+                        lambda: upload_all_rows(minute_row, event_rows, db_conn,
+                                                removed_event_ids=removed_ids))
+
+
+def get_transform_engine() -> str:
+    """Returns the transform engine configured by TRANSFORM_ENGINE, either pandas or dict."""
+
+    engine = ENV.get("TRANSFORM_ENGINE", "pandas")
+    if engine not in ("pandas", "dict"):
+        raise ValueError(f"Unknown transform engine: {engine}.")
+    return engine
+
+
+def get_unchanged_output(fixture: dict, match_id: int) -> tuple[str, dict | None]:
+    """
+    Returns the fixture's payload fingerprint, and the last flags as the Step Functions output
+    if the payload matches the last run for the match, or None if it has changed.
+    """
+
+    fingerprint = get_payload_fingerprint(fixture)
+
+    last_run = get_fingerprint_store().get(match_id)
+    if last_run and last_run[0] == fingerprint:
+        logger.info("%s payload unchanged, skipping transform and load.", match_id)
+        add_metric("unchanged_payloads", 1)
+        return fingerprint, {
+            "flags": get_unchanged_flags(last_run[1]),
             "match_id": match_id
         }
+    return fingerprint, None
 
-    flags["goal_check"] = new_goals
+
+def store_fingerprint(match_id: int, fingerprint: str, result: dict) -> None:
+    """Remembers a payload once it has loaded, so a failed upload is retried."""
+
+    if "error" not in result:
+        get_fingerprint_store().put(match_id, fingerprint, get_unchanged_flags(result["flags"]))
+
+
+def process_fixture_if_changed(fixture: dict, match_id: int, db_conn: connection,
+                               df_map: pd.DataFrame = None) -> dict:
+    """
+    Processes a fixture unless its payload matches the last run for the match,
+    in which case the last flags are returned without transforming or loading.
+    The payload is only remembered once it has loaded, so a failed upload is retried.
+    """
+
+    fingerprint, unchanged = get_unchanged_output(fixture, match_id)
+    if unchanged:
+        return unchanged
+
+    if get_transform_engine() == "dict":
+        result = process_fixture_rows(fixture, match_id, db_conn)
+    else:
+        from transform import get_dataframe_from_response  # pylint: disable=import-outside-toplevel
+        with timed("transform_ms"):
+            df = get_dataframe_from_response({"data": fixture})
+        result = process_fixture(df, match_id, db_conn, df_map)
+
+    store_fingerprint(match_id, fingerprint, result)
+    return result
+
+
+def get_error_output(match_id: int, error: Exception) -> dict:
+    """Returns the Step Functions output for a fixture that failed to process."""
+
+    logger.error("Failed to process match %s: %s.", match_id, error)
     return {
-        "flags": flags,
-        "match_id": match_id
+        "match_id": match_id,
+        "error": str(error)
     }
 
 
+def process_each_fixture(fixtures: list[dict], db_conn: connection,
+                         df_map: pd.DataFrame = None) -> dict[int, dict]:
+    """Transforms and loads each fixture on its own, returning the output of each by match_id."""
+
+    from transform import get_dataframe_from_response  # pylint: disable=import-outside-toplevel
+
+    results = {}
+    for fixture in fixtures:
+        try:
+            results[fixture["id"]] = process_fixture(
+                get_dataframe_from_response({"data": fixture}), fixture["id"], db_conn, df_map)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            results[fixture["id"]] = get_error_output(fixture["id"], e)
+    return results
+
+
+def process_fixtures(fixtures: list[dict], db_conn: connection,
+                     df_map: pd.DataFrame = None) -> list[dict]:
+    """
+    Transforms many fixtures in one pass with transform_fixtures, then loads each on its own,
+    returning the Step Functions output of each fixture in order.
+    If the pass fails, each fixture is transformed on its own, so a bad fixture only fails itself.
+    """
+
+    from transform import (get_dataframe_from_response,  # pylint: disable=import-outside-toplevel
+                           transform_fixtures)
+
+    results = {fixture["id"]: get_not_started_output(fixture["id"])
+               for fixture in fixtures if not fixture.get("periods")}
+
+    changes = {}
+    for fixture in fixtures:
+        if fixture["id"] in results:
+            continue
+        try:
+            changes[fixture["id"]] = get_match_event_changes(
+                fixture["id"], fixture["events"], db_conn)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            results[fixture["id"]] = get_error_output(fixture["id"], e)
+
+    started = [fixture for fixture in fixtures if fixture["id"] in changes]
+    if not started:
+        return [results[fixture["id"]] for fixture in fixtures]
+
+    try:
+        with timed("transform_ms"):
+            minute_df, event_df, flags = transform_fixtures(
+                get_dataframe_from_response({"data": started}), df_map,
+                {match_id: changed_events for match_id, (changed_events, _) in changes.items()})
+
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.warning("Transforming %s fixtures at once failed: %s. Transforming each.",
+                       len(started), e)
+        results.update(process_each_fixture(started, db_conn, df_map))
+        return [results[fixture["id"]] for fixture in fixtures]
+
+    for match_id, (changed_events, removed_ids) in changes.items():
+        match_event_df = (event_df[event_df["match_id"] == match_id]
+                          if "match_id" in event_df else event_df)
+        try:
+            results[match_id] = load_fixture(
+                match_id, flags[match_id], changed_events, removed_ids,
+                lambda minute_df=minute_df[minute_df["match_id"] == match_id],
+                event_df=match_event_df, removed_ids=removed_ids:
+                    upload_all_data(minute_df, db_conn, event_df, removed_event_ids=removed_ids))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            results[match_id] = get_error_output(match_id, e)
+
+    return [results[fixture["id"]] for fixture in fixtures]
+
+
+def get_early_poll_output(match_id: int, now: float) -> dict | None:
+    """
+    Returns the last flags as the Step Functions output when the schedule invokes a match
+    before its state asked to be polled again, e.g. at half time or after full time,
+    so the API is not called. Returns None when the match is due.
+    """
+
+    store = get_fingerprint_store()
+    next_poll_at = store.get_next_poll(match_id)
+    if next_poll_at is None or now >= next_poll_at - POLL_TOLERANCE_SECONDS:
+        return None
+
+    last_run = store.get(match_id)
+    if last_run is None:
+        return None
+
+    logger.info("%s is not due to be polled yet, skipping the API.", match_id)
+    add_metric("api_calls_saved", 1)
+    return {
+        "flags": get_unchanged_flags(last_run[1]),
+        "match_id": match_id,
+        "next_poll_seconds": None if next_poll_at == float("inf") else next_poll_at - now
+    }
+
+
+@profile_handler
+def lambda_handler(event=None, context=None):
+    """
+    Runs the ETL Pipeline, returning the run's metrics alongside the output,
+    and the seconds until the match should next be polled, or None at full time.
+    The schedule invokes every match each minute, so a run before the match is due
+    returns the last output without calling the API.
+    """
+
+    logger.info("Lambda function started.")
+    match_id = event["match_id"]
+    start_run("pipeline", match_id=match_id)
+
+    now = time()
+    result = get_early_poll_output(match_id, now)
+    if result is not None:
+        result["metrics"] = finish_run()
+        return result
+
+    with timed("extract_ms"):
+        raw_data = extract_match(match_id, ENV["TOKEN"])
+
+    db_conn = get_cached_db_connection(get_connection)
+
+    if isinstance(raw_data.get("data"), dict):
+        result = process_fixture_if_changed(raw_data["data"], match_id, db_conn)
+        result["next_poll_seconds"] = get_poll_interval(raw_data["data"])
+        if "error" not in result:
+            get_fingerprint_store().put_next_poll(
+                match_id, float("inf") if result["next_poll_seconds"] is None
+                else now + result["next_poll_seconds"])
+    else:
+        from transform import get_dataframe_from_response  # pylint: disable=import-outside-toplevel
+        with timed("transform_ms"):
+            df = get_dataframe_from_response(raw_data)
+        result = process_fixture(df, match_id, db_conn)
+
+    result["metrics"] = finish_run()
+    return result
+
+
+@profile_handler
+def batch_lambda_handler(event=None, context=None):
+    """
+    Runs the ETL Pipeline for many fixtures in one invocation.
+    Takes a list of match ids, or polls every in-play fixture when none are given,
+    and returns one Step Functions output per fixture.
+    Fixtures whose payload is unchanged are skipped as they are decoded from the response.
+    If the response fails partway, the fixtures already read are still processed,
+    followed by an output with the error and no match_id.
+    With the pandas engine, the rest are transformed together in one pass and loaded one by one,
+    and with the dict engine each is processed before the next is read.
+    """
+
+    logger.info("Batch lambda function started.")
+    match_ids = (event or {}).get("match_ids")
+    start_run("pipeline", handler="batch")
+
+    api_token = ENV["TOKEN"]
+    with timed("extract_ms"):
+        fixtures = request_with_reconnect(
+            ENV["BASE_URL"], lambda api_conn: run_batch_extract(match_ids, api_token, api_conn))
+
+    engine = get_transform_engine()
+    df_map = None
+    if engine == "pandas":
+        from transform import get_compiled_type_mapping  # pylint: disable=import-outside-toplevel
+        df_map = get_compiled_type_mapping()
+    db_conn = get_cached_db_connection(get_connection)
+
+    results = []
+    changed = {}
+    try:
+        for fixture in fixtures:
+            match_id = fixture.get("id")
+            try:
+                if engine == "dict":
+                    results.append(process_fixture_if_changed(fixture, match_id, db_conn))
+                    continue
+
+                fingerprint, unchanged = get_unchanged_output(fixture, match_id)
+                if unchanged is None:
+                    changed[len(results)] = (fixture, fingerprint)
+                results.append(unchanged)
+
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                results.append(get_error_output(match_id, e))
+
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.error("Reading the fixtures failed after %s fixtures: %s.", len(results), e)
+        results.append({"match_id": None, "error": str(e)})
+
+    if changed:
+        outputs = process_fixtures([fixture for fixture, _ in changed.values()], db_conn, df_map)
+        for (index, (fixture, fingerprint)), result in zip(changed.items(), outputs):
+            store_fingerprint(fixture["id"], fingerprint, result)
+            results[index] = result
+
+    if match_ids:
+        missing_ids = set(match_ids) - {result["match_id"] for result in results}
+        for match_id in missing_ids:
+            logger.info("%s was not returned by the API.", match_id)
+
+    logger.info("Processed %s fixtures.", len(results))
+    add_metric("fixtures", len(results))
+    return {"results": results, "metrics": finish_run()}
+
+
 if __name__ == "__main__":
 
+    from dotenv import load_dotenv
     load_dotenv()
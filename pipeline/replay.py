@@ -0,0 +1,166 @@
+"""
+Replays recorded scrapes through the transform and load, to backfill lost matches
+or load test the database. A match is either a snapshot archive, as written by
+scrape_live_game.py, or a directory of scrape_N.json files.
+Each match is replayed in order by its own worker process, with its own
+database connection, either as fast as possible or at the pace it was scraped.
+"""
+
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from os import path
+from time import perf_counter, sleep
+import logging
+
+from archive import SnapshotArchive, get_base_path, get_scrape_files, is_archive
+from load import get_connection, upload_all_data
+from transform import (get_dataframe_from_json, get_dataframe_from_response,
+                       get_compiled_type_mapping, transform_data)
+
+logger = logging.getLogger(__name__)
+
+
+def get_snapshot_dataframes(source: str):
+    """
+    Yields a DataFrame for each snapshot of a match, in the order scraped,
+    or None for snapshots without data, such as API errors.
+    """
+
+    if is_archive(get_base_path(source)):
+        for snapshot in SnapshotArchive(get_base_path(source)):
+            try:
+                yield get_dataframe_from_response(snapshot)
+            except ValueError:
+                yield None
+        return
+
+    for file_path in get_scrape_files(source):
+        try:
+            yield get_dataframe_from_json(file_path)
+        except ValueError:
+            yield None
+
+
+def wait_for_snapshot(timestamp: float, first_timestamp: float,
+                      start: float, speed: float) -> None:
+    """Sleeps until a snapshot is due, relative to when the replay started."""
+
+    due = (timestamp - first_timestamp) / speed
+    delay = due - (perf_counter() - start)
+    if delay > 0:
+        sleep(delay)
+
+
+def replay_match(source: str, realtime: bool = False, speed: float = 1.0,
+                 engine: str = "copy") -> dict:
+    """
+    Replays every snapshot of a match through the transform and load,
+    returning the counts and time taken. Snapshots where no half is live are
+    transformed but not loaded, as in the pipeline, and error snapshots are skipped.
+    """
+
+    df_map = get_compiled_type_mapping()
+    db_conn = get_connection()
+
+    stats = {"source": source, "snapshots": 0, "skipped": 0,
+             "failed": 0, "minutes": 0, "rows": 0}
+    first_timestamp = None
+    start = perf_counter()
+
+    try:
+        for df in get_snapshot_dataframes(source):
+            if df is None:
+                logger.info("Skipping a snapshot of %s, it has no data.", source)
+                stats["skipped"] += 1
+                continue
+
+            if realtime and "request_timestamp" in df:
+                timestamp = df.at[0, "request_timestamp"]
+                first_timestamp = first_timestamp or timestamp
+                wait_for_snapshot(timestamp, first_timestamp, start, speed)
+
+            stats["snapshots"] += 1
+            if not df["periods"].map(bool).any():
+                continue
+
+            minute_df, event_df, flags = transform_data(df, df_map)
+            if not flags["half_live"] or flags["game_over"]:
+                continue
+
+            if upload_all_data(minute_df, db_conn, event_df, engine=engine) is None:
+                stats["failed"] += 1
+                continue
+
+            stats["minutes"] += len(minute_df)
+            stats["rows"] += len(minute_df) + len(event_df)
+
+    finally:
+        db_conn.close()
+
+    stats["seconds"] = perf_counter() - start
+    return stats
+
+
+def replay_matches(sources: list[str], workers: int = None, realtime: bool = False,
+                   speed: float = 1.0, engine: str = "copy") -> list[dict]:
+    """Replays many matches at once, one worker process per match."""
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(replay_match, source, realtime, speed, engine)
+                   for source in sources]
+        return [future.result() for future in futures]
+
+
+def get_throughput(results: list[dict], seconds: float) -> dict:
+    """Returns the total counts and the minutes and rows loaded per second."""
+
+    totals = {key: sum(result[key] for result in results)
+              for key in ("snapshots", "skipped", "failed", "minutes", "rows")}
+    totals["seconds"] = seconds
+    totals["minutes_per_sec"] = totals["minutes"] / seconds if seconds else 0.0
+    totals["rows_per_sec"] = totals["rows"] / seconds if seconds else 0.0
+    return totals
+
+
+def print_throughput(results: list[dict], totals: dict) -> None:
+    """Prints the throughput of each match and of the whole replay."""
+
+    print(f"{'match':<30}{'snapshots':>10}{'minutes':>9}{'rows':>8}{'failed':>8}{'sec':>9}")
+    for result in results:
+        print(f"{path.basename(path.normpath(result['source'])):<30}"
+              f"{result['snapshots']:>10}{result['minutes']:>9}{result['rows']:>8}"
+              f"{result['failed']:>8}{result['seconds']:>9.2f}")
+
+    print(f"\n{len(results)} matches, {totals['minutes']} minutes and {totals['rows']} rows "
+          f"in {totals['seconds']:.2f}s: {totals['minutes_per_sec']:.1f} minutes/sec, "
+          f"{totals['rows_per_sec']:.1f} rows/sec.")
+
+
+def main() -> None:
+    """Replays the matches given on the command line."""
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("sources", nargs="+",
+                        help="match_<id> archives or directories of scrapes")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes, defaults to the number of CPUs")
+    parser.add_argument("--realtime", action="store_true",
+                        help="replay at the pace the scrapes were taken")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="speed up a realtime replay, e.g. 10 for ten times faster")
+    parser.add_argument("--engine", choices=["statement", "values", "copy"], default="copy")
+    args = parser.parse_args()
+
+    start = perf_counter()
+    results = replay_matches(args.sources, args.workers, args.realtime,
+                             args.speed, args.engine)
+    print_throughput(results, get_throughput(results, perf_counter() - start))
+
+
+if __name__ == "__main__":
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    main()
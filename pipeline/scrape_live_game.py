@@ -1,60 +1,45 @@
 """Scraping a live game with the Sportsmonks API."""
 
-from os import environ as ENV, path, makedirs
+from os import environ as ENV
 from datetime import datetime, timezone
-from json import loads, load, dump
 from time import sleep
 from http.client import HTTPSConnection
 
 from dotenv import load_dotenv
 
 from extract import scrape_live_match, build_scrape_url, prepare_data
+from archive import SnapshotArchive
 
 
-def write_to_file_combined(filename: str, data: dict) -> None:
-    """Appends scraped data to a json file."""
+def prepare_snapshot(data: dict) -> dict:
+    """Returns a scraped response ready to archive, timestamping errors as they have no data."""
 
-    if not path.exists(filename) or path.getsize(filename) == 0:
-        with open(filename, 'w', encoding='utf-8') as f:
-            dump([data], f, indent=4)
-    else:
+    if "error" not in data:
+        return prepare_data(data)
 
-        with open(filename, "r+", encoding="utf-8") as f:
-            file_data = load(f)
-            file_data.append(data)
-            f.seek(0)
-            dump(file_data, f, indent=4)
-
-
-def write_to_file(filename: str, data: dict) -> None:
-    """Writes data to a json file."""
-
-    with open(filename, "w", encoding="utf-8") as f:
-        dump(data, f, indent=4)
+    data["timestamp"] = datetime.now(timezone.utc).timestamp()
+    return data
 
 
 def run_scraper(match_identifier: str | int,
                 token: str, conn: HTTPSConnection) -> None:
-    """Runs the scraper every 60 seconds until cancelled."""
+    """
+    Runs the scraper every 60 seconds until cancelled,
+    appending each snapshot to the match's archive.
+    """
 
     scrape_count = 1
     url = build_scrape_url(match_identifier, token)
-    makedirs(f"match_{str(match_identifier)}")
+    archive = SnapshotArchive(f"match_{match_identifier}")
 
     while True:
-        print(f"Scraping... {scrape_count} - {match_identifier}.")
-        filename = f"match_{match_identifier}/scrape_{scrape_count}.json"
+        print(f"Scraping... {scrape_count} - {match_identifier} "
+              f"to {archive.archive_path}.")
 
         data = scrape_live_match(url, conn)
         scrape_count += 1
 
-        if "error" not in data:
-            data = prepare_data(data)
-        else:
-            data["timestamp"] = datetime.now(
-                timezone.utc).timestamp()
-
-        write_to_file(filename, data)
+        archive.append(prepare_snapshot(data))
         sleep(60)
 
 
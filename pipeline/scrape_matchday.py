@@ -0,0 +1,192 @@
+"""
+Scrapes many live matches at once with asyncio, appending each to its own archive.
+Every match is polled on the minute, plus some jitter, over a shared pool of
+keep-alive API connections, with a rate limit across all of them,
+and stops on its own once result_info says the match is over,
+or MAX_MATCH_HOURS after it started scraping, if result_info is never set.
+"""
+
+from argparse import ArgumentParser
+from http.client import HTTPSConnection, HTTPException
+from os import environ as ENV
+from random import uniform
+from time import time
+import asyncio
+import logging
+
+from archive import SnapshotArchive
+from extract import scrape_live_match, build_scrape_url
+from scrape_live_game import prepare_snapshot
+
+logger = logging.getLogger(__name__)
+
+API_HOST = "api.sportmonks.com"
+MAX_MATCH_HOURS = 3
+
+
+class ConnectionPool:
+    """A fixed number of keep-alive API connections, shared by every match."""
+
+    def __init__(self, host: str, size: int, factory=HTTPSConnection):
+        self.host = host
+        self.factory = factory
+        self.idle = asyncio.Queue()
+        for _ in range(size):
+            self.idle.put_nowait(factory(host))
+
+    async def request(self, request):
+        """
+        Returns request(conn) run in a thread on a pooled connection, waiting for one to be idle.
+        If the server closed the kept-alive socket, it retries once on a new connection.
+        """
+
+        conn = await self.idle.get()
+        try:
+            try:
+                return await asyncio.to_thread(request, conn)
+
+            except (HTTPException, ConnectionError) as e:
+                logger.info("API connection to %s failed: %s. Reconnecting.", self.host, e)
+                conn.close()
+                conn = self.factory(self.host)
+                return await asyncio.to_thread(request, conn)
+
+        finally:
+            self.idle.put_nowait(conn)
+
+    def close(self) -> None:
+        """Closes every idle connection."""
+
+        while not self.idle.empty():
+            self.idle.get_nowait().close()
+
+
+class RateLimiter:
+    """Spaces requests evenly, so every match together stays under a rate per minute."""
+
+    def __init__(self, requests_per_minute: float):
+        self.interval = 60 / requests_per_minute
+        self.next_time = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        """Waits until the next request is allowed."""
+
+        async with self.lock:
+            now = asyncio.get_running_loop().time()
+            if self.next_time > now:
+                await asyncio.sleep(self.next_time - now)
+            self.next_time = max(now, self.next_time) + self.interval
+
+
+def get_next_poll(now: float, interval: float = 60, jitter: float = 0) -> float:
+    """Returns the time of the next poll: the next interval boundary plus up to jitter seconds."""
+
+    return (now // interval + 1) * interval + uniform(0, jitter)
+
+
+def is_match_over(snapshot: dict) -> bool:
+    """Returns True once result_info is set, i.e. the match has finished."""
+
+    fixture = snapshot.get("data")
+    if isinstance(fixture, list):
+        fixture = fixture[0] if fixture else None
+
+    return bool(fixture) and fixture.get("result_info") is not None
+
+
+async def scrape_match(match_id: int, token: str, pool: ConnectionPool,
+                       limiter: RateLimiter, *, interval: float = 60,
+                       jitter: float = 5, max_hours: float = MAX_MATCH_HOURS,
+                       clock=time) -> int:
+    """
+    Polls a match each interval, aligned to the clock, appending every snapshot
+    to its archive until the match is over, or max_hours have passed since the first poll
+    for a match that is postponed or abandoned. Returns the number of polls archived.
+    A failed poll is logged and retried on the next interval.
+    """
+
+    url = build_scrape_url(match_id, token)
+    archive = SnapshotArchive(f"match_{match_id}")
+    polls = 0
+    stop_at = clock() + max_hours * 3600
+
+    while True:
+        await limiter.wait()
+        try:
+            snapshot = prepare_snapshot(
+                await pool.request(lambda conn: scrape_live_match(url, conn)))
+            await asyncio.to_thread(archive.append, snapshot)
+            polls += 1
+
+            if is_match_over(snapshot):
+                logger.info("%s is over after %s polls.", match_id, polls)
+                return polls
+
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Polling %s failed: %s.", match_id, e)
+
+        if clock() >= stop_at:
+            logger.warning("%s is not over after %s hours. Stopping after %s polls.",
+                           match_id, max_hours, polls)
+            return polls
+
+        await asyncio.sleep(max(get_next_poll(clock(), interval, jitter) - clock(), 0))
+
+
+async def scrape_matches(match_ids: list[int], token: str, *, pool_size: int = 4,
+                         requests_per_minute: float = 50, jitter: float = 5,
+                         interval: float = 60, max_hours: float = MAX_MATCH_HOURS,
+                         factory=HTTPSConnection) -> dict[int, int | Exception]:
+    """
+    Scrapes every match at once until each is over, returning the polls per match.
+    A match whose archive cannot be opened is returned with its exception,
+    and the others carry on.
+    """
+
+    pool = ConnectionPool(API_HOST, pool_size, factory)
+    limiter = RateLimiter(requests_per_minute)
+
+    try:
+        results = await asyncio.gather(
+            *(scrape_match(match_id, token, pool, limiter,
+                           interval=interval, jitter=jitter, max_hours=max_hours)
+              for match_id in match_ids),
+            return_exceptions=True)
+    finally:
+        pool.close()
+
+    for match_id, result in zip(match_ids, results):
+        if isinstance(result, Exception):
+            logger.error("Scraping %s failed: %s.", match_id, result)
+
+    return dict(zip(match_ids, results))
+
+
+def main() -> None:
+    """Scrapes the matches given on the command line."""
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("match_ids", nargs="+", type=int)
+    parser.add_argument("--pool-size", type=int, default=4,
+                        help="API connections shared by every match")
+    parser.add_argument("--rate", type=float, default=50,
+                        help="most requests per minute across every match")
+    parser.add_argument("--jitter", type=float, default=5,
+                        help="most seconds each poll is delayed past the minute")
+    parser.add_argument("--max-hours", type=float, default=MAX_MATCH_HOURS,
+                        help="most hours a match is scraped for if it never ends")
+    args = parser.parse_args()
+
+    asyncio.run(scrape_matches(args.match_ids, ENV["TOKEN"], pool_size=args.pool_size,
+                               requests_per_minute=args.rate, jitter=args.jitter,
+                               max_hours=args.max_hours))
+
+
+if __name__ == "__main__":
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    logging.basicConfig(level="INFO")
+    main()
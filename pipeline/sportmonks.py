@@ -0,0 +1,389 @@
+"""
+A Sportmonks API client that stays within the hourly rate limit.
+Sportmonks allows a number of requests per entity (e.g. Fixture) per hour,
+and reports how many are left under rate_limit in every response.
+Each entity has a token bucket, refilled over the hour and corrected by that count,
+so requests wait for quota instead of failing, and rate limited or failed
+requests are retried with exponential backoff and jitter.
+Responses are requested gzip compressed, and multi-fixture responses can be
+decoded as they are read, one fixture at a time, so memory stays flat.
+The same module is copied into each service that calls the API.
+"""
+
+from codecs import getincrementaldecoder
+from collections.abc import Iterator
+from http.client import HTTPSConnection, HTTPResponse
+from json import JSONDecoder, JSONDecodeError, loads
+from random import uniform
+import gzip
+from threading import Lock
+from time import monotonic, sleep
+import logging
+import zlib
+
+from metrics import add_metric, set_metric
+
+API_HOST = "api.sportmonks.com"
+API_PREFIX = "/v3/football/"
+
+HOURLY_LIMIT = 3000
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 3
+BASE_DELAY = 1.0
+MAX_DELAY = 30.0
+MAX_WAIT = 30.0
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = " \t\n\r"
+
+ENTITIES = {
+    "fixtures": "Fixture",
+    "livescores": "Fixture",
+    "teams": "Team",
+    "players": "Player",
+    "leagues": "League",
+    "seasons": "Season"
+}
+
+
+class TokenBucket:
+    """
+    The requests left for an entity this hour.
+    Tokens refill evenly over the hour, and the remaining count in each response
+    replaces the bucket's own, as other containers share the same quota.
+    """
+
+    def __init__(self, capacity: int = HOURLY_LIMIT, period: float = 3600, clock=monotonic):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.updated = clock()
+        self.lock = Lock()
+
+    def refill(self) -> None:
+        """Adds the tokens earned since the last refill."""
+
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, max_wait: float = MAX_WAIT) -> float | None:
+        """
+        Takes a token, returning how many seconds to wait before the request is allowed,
+        or None without taking one if that would be longer than max_wait.
+        """
+
+        with self.lock:
+            self.refill()
+            wait = max((1 - self.tokens) / self.rate, 0.0)
+            if wait > max_wait:
+                return None
+            self.tokens -= 1
+            return wait
+
+    def update(self, remaining: int, resets_in_seconds: float = None) -> None:
+        """
+        Sets the tokens to the remaining requests the API reported.
+        With none left, requests wait until the quota resets.
+        """
+
+        with self.lock:
+            self.refill()
+            self.tokens = float(remaining)
+            if remaining <= 0 and resets_in_seconds:
+                self.tokens -= resets_in_seconds * self.rate
+
+
+BUCKETS: dict[str, TokenBucket] = {}
+
+
+def get_entity(url: str) -> str:
+    """Returns the rate limited entity of a url, e.g. Fixture for fixtures/19411877."""
+
+    resource = url.removeprefix(API_PREFIX).split("?")[0].split("/")[0]
+    return ENTITIES.get(resource, resource.title())
+
+
+def get_bucket(entity: str) -> TokenBucket:
+    """Returns the token bucket of an entity, created once per container."""
+
+    if entity not in BUCKETS:
+        BUCKETS[entity] = TokenBucket()
+    return BUCKETS[entity]
+
+
+def get_backoff_delay(attempt: int, retry_after: str = None) -> float:
+    """
+    Returns the seconds to wait before a retry: a random delay up to an exponentially
+    growing cap, or the server's Retry-After if that is longer.
+    """
+
+    delay = uniform(0, min(MAX_DELAY, BASE_DELAY * 2 ** attempt))
+    if isinstance(retry_after, str) and retry_after.isdigit():
+        delay = max(delay, float(retry_after))
+    return delay
+
+
+def record_rate_limit(body: dict, entity: str) -> bool:
+    """Updates the entity's bucket from the rate_limit of a response, returning if it had one."""
+
+    rate_limit = body.get("rate_limit") if isinstance(body, dict) else None
+    if not rate_limit or "remaining" not in rate_limit:
+        return False
+
+    entity = rate_limit.get("requested_entity", entity)
+    get_bucket(entity).update(rate_limit["remaining"], rate_limit.get("resets_in_seconds"))
+    set_metric("rate_limit_remaining", rate_limit["remaining"])
+    return True
+
+
+def parse_error_body(data: bytes) -> dict:
+    """Returns the decoded body of an error response, or an empty dict if it is not JSON."""
+
+    try:
+        return loads(data.decode("utf-8"))
+    except (ValueError, AttributeError):
+        return {}
+
+
+def read_body(res: HTTPResponse) -> bytes:
+    """Returns the body of a response, decompressed if it was gzipped."""
+
+    data = res.read()
+    add_metric("response_bytes", len(data), "Bytes")
+
+    if res.getheader("Content-Encoding") == "gzip":
+        data = gzip.decompress(data)
+    add_metric("decoded_bytes", len(data), "Bytes")
+    return data
+
+
+def send_request(conn: HTTPSConnection, url: str,
+                 max_retries: int = MAX_RETRIES) -> tuple[HTTPResponse | None, dict | None]:
+    """
+    Requests a url under /v3/football/, waiting for the entity's quota first and
+    retrying rate limited and server errors with backoff.
+    Returns the successful response with its body still unread, or None and an error dict
+    with the status and reason if the request still fails, or straight away
+    if the quota will not be back within MAX_WAIT seconds.
+    """
+
+    entity = get_entity(url)
+    bucket = get_bucket(entity)
+
+    for attempt in range(max_retries + 1):
+        wait = bucket.take()
+        if wait is None:
+            logging.info("%s quota used up until it resets, not requesting.", entity)
+            add_metric("api_throttled", 1)
+            return None, {"error": True,
+                          "status": 429,
+                          "reason": f"{entity} quota used up"}
+
+        if wait:
+            logging.info("%s quota used up, waiting %.1fs.", entity, wait)
+            add_metric("api_wait_ms", wait * 1000, "Milliseconds")
+            sleep(wait)
+
+        conn.request("GET", f"{API_PREFIX}{url}", "", {"Accept-Encoding": "gzip"})
+        res = conn.getresponse()
+        add_metric("api_requests", 1)
+
+        if res.status == 200:
+            logging.info("Got successful response from API: %s", res.status)
+            return res, None
+
+        data = read_body(res)
+        if res.status == 429 and not record_rate_limit(parse_error_body(data), entity):
+            bucket.update(0)
+
+        if res.status not in RETRY_STATUSES or attempt == max_retries:
+            break
+
+        delay = get_backoff_delay(attempt, res.getheader("Retry-After"))
+        logging.info("API returned %s, retrying in %.1fs.", res.status, delay)
+        add_metric("api_retries", 1)
+        sleep(delay)
+
+    logging.info(
+        "API Request unsuccessful. Status code: %s. Reason: %s.", res.status, res.reason)
+    return None, {"error": True,
+                  "status": res.status,
+                  "reason": res.reason}
+
+
+def get_json(conn: HTTPSConnection, url: str, max_retries: int = MAX_RETRIES) -> dict:
+    """
+    Returns the decoded response of a url under /v3/football/, through send_request.
+    The body is decoded straight from bytes, without building a str of it first.
+    Returns the error dict if the request fails.
+    """
+
+    res, error = send_request(conn, url, max_retries)
+    if error:
+        return error
+
+    body = loads(read_body(res))
+    record_rate_limit(body, get_entity(url))
+    return body
+
+
+def read_chunks(res: HTTPResponse, size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yields the body of a response as text, decompressed and decoded a chunk at a time.
+    A gzipped chunk is inflated at most size bytes at a time, as it can hold many times that.
+    """
+
+    inflater = zlib.decompressobj(16 + zlib.MAX_WBITS) if res.getheader(
+        "Content-Encoding") == "gzip" else None
+    decoder = getincrementaldecoder("utf-8")()
+
+    while chunk := res.read(size):
+        add_metric("response_bytes", len(chunk), "Bytes")
+
+        while chunk:
+            data = inflater.decompress(chunk, size) if inflater else chunk
+            chunk = inflater.unconsumed_tail if inflater else b""
+            add_metric("decoded_bytes", len(data), "Bytes")
+            yield decoder.decode(data)
+
+    yield decoder.decode(inflater.flush() if inflater else b"", final=True)
+
+
+class JSONStream:
+    """
+    JSON text arriving in chunks, read one value at a time.
+    Only the unread part of the text is kept, so memory holds a chunk and the value being read.
+    """
+
+    decoder = JSONDecoder()
+
+    def __init__(self, chunks: Iterator[str]):
+        self.chunks = chunks
+        self.text = ""
+        self.position = 0
+
+    def read_more(self) -> bool:
+        """Adds the next chunk to the unread text, returning False if there are no more."""
+
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            return False
+        self.text = self.text[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        """Returns the next character that is not whitespace, without reading it."""
+
+        while True:
+            while self.position < len(self.text) and self.text[self.position] in WHITESPACE:
+                self.position += 1
+            if self.position < len(self.text):
+                return self.text[self.position]
+            if not self.read_more():
+                raise ValueError("Response ended before its JSON did.")
+
+    def expect(self, characters: str) -> str:
+        """Reads the next character, raising a ValueError if it is not one of characters."""
+
+        character = self.peek()
+        if character not in characters:
+            raise ValueError(f"Expected one of {characters!r} in response, got {character!r}.")
+        self.position += 1
+        return character
+
+    def read_value(self):
+        """
+        Reads the next JSON value, adding chunks until it is complete.
+        A number followed by the end of the text, or a dot or exponent the decoder
+        stopped at, may have been cut off by a chunk, so that reads more too.
+        """
+
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.text, self.position)
+            except JSONDecodeError:
+                if not self.read_more():
+                    raise
+                continue
+
+            cut_off = (isinstance(value, (int, float)) and not isinstance(value, bool)
+                       and self.text[end:end + 1] in ("", ".", "e", "E"))
+            if not cut_off or not self.read_more():
+                self.position = end
+                return value
+
+
+def iter_items(chunks: Iterator[str], key: str = "data", rest: dict = None) -> Iterator:
+    """
+    Yields the items of the array under key in a JSON object arriving in chunks,
+    one at a time, without holding the rest of the array.
+    An object under key, as for a single fixture, is yielded as the only item.
+    The object's other fields, e.g. rate_limit, are put in rest.
+    """
+
+    rest = {} if rest is None else rest
+    stream = JSONStream(chunks)
+
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+
+    while True:
+        name = stream.read_value()
+        stream.expect(":")
+
+        if name == key and stream.peek() == "[":
+            stream.expect("[")
+            if stream.peek() == "]":
+                stream.expect("]")
+            else:
+                while True:
+                    yield stream.read_value()
+                    if stream.expect(",]") == "]":
+                        break
+        elif name == key:
+            yield stream.read_value()
+        else:
+            rest[name] = stream.read_value()
+
+        if stream.expect(",}") == "}":
+            return
+
+
+def stream_json(conn: HTTPSConnection, url: str, key: str = "data",
+                max_retries: int = MAX_RETRIES) -> tuple[Iterator[dict], dict]:
+    """
+    Requests a url like get_json, but decodes the response as it is read,
+    returning an iterator of the items under key and a dict of the body's other fields.
+    The dict is filled in, and the rate limit recorded, once every item has been read.
+    If the request fails, there are no items and the dict is the error.
+    """
+
+    res, error = send_request(conn, url, max_retries)
+    if error:
+        return iter(()), error
+
+    rest = {}
+
+    def read_items() -> Iterator[dict]:
+        chunks = read_chunks(res)
+        try:
+            yield from iter_items(chunks, key, rest)
+            for _ in chunks:
+                pass
+            record_rate_limit(rest, get_entity(url))
+        finally:
+            # A response left part read would be mistaken for the next one.
+            if not res.isclosed():
+                conn.close()
+
+    return read_items(), rest
+
+
+def get_quota() -> dict[str, int]:
+    """Returns the requests this container believes are left for each entity."""
+
+    return {entity: int(bucket.tokens) for entity, bucket in BUCKETS.items()}
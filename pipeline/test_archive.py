@@ -0,0 +1,89 @@
+# pylint: skip-file
+import gzip
+from json import dump, loads
+
+from archive import (SnapshotArchive, get_snapshot_minute, get_scrape_files,
+                     convert_scrape_directory, parse_index_line)
+
+
+def build_snapshot(minute):
+    return {"data": {"id": 1, "periods": [{"type_id": 1, "ticking": True, "minutes": minute}]}}
+
+
+def test_get_snapshot_minute_reads_active_period():
+    assert get_snapshot_minute(build_snapshot(23)) == 23
+    assert get_snapshot_minute({"data": [build_snapshot(5)["data"]]}) == 5
+
+
+def test_get_snapshot_minute_is_minus_one_without_periods():
+    assert get_snapshot_minute({"error": "Too many requests"}) == -1
+    assert get_snapshot_minute({"data": {"id": 1, "periods": []}}) == -1
+
+
+def test_parse_index_line_ignores_incomplete_lines():
+    assert parse_index_line("12 340 56\n") == (12, 340, 56)
+    assert parse_index_line("12 34") is None
+    assert parse_index_line("12 34x 56") is None
+
+
+def test_archive_appends_and_reads_in_order(tmp_path):
+    archive = SnapshotArchive(str(tmp_path / "match_1"))
+    for minute in (1, 2, 3):
+        archive.append(build_snapshot(minute))
+
+    assert len(archive) == 3
+    assert [get_snapshot_minute(snapshot) for snapshot in archive] == [1, 2, 3]
+    assert archive.get(-1) == build_snapshot(3)
+
+
+def test_archive_gets_last_snapshot_of_a_minute(tmp_path):
+    archive = SnapshotArchive(str(tmp_path / "match_1"))
+    first = build_snapshot(45)
+    second = build_snapshot(45)
+    second["data"]["id"] = 2
+    for snapshot in (build_snapshot(44), first, second, build_snapshot(46)):
+        archive.append(snapshot)
+
+    assert archive.get_minute(45) == second
+    assert archive.get_minute(90) is None
+
+
+def test_archive_reads_as_ndjson_with_gzip(tmp_path):
+    archive = SnapshotArchive(str(tmp_path / "match_1"))
+    archive.append(build_snapshot(1))
+    archive.append({"error": "Too many requests"})
+
+    with gzip.open(archive.archive_path, "rt", encoding="utf-8") as f:
+        lines = [loads(line) for line in f]
+
+    assert lines == [build_snapshot(1), {"error": "Too many requests"}]
+
+
+def test_archive_ignores_snapshot_interrupted_before_indexing(tmp_path):
+    archive = SnapshotArchive(str(tmp_path / "match_1"))
+    archive.append(build_snapshot(1))
+    with open(archive.archive_path, "ab") as f:
+        f.write(gzip.compress(b'{"partial": tru'))
+    with open(archive.index_path, "a", encoding="utf-8") as f:
+        f.write("2 99")
+    archive.append(build_snapshot(3))
+
+    assert [get_snapshot_minute(snapshot) for snapshot in archive] == [1, 3]
+
+
+def test_convert_scrape_directory_keeps_scrape_order(tmp_path):
+    match_dir = tmp_path / "match_1"
+    match_dir.mkdir()
+    for number in (10, 2, 1):
+        with open(match_dir / f"scrape_{number}.json", "w", encoding="utf-8") as f:
+            dump(build_snapshot(number), f)
+    (match_dir / "notes.txt").write_text("")
+
+    assert [f.rsplit("/", 1)[1] for f in get_scrape_files(str(match_dir))] == [
+        "scrape_1.json", "scrape_2.json", "scrape_10.json"]
+
+    count = convert_scrape_directory(str(match_dir), str(tmp_path / "archive"))
+
+    archive = SnapshotArchive(str(tmp_path / "archive"))
+    assert count == 3
+    assert [entry[0] for entry in archive.read_index()] == [1, 2, 10]
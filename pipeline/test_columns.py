@@ -0,0 +1,44 @@
+# pylint: skip-file
+import re
+from os import path
+
+from columns import (MINUTE_STAT_COLUMNS, EVENT_TYPE_IDS, STATISTIC_TYPE_IDS,
+                     FIXTURE_FIELDS, get_minute_column)
+
+SCHEMA_PATH = path.join(path.dirname(__file__), "..", "architecture", "database", "schema.sql")
+
+
+def read_schema():
+    with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def test_minute_stat_columns_match_schema():
+    schema = read_schema()
+    table = schema[schema.index("CREATE TABLE match_minute_stats"):
+                   schema.index("PRIMARY KEY (match_minute_stats_id)")]
+
+    assert MINUTE_STAT_COLUMNS == re.findall(r"^\s+(\w+_(?:home|away)) SMALLINT", table, re.M)
+
+
+def test_event_type_ids_match_seeded_event_types():
+    schema = read_schema()
+    seeded = schema[schema.index("INSERT INTO event_type"):]
+
+    assert EVENT_TYPE_IDS == [int(type_id) for type_id in re.findall(r"\((\d+), '", seeded)]
+
+
+def test_statistic_type_ids_cover_every_stored_column():
+    from type_map import TYPE_MAP
+
+    columns = {get_minute_column(TYPE_MAP[type_id] + suffix)
+               for type_id in STATISTIC_TYPE_IDS for suffix in ("_home", "_away")}
+
+    assert set(MINUTE_STAT_COLUMNS) <= columns
+    assert 34 in STATISTIC_TYPE_IDS
+    assert 41 not in STATISTIC_TYPE_IDS
+
+
+def test_fixture_fields_include_every_include():
+    assert FIXTURE_FIELDS == ["id", "result_info", "statistics", "periods", "events",
+                              "request_timestamp"]
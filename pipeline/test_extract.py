@@ -4,7 +4,10 @@
 from pytest import raises
 from unittest.mock import MagicMock
 
-from extract import prepare_data, build_scrape_url, scrape_live_match
+from extract import (prepare_data, build_scrape_url, scrape_live_match,
+                     build_batch_scrape_url, run_batch_extract)
+from fake_sportmonks import FakeSportmonks
+from sportmonks import BUCKETS
 
 
 def test_prepare_data_removes_keys():
@@ -34,6 +37,18 @@ def test_prepare_data_adds_timestamp():
     assert "request_timestamp" in prepared_data["data"]
 
 
+def test_prepare_data_adds_timestamp_to_every_fixture():
+
+    data = {
+        "subscription": {"plan": "worldwide"},
+        "data": [{"id": 1}, {"id": 2}]
+    }
+    prepared_data = prepare_data(data)
+
+    assert all("request_timestamp" in fixture
+               for fixture in prepared_data["data"])
+
+
 def test_prepare_data_raises_keyerror():
 
     data = {
@@ -58,6 +73,41 @@ def test_build_url_builds_correctly_with_id():
     assert "api_token=MYTOKEN" in url
 
 
+def test_build_url_requests_only_stored_fields_and_types():
+    url = build_scrape_url(19194929, "MYTOKEN")
+
+    assert "select=id,result_info" in url
+    assert "events:id,fixture_id,participant_id,type_id," in url
+    assert "eventTypes:10,14,15,16,17,18,19,20" in url
+    assert "fixtureStatisticTypes:34," in url
+
+
+def test_build_url_combines_filters_with_participant_search():
+    url = build_scrape_url("Scotland", "MYTOKEN")
+
+    assert "filters=participantSearch:Scotland;fixtureStatisticTypes:" in url
+
+
+def test_build_url_untrimmed_requests_everything():
+    url = build_scrape_url(19194929, "MYTOKEN", trimmed=False)
+
+    assert url == "fixtures/19194929?api_token=MYTOKEN&include=statistics;periods;events"
+
+
+def test_build_batch_url_builds_correctly_with_ids():
+    url = build_batch_scrape_url([19194929, 19194930], "MYTOKEN")
+
+    assert "fixtures/multi/19194929,19194930?" in url
+    assert "api_token=MYTOKEN" in url
+
+
+def test_build_batch_url_uses_inplay_without_ids():
+    url = build_batch_scrape_url(None, "MYTOKEN")
+
+    assert url.startswith("livescores/inplay?")
+    assert "participantSearch" not in url
+
+
 def test_build_url_type_error_with_bad_type():
 
     with raises(TypeError):
@@ -68,12 +118,9 @@ def test_scrape_live_match_scrapes_once_and_is_successful():
 
     mock_conn = MagicMock()
     mock_response = MagicMock()
-    mock_data = MagicMock()
 
     mock_conn.getresponse.return_value = mock_response
-    mock_response.read.return_value = mock_data
-
-    mock_data.decode.return_value = '{"match_id": "101010", "fixture_name": "Scotland vs Hungary"}'
+    mock_response.read.return_value = b'{"match_id": "101010", "fixture_name": "Scotland vs Hungary"}'
     mock_response.status = 200
 
     response = scrape_live_match("fixtures", mock_conn)
@@ -95,3 +142,24 @@ def test_scrape_live_match_handles_error_response():
     assert response["error"]
     assert response["status"] == 404
     assert response["reason"] == "Not Found"
+
+
+def test_run_batch_extract_yields_timestamped_fixtures_one_at_a_time():
+    BUCKETS.clear()
+    with FakeSportmonks([{"id": 1}, {"id": 2}, {"id": 3}]) as fake:
+        conn = fake.connect()
+        fixtures = run_batch_extract([1, 3], "MYTOKEN", conn)
+
+        first = next(fixtures)
+        assert first["id"] == 1
+        assert "request_timestamp" in first
+        assert [fixture["id"] for fixture in fixtures] == [3]
+        conn.close()
+
+
+def test_run_batch_extract_raises_on_failed_request():
+    BUCKETS.clear()
+    with FakeSportmonks() as fake:
+        fake.fail_next(404)
+        with raises(ValueError):
+            run_batch_extract(None, "MYTOKEN", fake.connect())
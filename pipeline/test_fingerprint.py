@@ -0,0 +1,96 @@
+# pylint: skip-file
+"""Tests for the fingerprint.py script."""
+
+from unittest.mock import MagicMock
+
+from pytest import raises
+
+from fingerprint import (get_payload_fingerprint, InMemoryFingerprintStore,
+                         DatabaseFingerprintStore, create_fingerprint_store,
+                         get_unchanged_flags)
+
+
+def test_get_payload_fingerprint_ignores_key_order():
+
+    first = {"id": 1, "statistics": [{"type_id": 1, "value": 2}], "events": []}
+    second = {"events": [], "statistics": [{"value": 2, "type_id": 1}], "id": 1}
+
+    assert get_payload_fingerprint(first) == get_payload_fingerprint(second)
+
+
+def test_get_payload_fingerprint_ignores_unused_keys():
+
+    fixture = {"id": 1, "events": [], "request_timestamp": "2025-01-01 10:00:00"}
+    later = {**fixture, "request_timestamp": "2025-01-01 10:01:00"}
+
+    assert get_payload_fingerprint(fixture) == get_payload_fingerprint(later)
+
+
+def test_get_payload_fingerprint_changes_with_events():
+
+    fixture = {"id": 1, "events": []}
+    changed = {"id": 1, "events": [{"id": 3, "type_id": 14}]}
+
+    assert get_payload_fingerprint(fixture) != get_payload_fingerprint(changed)
+
+
+def test_in_memory_store_round_trip():
+
+    store = InMemoryFingerprintStore()
+    store.put(1, "abc", {"half_live": True})
+
+    assert store.get(1) == ("abc", {"half_live": True})
+    assert store.get(2) is None
+
+
+def test_in_memory_store_keeps_next_poll():
+
+    store = InMemoryFingerprintStore()
+    store.put_next_poll(1, 1060.0)
+
+    assert store.get_next_poll(1) == 1060.0
+    assert store.get_next_poll(2) is None
+
+
+def test_database_store_puts_next_poll_on_the_fingerprint_row():
+
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchone.return_value = (1060.0,)
+    store = DatabaseFingerprintStore(lambda: mock_conn)
+
+    assert store.get_next_poll(1) == 1060.0
+
+    store.put_next_poll(1, float("inf"))
+    query, params = mock_cursor.execute.call_args[0]
+    assert query.startswith("UPDATE match_fingerprint SET next_poll_at")
+    assert params == (float("inf"), 1)
+    assert mock_conn.commit.called
+
+
+def test_database_store_get_and_put():
+
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchone.return_value = ("abc", {"half_live": True})
+    store = DatabaseFingerprintStore(lambda: mock_conn)
+
+    assert store.get(1) == ("abc", {"half_live": True})
+
+    store.put(1, "def", {"half_live": False})
+    query, params = mock_cursor.execute.call_args[0]
+    assert "ON CONFLICT (match_id) DO UPDATE" in query
+    assert params[:2] == (1, "def")
+    assert mock_conn.commit.called
+
+
+def test_create_fingerprint_store_unknown_type():
+
+    with raises(ValueError):
+        create_fingerprint_store("redis")
+
+
+def test_get_unchanged_flags_clears_goals():
+
+    assert get_unchanged_flags({"goal_check": [{"id": 1}]}) == {"goal_check": []}
+    assert get_unchanged_flags("Game has not started yet.") == "Game has not started yet."
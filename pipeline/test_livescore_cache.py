@@ -0,0 +1,116 @@
+# pylint: skip-file
+"""Tests for the livescore_cache.py script."""
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import sleep
+from unittest.mock import MagicMock
+
+from pytest import raises
+
+from livescore_cache import (InMemoryLiveScoreCache, SqliteLiveScoreCache,
+                             DatabaseLiveScoreCache, create_livescore_cache,
+                             get_live_fixture, get_minute)
+
+
+def test_get_minute_is_the_minute_since_the_epoch():
+    assert get_minute(119.9) == 1
+    assert get_minute(120) == 2
+
+
+def test_in_memory_cache_round_trip_and_expiry():
+
+    cache = InMemoryLiveScoreCache()
+    cache.put(10, {"1": {"id": 1}})
+
+    assert cache.get(10, 1) == (True, {"id": 1})
+    assert cache.get(10, 2) == (True, None)
+    assert cache.get(11, 1) == (False, None)
+
+    cache.put(20, {})
+    assert cache.get(10, 1) == (False, None)
+
+
+def test_sqlite_cache_round_trip(tmp_path):
+
+    cache = SqliteLiveScoreCache(str(tmp_path / "cache.db"))
+    cache.put(10, {"1": {"id": 1, "events": []}})
+
+    assert cache.get(10, 1) == (True, {"id": 1, "events": []})
+    assert cache.get(10, 2) == (True, None)
+    assert cache.get(11, 1) == (False, None)
+
+
+def test_get_live_fixture_fetches_once_per_minute():
+
+    cache = InMemoryLiveScoreCache()
+    fetch = MagicMock(return_value={1: {"id": 1}, 2: {"id": 2}})
+
+    assert get_live_fixture(cache, 1, fetch, minute=10) == ({"id": 1}, False)
+    assert get_live_fixture(cache, 2, fetch, minute=10) == ({"id": 2}, True)
+    assert get_live_fixture(cache, 3, fetch, minute=10) == (None, True)
+    assert fetch.call_count == 1
+
+    get_live_fixture(cache, 1, fetch, minute=11)
+    assert fetch.call_count == 2
+
+
+def test_get_live_fixture_does_not_cache_a_failed_fetch():
+
+    cache = InMemoryLiveScoreCache()
+    fetch = MagicMock(side_effect=[None, {1: {"id": 1}}])
+
+    assert get_live_fixture(cache, 1, fetch, minute=10) == (None, False)
+    assert get_live_fixture(cache, 1, fetch, minute=10) == ({"id": 1}, False)
+
+
+def test_get_live_fixture_is_single_flight_across_connections(tmp_path):
+
+    path = str(tmp_path / "cache.db")
+    fetches = []
+    lock = Lock()
+
+    def fetch():
+        with lock:
+            fetches.append(1)
+        sleep(0.05)
+        return {match_id: {"id": match_id} for match_id in range(8)}
+
+    def execution(match_id):
+        return get_live_fixture(SqliteLiveScoreCache(path), match_id, fetch, minute=10)
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(execution, range(8)))
+
+    assert len(fetches) == 1
+    assert [fixture["id"] for fixture, _ in results] == list(range(8))
+    assert sum(hit for _, hit in results) == 7
+
+
+def test_database_cache_get_put_and_lock():
+
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchone.return_value = ({"id": 1},)
+    cache = DatabaseLiveScoreCache(lambda: mock_conn)
+
+    assert cache.get(10, 1) == (True, {"id": 1})
+    assert mock_cursor.execute.call_args[0][1] == ("1", 10)
+
+    mock_cursor.fetchone.return_value = None
+    assert cache.get(11, 1) == (False, None)
+
+    cache.put(10, {"1": {"id": 1}})
+    assert "ON CONFLICT (minute) DO UPDATE" in mock_cursor.execute.call_args_list[-2][0][0]
+    assert mock_conn.commit.called
+
+    with cache.single_flight(10):
+        assert "pg_advisory_lock" in mock_cursor.execute.call_args[0][0]
+    assert "pg_advisory_unlock" in mock_cursor.execute.call_args[0][0]
+
+
+def test_create_livescore_cache_rejects_unknown_type():
+
+    assert isinstance(create_livescore_cache("memory"), InMemoryLiveScoreCache)
+    with raises(ValueError):
+        create_livescore_cache("redis")
@@ -1,10 +1,42 @@
 # pylint: skip-file
 """Tests for load.py script."""
+from os import environ
 from unittest.mock import MagicMock, patch
 
 import pandas as pd
-
-from load import get_players_df, get_if_goal_scored_this_run, get_connection
+import psycopg2
+from psycopg2.extensions import cursor as Cursor
+from pytest import fixture, skip
+
+from load import (get_players_df, get_if_goal_scored_this_run, get_connection,
+                  get_copy_buffer, copy_dataframe, build_query_suffix,
+                  get_values_from_dataframe, record_announced_goals, ANNOUNCED_GOALS,
+                  build_upload_statement, upload_all_data, upload_all_rows, upload_rows,
+                  get_stored_event_ids)
+from metrics import start_run, get_metrics
+from benchmark_load import (seed_benchmark_match, clear_benchmark_rows,
+                            BENCHMARK_MATCH_ID, BENCHMARK_TEAM_IDS, ID_OFFSET)
+
+
+@fixture(autouse=True)
+def clear_announced_goals():
+    ANNOUNCED_GOALS.clear()
+
+
+def iterrows_values(df: pd.DataFrame) -> list[tuple]:
+    """The row by row conversion insert_dataframe used before get_values_from_dataframe."""
+    values = []
+    for _, row in df.iterrows():
+        processed_row = []
+        for item in row:
+            if pd.isna(item):
+                processed_row.append(None)
+            elif isinstance(item, float) and item.is_integer():
+                processed_row.append(int(item))
+            else:
+                processed_row.append(item)
+        values.append(tuple(processed_row))
+    return values
 
 
 def test_get_players_df_concatenates_player_cols():
@@ -108,3 +140,410 @@ def test_new_goals_found():
     assert result[0]["player_name"] == "Salah"
     assert result[1]["match_event_id"] == 11
     assert result[1]["player_name"] == "Hazard"
+
+
+def test_build_query_suffix_conflict_and_returning():
+
+    suffix = build_query_suffix("player_id", ["match_event_id", "player_id"])
+
+    assert suffix == (" ON CONFLICT (match_event_id, player_id) DO NOTHING"
+                      " RETURNING player_id")
+
+
+def test_build_query_suffix_update_refreshes_non_key_columns():
+
+    suffix = build_query_suffix(
+        "match_minute_stats_id", ["match_id", "match_minute", "half"],
+        ["match_id", "match_minute", "half", "shots_home", "shots_away"])
+
+    assert suffix == (" ON CONFLICT (match_id, match_minute, half) DO UPDATE SET"
+                      " shots_home = EXCLUDED.shots_home,"
+                      " shots_away = EXCLUDED.shots_away"
+                      " RETURNING match_minute_stats_id")
+
+
+def test_build_query_suffix_update_with_only_key_columns_still_returns():
+
+    suffix = build_query_suffix("match_minute_stats_id", ["match_id"], ["match_id"])
+
+    assert "DO UPDATE SET match_id = EXCLUDED.match_id" in suffix
+
+
+def test_get_copy_buffer_writes_whole_floats_as_integers():
+
+    df = pd.DataFrame([
+        {"match_event_id": 1, "player_id": 5, "related_player_id": 7.0},
+        {"match_event_id": 2, "player_id": 6, "related_player_id": None}
+    ])
+
+    buffer = get_copy_buffer(df)
+
+    assert buffer.read() == "1,5,7\n2,6,\n"
+
+
+def test_copy_dataframe_merges_staging_table():
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_cursor.fetchall.return_value = [(1,)]
+    df = pd.DataFrame([{"player_id": 1, "player_name": "Salah"}])
+
+    result = copy_dataframe(df, "player", mock_conn,
+                            returning="player_id", conflict="player_id")
+
+    copy_sql = mock_cursor.copy_expert.call_args[0][0]
+    merge_sql = mock_cursor.execute.call_args[0][0]
+    assert copy_sql.startswith("COPY staging_player (player_id, player_name)")
+    assert merge_sql.endswith(
+        "ON CONFLICT (player_id) DO NOTHING RETURNING player_id")
+    assert result == [(1,)]
+    assert mock_conn.commit.called
+
+
+def test_get_values_from_dataframe_matches_iterrows_on_players():
+
+    df = pd.DataFrame([
+        {"player_id": 1, "player_name": "Origi", "related_player_id": 2,
+         "related_player_name": "Alexander Arnold", "event_id": 5},
+        {"player_id": 2, "player_name": "Milner", "related_player_id": None,
+            "related_player_name": None, "event_id": 6}
+    ])
+
+    for frame in (df, get_players_df(df)):
+        values = get_values_from_dataframe(frame)
+        assert values == iterrows_values(frame)
+        assert [type(value) for value in values[0]] == [
+            type(value) for value in iterrows_values(frame)[0]]
+
+
+def test_get_values_from_dataframe_matches_iterrows_on_events():
+
+    df = pd.DataFrame([
+        {"match_event_id": 10, "type_name": "goal", "match_id": 100,
+            "team_id": 1, "player_name": "Salah", "minute": 30, "addition": None},
+        {"match_event_id": 11, "type_name": "Goal", "match_id": 100,
+            "team_id": None, "player_name": None, "minute": 75, "addition": "1st Goal"},
+    ])
+    df["related_player_id"] = pd.Series([None, 4.0]).astype("Int64")
+    df["rating"] = [6.5, None]
+
+    assert get_values_from_dataframe(df) == iterrows_values(df)
+
+
+def test_get_values_from_dataframe_nulls_to_none_and_whole_floats_to_int():
+
+    df = pd.DataFrame([
+        {"player_id": 1, "related_player_id": 7.0, "player_name": None},
+        {"player_id": 2, "related_player_id": None, "player_name": "Salah"}
+    ])
+
+    values = get_values_from_dataframe(df)
+
+    assert values == [(1, 7, None), (2, None, "Salah")]
+    assert isinstance(values[0][1], int)
+
+
+class RecordingCursor(Cursor):
+    """Records the last query and parameters run on any of its kind."""
+
+    last_query = None
+
+    def execute(self, query, params=None):
+        RecordingCursor.last_query = (query, params)
+        return super().execute(query, params)
+
+
+@fixture
+def goal_history_db():
+    """
+    A connection to the scratch database in TEST_DB_DSN, holding 100k historical goals
+    for the benchmark match, which are removed afterwards. Skips when TEST_DB_DSN is not set.
+    """
+
+    if "TEST_DB_DSN" not in environ:
+        skip("TEST_DB_DSN is not set.")
+
+    db_conn = psycopg2.connect(environ["TEST_DB_DSN"], cursor_factory=RecordingCursor)
+    seed_benchmark_match(db_conn)
+    with db_conn.cursor() as cursor:
+        cursor.execute(
+            """INSERT INTO match_minute_stats (match_id, match_minute, half)
+            VALUES (%s, 1, 1) RETURNING match_minute_stats_id""", (BENCHMARK_MATCH_ID,))
+        cursor.execute(
+            """INSERT INTO match_event (match_event_id, match_minute_stats_id,
+                                        event_type_id, team_id)
+            SELECT %s + i, %s, 14, %s FROM generate_series(1, 100000) AS i""",
+            (ID_OFFSET, cursor.fetchone()[0], BENCHMARK_TEAM_IDS[0]))
+        cursor.execute("ANALYZE match_event")
+    db_conn.commit()
+
+    yield db_conn
+
+    db_conn.rollback()
+    clear_benchmark_rows(db_conn, remove_match=True)
+    db_conn.close()
+
+
+def get_rows_read(plan: dict, table: str) -> int:
+    """Returns the rows a query plan read from a table, over every node and loop."""
+
+    rows = plan["Actual Rows"] * plan["Actual Loops"] if plan.get("Relation Name") == table else 0
+    return rows + sum(get_rows_read(child, table) for child in plan.get("Plans", []))
+
+
+def test_goal_check_reads_only_candidates_from_100k_stored_goals(goal_history_db):
+    event_df = pd.DataFrame([
+        {"match_event_id": ID_OFFSET + 50_000, "type_name": "goal",
+            "match_id": BENCHMARK_MATCH_ID, "team_id": BENCHMARK_TEAM_IDS[0],
+            "player_name": "Salah", "minute": 30},
+        {"match_event_id": ID_OFFSET + 200_000, "type_name": "goal",
+            "match_id": BENCHMARK_MATCH_ID, "team_id": BENCHMARK_TEAM_IDS[1],
+            "player_name": "Hazard", "minute": 75}
+    ])
+
+    result = get_if_goal_scored_this_run(event_df, goal_history_db)
+
+    query, params = RecordingCursor.last_query
+    with goal_history_db.cursor() as cursor:
+        cursor.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + query, params)
+        plan = cursor.fetchone()[0][0]["Plan"]
+
+    assert [goal["match_event_id"] for goal in result] == [ID_OFFSET + 200_000]
+    assert get_rows_read(plan, "match_event") <= len(event_df)
+
+
+def test_get_stored_event_ids_reads_every_event_of_the_match(goal_history_db):
+
+    stored_ids = get_stored_event_ids(BENCHMARK_MATCH_ID, goal_history_db)
+
+    assert len(stored_ids) == 100_000
+    assert min(stored_ids) == ID_OFFSET + 1
+    assert get_stored_event_ids(BENCHMARK_MATCH_ID + 1, goal_history_db) == set()
+
+
+def test_goal_check_looks_up_only_unannounced_candidates_by_id():
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchall.return_value = [(50_000,)]
+    ANNOUNCED_GOALS[100] = {10}
+    event_df = pd.DataFrame([
+        {"match_event_id": 10, "type_name": "goal", "match_id": 100,
+            "team_id": 1, "player_name": "Salah", "minute": 12},
+        {"match_event_id": 200_000, "type_name": "goal", "match_id": 100,
+            "team_id": 2, "player_name": "Hazard", "minute": 75},
+        {"match_event_id": 50_000, "type_name": "goal", "match_id": 100,
+            "team_id": 1, "player_name": "Salah", "minute": 30}
+    ])
+
+    result = get_if_goal_scored_this_run(event_df, mock_conn)
+
+    query, params = mock_cursor.execute.call_args[0]
+    assert "m.match_event_id = ANY(%s)" in query
+    assert "e.type_name = 'goal'" in query
+    assert params == ([50_000, 200_000],)
+    assert [goal["match_event_id"] for goal in result] == [200_000]
+
+
+def test_goal_check_skips_query_for_goals_already_loaded():
+    mock_conn = MagicMock()
+    mock_cursor = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_cursor.fetchall.return_value = []
+    event_df = pd.DataFrame([
+        {"match_event_id": 10, "type_name": "goal", "match_id": 100,
+            "team_id": 1, "player_name": "Salah", "minute": 30}
+    ])
+
+    first_result = get_if_goal_scored_this_run(event_df, mock_conn)
+    record_announced_goals(event_df)
+    second_result = get_if_goal_scored_this_run(event_df, mock_conn)
+
+    assert len(first_result) == 1
+    assert second_result == []
+    assert mock_cursor.execute.call_count == 1
+
+
+def test_upload_all_data_keeps_goals_unannounced_when_events_fail():
+    minute_df = pd.DataFrame([{"match_id": 100, "match_minute": 30, "half": 1}])
+    event_df = pd.DataFrame([
+        {"match_event_id": 10, "type_name": "goal", "match_id": 100, "team_id": 1,
+            "event_type_id": 14, "player_id": 7, "player_name": "Salah",
+            "related_player_id": None, "related_player_name": None, "minute": 30}])
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value.fetchall.return_value = []
+    mock_insert = MagicMock(side_effect=[[(1,)], None, [(1,)], [(10,)], [], []])
+
+    with patch.dict("load.LOAD_ENGINES", {"values": mock_insert}):
+        failed = upload_all_data(minute_df, mock_conn, event_df.copy(), engine="values")
+        retried = upload_all_data(minute_df, mock_conn, event_df.copy(), engine="values")
+
+    assert failed is None
+    assert [goal["match_event_id"] for goal in retried] == [10]
+    assert ANNOUNCED_GOALS[100] == {10}
+
+
+class FakeMogrifyCursor:
+    """Cursor that renders parameters with repr, in place of psycopg2 escaping."""
+
+    def mogrify(self, query, params):
+        return (query % tuple("NULL" if value is None else repr(value)
+                              for value in params)).encode("utf-8")
+
+
+def test_build_upload_statement_without_events_only_writes_minute():
+
+    statement = build_upload_statement(
+        FakeMogrifyCursor(), ["match_id", "match_minute", "half"], [(1, 20, 1)], [], [], [])
+
+    assert "INSERT INTO match_minute_stats (match_id, match_minute, half)" in statement
+    assert "VALUES (1, 20, 1)" in statement
+    assert "ON CONFLICT (match_id, match_minute, half) DO UPDATE" in statement
+    assert "match_event" not in statement
+
+
+def test_build_upload_statement_chains_every_table():
+
+    statement = build_upload_statement(
+        FakeMogrifyCursor(), ["match_id", "match_minute", "half"], [(1, 20, 1)],
+        [(10, 14, 5)], [(7, "Salah")], [(10, 14, 7, None)])
+
+    for table in ("match_minute_stats", "match_event", "player", "player_match_event"):
+        assert f"INSERT INTO {table} " in statement
+    assert "(7::int, 'Salah'::text)" in statement
+    assert "(10::int, 14::smallint, 7::int, NULL::int)" in statement
+    assert "DELETE FROM player_match_event" in statement
+    assert "ON CONFLICT (match_event_id) DO UPDATE" in statement
+    assert statement.endswith("SELECT match_event_id FROM events WHERE inserted")
+
+
+def test_build_upload_statement_stores_players_without_a_name():
+
+    statement = build_upload_statement(
+        FakeMogrifyCursor(), ["match_id", "match_minute", "half"], [(1, 20, 1)],
+        [(10, 14, 5)], [(7, None)], [(10, 14, 7, None)])
+
+    assert "(7::int, NULL::text)" in statement
+    assert "COALESCE(p.player_name, 'Unknown')" in statement
+    assert "WHERE player.player_name = 'Unknown'" in statement
+
+
+def test_build_upload_statement_deletes_removed_events():
+
+    statement = build_upload_statement(
+        FakeMogrifyCursor(), ["match_id", "match_minute", "half"], [(1, 20, 1)],
+        [], [], [], [11, 12])
+
+    assert "DELETE FROM match_event WHERE match_event_id = ANY([11, 12])" in statement
+    assert statement.endswith("SELECT match_minute_stats_id FROM minute WHERE false")
+
+
+@patch("load.upload_rows")
+def test_upload_all_data_returns_none_when_upload_fails(mock_upload_rows):
+
+    minute_df = pd.DataFrame([{"match_id": 100, "match_minute": 30, "half": 1}])
+    mock_upload_rows.return_value = None
+
+    assert upload_all_data(minute_df, MagicMock(), pd.DataFrame()) is None
+
+
+@patch("load.get_if_goal_scored_this_run")
+@patch("load.copy_dataframe")
+def test_upload_all_data_copy_skips_events_when_minute_fails(mock_copy, mock_goal_check):
+
+    minute_df = pd.DataFrame([{"match_id": 100, "match_minute": 30, "half": 1}])
+    event_df = pd.DataFrame([{"match_event_id": 10, "type_name": "goal"}])
+    mock_copy.return_value = None
+
+    with patch.dict("load.LOAD_ENGINES", {"copy": mock_copy}):
+        assert upload_all_data(minute_df, MagicMock(), event_df, engine="copy") is None
+
+    mock_copy.assert_called_once()
+    mock_goal_check.assert_not_called()
+
+
+@patch("load.upload_rows")
+def test_upload_all_data_returns_goals_inserted_this_run(mock_upload_rows):
+
+    minute_df = pd.DataFrame([{"match_id": 100, "match_minute": 30, "half": 1}])
+    event_df = pd.DataFrame([
+        {"match_event_id": 10, "type_name": "goal", "match_id": 100, "team_id": 1,
+            "event_type_id": 14, "player_id": 7, "player_name": "Salah",
+            "related_player_id": None, "related_player_name": None, "minute": 30},
+        {"match_event_id": 9, "type_name": "goal", "match_id": 100, "team_id": 2,
+            "event_type_id": 14, "player_id": 8, "player_name": "Hazard",
+            "related_player_id": None, "related_player_name": None, "minute": 12}
+    ])
+    mock_upload_rows.return_value = [10]
+
+    result = upload_all_data(minute_df, MagicMock(), event_df)
+
+    assert [goal["match_event_id"] for goal in result] == [10]
+    link_rows = mock_upload_rows.call_args[0][5]
+    assert link_rows == [(10, 14, 7, None), (9, 14, 8, None)]
+
+
+@patch("load.upload_rows")
+def test_upload_all_rows_matches_upload_all_data(mock_upload_rows):
+
+    minute_row = {"match_id": 100, "match_minute": 30, "half": 1, "corners_home": 2}
+    event_rows = [
+        {"match_event_id": 10, "match_id": 100, "team_id": 1, "event_type_id": 14,
+            "player_id": 7, "related_player_id": 8, "player_name": "Salah",
+            "related_player_name": "Trent", "minute": 30, "type_name": "goal"},
+        {"match_event_id": 9, "match_id": 100, "team_id": 2, "event_type_id": 19,
+            "player_id": None, "related_player_id": None, "player_name": None,
+            "related_player_name": None, "minute": 12, "type_name": "yellowcard"}
+    ]
+    mock_upload_rows.return_value = [10]
+
+    rows_result = upload_all_rows(minute_row, event_rows, MagicMock(), [3])
+    rows_args = mock_upload_rows.call_args[0][1:]
+
+    data_result = upload_all_data(pd.DataFrame([minute_row]), MagicMock(),
+                                  pd.DataFrame(event_rows), removed_event_ids=[3])
+    data_args = mock_upload_rows.call_args[0][1:]
+
+    assert rows_args == data_args
+    assert rows_result == data_result
+    assert [goal["match_event_id"] for goal in rows_result] == [10]
+
+
+@patch("load.upload_rows")
+def test_upload_all_rows_returns_none_when_upload_fails(mock_upload_rows):
+
+    mock_upload_rows.return_value = None
+
+    assert upload_all_rows({"match_id": 100}, [], MagicMock()) is None
+
+
+class FakeStatementCursor(FakeMogrifyCursor):
+    """Cursor that accepts the rendered statement and returns no inserted events."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, query):
+        self.query = query
+
+    def fetchall(self):
+        return []
+
+
+def test_upload_rows_records_rows_and_latency_metrics():
+
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value = FakeStatementCursor()
+    start_run("pipeline")
+
+    upload_rows(mock_conn, ["match_id", "match_minute", "half"], [(1, 20, 1)],
+                [(10, 14, 5), (11, 19, 5)], [(7, "Salah")], [(10, 14, 7, None)])
+
+    metrics = get_metrics()
+    assert metrics["match_minute_stats_rows"] == 1
+    assert metrics["match_event_rows"] == 2
+    assert metrics["player_rows"] == 1
+    assert metrics["player_match_event_rows"] == 1
+    assert {"insert_statement_ms", "commit_ms"} <= set(metrics)
@@ -0,0 +1,85 @@
+# pylint: skip-file
+"""Tests for the match_state.py script."""
+
+from pytest import fixture
+
+from match_state import (get_event_changes, record_processed_events,
+                         get_poll_interval, PROCESSED_EVENTS)
+
+
+@fixture(autouse=True)
+def clear_processed_events():
+    PROCESSED_EVENTS.clear()
+
+
+def test_get_event_changes_returns_new_and_amended_events():
+
+    events = [{"id": 1, "type_id": 14, "player_id": 7},
+              {"id": 2, "type_id": 19, "player_id": 8}]
+    record_processed_events(100, events, [])
+
+    amended = {"id": 1, "type_id": 14, "player_id": 9}
+    new = {"id": 3, "type_id": 18, "player_id": 10}
+    changed, removed = get_event_changes(100, [amended, events[1], new])
+
+    assert changed == [amended, new]
+    assert removed == []
+
+
+def test_get_event_changes_ignores_dropped_event_columns():
+
+    event = {"id": 1, "type_id": 14, "sort_order": 1}
+    record_processed_events(100, [event], [])
+
+    changed, _ = get_event_changes(100, [{**event, "sort_order": 2}])
+
+    assert changed == []
+
+
+def test_get_event_changes_returns_removed_events():
+
+    events = [{"id": 1, "type_id": 14}, {"id": 2, "type_id": 19}]
+    record_processed_events(100, events, [])
+
+    _, removed = get_event_changes(100, [events[1]])
+    assert removed == [1]
+
+    _, removed = get_event_changes(100, [])
+    assert removed == []
+
+    record_processed_events(100, [], [1])
+    assert set(PROCESSED_EVENTS[100]) == {2}
+
+
+def test_get_event_changes_removes_stored_events_on_a_cold_container():
+
+    events = [{"id": 2, "type_id": 19}]
+
+    _, removed = get_event_changes(100, events, stored_ids={1, 2})
+    assert removed == [1]
+
+    _, removed = get_event_changes(100, [], stored_ids={1, 2})
+    assert removed == []
+
+
+def build_fixture(type_id=1, minute=20, ticking=True, events=None, result_info=None):
+    return {"result_info": result_info, "events": events or [],
+            "periods": [{"type_id": type_id, "minutes": minute, "ticking": ticking}]}
+
+
+def test_get_poll_interval_follows_match_state():
+    assert get_poll_interval(build_fixture()) == 60
+    assert get_poll_interval(build_fixture(minute=47)) == 30
+    assert get_poll_interval(build_fixture(type_id=2, minute=91)) == 30
+    assert get_poll_interval(build_fixture(minute=45, ticking=False)) == 120
+    assert get_poll_interval({"result_info": None, "periods": []}) == 120
+    assert get_poll_interval(build_fixture(result_info="Liverpool won after full-time.")) is None
+
+
+def test_get_poll_interval_polls_faster_after_dangerous_events():
+    goal = {"type_id": 14, "minute": 19}
+    card = {"type_id": 19, "minute": 20}
+
+    assert get_poll_interval(build_fixture(events=[goal])) == 30
+    assert get_poll_interval(build_fixture(minute=30, events=[goal])) == 60
+    assert get_poll_interval(build_fixture(events=[card])) == 60
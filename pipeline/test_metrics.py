@@ -0,0 +1,53 @@
+# pylint: skip-file
+"""Tests for the metrics.py script."""
+
+from json import loads
+
+from metrics import start_run, add_metric, timed, get_metrics, finish_run
+
+
+def test_add_metric_sums_repeated_stages():
+
+    start_run("pipeline")
+    add_metric("match_event_rows", 3)
+    add_metric("match_event_rows", 4)
+
+    assert get_metrics() == {"match_event_rows": 7}
+
+
+def test_start_run_discards_previous_metrics():
+
+    start_run("pipeline")
+    add_metric("match_event_rows", 3)
+    start_run("pipeline")
+
+    assert get_metrics() == {}
+
+
+def test_timed_records_milliseconds_when_block_raises():
+
+    start_run("pipeline")
+    try:
+        with timed("extract_ms"):
+            raise ValueError()
+    except ValueError:
+        pass
+
+    assert get_metrics()["extract_ms"] >= 0
+
+
+def test_finish_run_prints_one_emf_line(capsys):
+
+    start_run("pipeline", match_id=19411877)
+    add_metric("response_bytes", 2048, "Bytes")
+
+    metrics = finish_run()
+    record = loads(capsys.readouterr().out.strip())
+
+    assert set(metrics) == {"response_bytes", "total_ms"}
+    assert record["Service"] == "pipeline"
+    assert record["match_id"] == "19411877"
+    assert record["response_bytes"] == 2048
+    assert {"Name": "response_bytes", "Unit": "Bytes"} in \
+        record["_aws"]["CloudWatchMetrics"][0]["Metrics"]
+    assert record["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [["Service"]]
@@ -0,0 +1,400 @@
+# pylint: skip-file
+"""Tests for the pipeline.py script."""
+
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+from pytest import fixture
+
+from pipeline import (process_fixture, batch_lambda_handler, process_fixture_rows, lambda_handler,
+                      process_fixture_if_changed, FINGERPRINT_STORES, LIVESCORE_CACHES)
+from resources import CONNECTIONS
+from match_state import PROCESSED_EVENTS
+from load import ANNOUNCED_GOALS
+
+
+@fixture(autouse=True)
+def clear_cached_connections():
+    CONNECTIONS.clear()
+    FINGERPRINT_STORES.clear()
+    LIVESCORE_CACHES.clear()
+    PROCESSED_EVENTS.clear()
+    ANNOUNCED_GOALS.clear()
+
+
+def test_process_fixture_game_not_started():
+
+    df = pd.DataFrame([{"id": 1, "periods": []}])
+
+    result = process_fixture(df, 1, MagicMock())
+
+    assert result == {"flags": "Game has not started yet.", "match_id": 1}
+
+
+@patch("pipeline.upload_all_data")
+@patch("transform.transform_data")
+def test_process_fixture_skips_upload_at_half_time(mock_transform, mock_upload):
+
+    df = pd.DataFrame([{"id": 1, "periods": [{"ticking": False}], "events": []}])
+    mock_transform.return_value = (
+        pd.DataFrame(), pd.DataFrame(), {"half_live": False, "game_over": False})
+
+    result = process_fixture(df, 1, MagicMock())
+
+    assert not mock_upload.called
+    assert result["flags"]["goal_check"] == []
+
+
+@patch("pipeline.upload_all_data")
+@patch("transform.transform_data")
+def test_process_fixture_only_sends_changed_events(mock_transform, mock_upload):
+
+    events = [{"id": 1, "type_id": 14}, {"id": 2, "type_id": 19}]
+    df = pd.DataFrame([{"id": 1, "periods": [{"ticking": True}], "events": events}])
+    mock_transform.return_value = (
+        pd.DataFrame(), pd.DataFrame(), {"half_live": True, "game_over": False})
+    mock_upload.return_value = []
+
+    process_fixture(df, 1, MagicMock())
+    process_fixture(df, 1, MagicMock())
+
+    assert mock_transform.call_args_list[0][0][2] == events
+    assert mock_transform.call_args_list[1][0][2] == []
+
+
+@patch("pipeline.upload_all_data")
+@patch("transform.transform_data")
+def test_process_fixture_resends_events_after_failed_upload(mock_transform, mock_upload):
+
+    events = [{"id": 1, "type_id": 14}]
+    df = pd.DataFrame([{"id": 1, "periods": [{"ticking": True}], "events": events}])
+    mock_transform.return_value = (
+        pd.DataFrame(), pd.DataFrame(), {"half_live": True, "game_over": False})
+    mock_upload.side_effect = [None, []]
+
+    first = process_fixture(df, 1, MagicMock())
+    process_fixture(df, 1, MagicMock())
+
+    assert first["flags"]["goal_check"] == []
+    assert mock_transform.call_args_list[1][0][2] == events
+
+
+@patch("transform.transform_data")
+def test_process_fixture_forgets_match_state_at_game_over(mock_transform):
+
+    df = pd.DataFrame([{"id": 1, "periods": [{"ticking": False}], "events": []}])
+    mock_transform.return_value = (
+        pd.DataFrame(), pd.DataFrame(), {"half_live": False, "game_over": True})
+    PROCESSED_EVENTS[1] = {5: "digest"}
+    ANNOUNCED_GOALS[1] = {5}
+
+    process_fixture(df, 1, MagicMock())
+
+    assert 1 not in PROCESSED_EVENTS
+    assert 1 not in ANNOUNCED_GOALS
+
+
+@patch.dict("pipeline.ENV", {"TOKEN": "MYTOKEN", "BASE_URL": "api.test"})
+@patch("pipeline.get_connection")
+@patch("transform.get_compiled_type_mapping")
+@patch("resources.HTTPSConnection")
+@patch("pipeline.run_batch_extract")
+@patch("pipeline.process_fixtures")
+def test_batch_lambda_handler_returns_result_per_fixture(mock_process, mock_extract,
+                                                         mock_https, mock_map, mock_get_conn):
+
+    mock_extract.return_value = iter([{"id": 1}, {"id": 2}])
+    mock_process.side_effect = lambda fixtures, conn, df_map: [
+        {"flags": {"half_live": True}, "match_id": fixture["id"]} for fixture in fixtures]
+
+    result = batch_lambda_handler({"match_ids": [1, 2]})
+
+    assert [r["match_id"] for r in result["results"]] == [1, 2]
+    assert mock_process.call_count == 1
+    assert mock_get_conn.call_count == 1
+    assert mock_map.call_count == 1
+    assert mock_https.call_count == 1
+
+
+@patch.dict("pipeline.ENV", {"TOKEN": "MYTOKEN", "BASE_URL": "api.test"})
+@patch("pipeline.get_connection")
+@patch("resources.HTTPSConnection")
+@patch("pipeline.run_batch_extract")
+@patch("pipeline.upload_all_data")
+@patch("transform.transform_fixtures", side_effect=KeyError("periods"))
+@patch("pipeline.process_fixture")
+def test_batch_lambda_handler_isolates_failed_fixture(mock_process, mock_transform, mock_upload,
+                                                      mock_extract, mock_https, mock_get_conn):
+
+    mock_extract.return_value = iter([{"id": 1, "periods": [{}], "events": []},
+                                      {"id": 2, "periods": [{}], "events": []}])
+    mock_process.side_effect = [ValueError("bad fixture"),
+                                {"flags": {"half_live": True}, "match_id": 2}]
+
+    result = batch_lambda_handler({})
+
+    assert result["results"][0] == {"match_id": 1, "error": "bad fixture"}
+    assert result["results"][1]["match_id"] == 2
+    assert mock_transform.call_count == 1
+
+
+@patch.dict("pipeline.ENV", {"TOKEN": "MYTOKEN", "BASE_URL": "api.test"})
+@patch("pipeline.get_connection")
+@patch("resources.HTTPSConnection")
+@patch("pipeline.run_batch_extract")
+@patch("pipeline.upload_all_data", return_value=[])
+def test_batch_lambda_handler_fails_only_the_fixture_without_events(
+        mock_upload, mock_extract, mock_https, mock_get_conn, sample_fixture):
+
+    broken = {"id": 2, "result_info": None, "periods": sample_fixture["periods"],
+              "statistics": []}
+    mock_extract.side_effect = lambda *args: iter([broken, sample_fixture])
+
+    first = batch_lambda_handler({})
+    second = batch_lambda_handler({})
+
+    assert first["results"][0] == {"match_id": 2, "error": "'events'"}
+    assert "error" not in first["results"][1]
+    assert mock_upload.call_count == 1
+    assert second["results"][1]["flags"]["goal_check"] == []
+
+
+@patch.dict("pipeline.ENV", {"TOKEN": "MYTOKEN", "BASE_URL": "api.test"})
+@patch("pipeline.get_connection")
+@patch("resources.HTTPSConnection")
+@patch("pipeline.run_batch_extract")
+@patch("pipeline.process_fixtures")
+def test_batch_lambda_handler_keeps_fixtures_read_before_the_stream_failed(
+        mock_process, mock_extract, mock_https, mock_get_conn):
+
+    def stream(*args):
+        yield {"id": 1}
+        raise ValueError("Unexpected end of JSON.")
+
+    mock_extract.side_effect = stream
+    mock_process.side_effect = lambda fixtures, conn, df_map: [
+        {"flags": {"half_live": True}, "match_id": fixture["id"]} for fixture in fixtures]
+
+    result = batch_lambda_handler({"match_ids": [1, 2]})
+
+    assert result["results"] == [{"flags": {"half_live": True}, "match_id": 1},
+                                 {"match_id": None, "error": "Unexpected end of JSON."}]
+
+
+@patch.dict("pipeline.ENV", {"TOKEN": "MYTOKEN", "BASE_URL": "api.test"})
+@patch("pipeline.get_connection")
+@patch("resources.HTTPSConnection")
+@patch("pipeline.run_batch_extract")
+@patch("pipeline.upload_all_data")
+def test_batch_lambda_handler_transforms_changed_fixtures_in_one_pass(
+        mock_upload, mock_extract, mock_https, mock_get_conn, sample_fixture):
+
+    from transform import transform_fixtures
+
+    second = {**sample_fixture, "id": 2,
+              "statistics": [{**stat, "fixture_id": 2} for stat in sample_fixture["statistics"]],
+              "events": [{**event, "fixture_id": 2, "id": event["id"] + 100}
+                         for event in sample_fixture["events"]]}
+    not_started = {"id": 3, "result_info": None, "periods": [], "statistics": [], "events": []}
+    fixtures = [sample_fixture, second, not_started]
+    mock_extract.side_effect = lambda *args: iter(fixtures)
+    mock_upload.side_effect = [[], None, []]
+
+    with patch("transform.transform_fixtures", wraps=transform_fixtures) as mock_transform:
+        first = batch_lambda_handler({})
+        second_run = batch_lambda_handler({})
+
+    assert [r["match_id"] for r in first["results"]] == [19411877, 2, 3]
+    assert first["results"][1]["error"] == "Upload failed."
+    assert first["results"][2]["flags"] == "Game has not started yet."
+    assert mock_transform.call_count == 2
+    assert list(mock_transform.call_args_list[1][0][0]["id"]) == [2]
+
+    uploads = mock_upload.call_args_list
+    assert [list(call[0][0]["match_id"]) for call in uploads] == [[19411877], [2], [2]]
+    assert set(uploads[0][0][2]["match_id"]) == {19411877}
+    assert set(uploads[1][0][2]["match_id"]) == {2}
+    assert "error" not in second_run["results"][1]
+    assert second_run["results"][0]["flags"]["goal_check"] == []
+
+
+@patch.dict("pipeline.ENV", {}, clear=True)
+@patch("pipeline.process_fixture")
+def test_process_fixture_if_changed_skips_unchanged_payload(mock_process):
+
+    fixture = {"id": 1, "periods": [{"minutes": 10}], "events": [], "statistics": []}
+    mock_process.return_value = {
+        "flags": {"half_live": True, "game_over": False, "goal_check": [{"id": 5}]},
+        "match_id": 1}
+
+    first = process_fixture_if_changed(fixture, 1, MagicMock())
+    second = process_fixture_if_changed(dict(fixture), 1, MagicMock())
+
+    assert mock_process.call_count == 1
+    assert first["flags"]["goal_check"] == [{"id": 5}]
+    assert second == {
+        "flags": {"half_live": True, "game_over": False, "goal_check": []},
+        "match_id": 1}
+
+
+@patch.dict("pipeline.ENV", {"TRANSFORM_ENGINE": "dict"}, clear=True)
+@patch("pipeline.upload_all_rows")
+def test_process_fixture_if_changed_retries_payload_after_failed_upload(mock_upload,
+                                                                         sample_fixture):
+    mock_upload.side_effect = [None, []]
+
+    first = process_fixture_if_changed(sample_fixture, 19411877, MagicMock())
+    second = process_fixture_if_changed(dict(sample_fixture), 19411877, MagicMock())
+    third = process_fixture_if_changed(dict(sample_fixture), 19411877, MagicMock())
+
+    assert first["error"] == "Upload failed."
+    assert "error" not in second
+    assert mock_upload.call_count == 2
+    assert third["flags"]["goal_check"] == []
+
+
+@patch.dict("pipeline.ENV", {}, clear=True)
+@patch("pipeline.process_fixture")
+def test_process_fixture_if_changed_processes_changed_payload(mock_process):
+
+    fixture = {"id": 1, "periods": [{"minutes": 10}], "events": [], "statistics": []}
+    mock_process.return_value = {"flags": {"half_live": True}, "match_id": 1}
+
+    process_fixture_if_changed(fixture, 1, MagicMock())
+    process_fixture_if_changed({**fixture, "events": [{"id": 9}]}, 1, MagicMock())
+    process_fixture_if_changed(fixture, 2, MagicMock())
+
+    assert mock_process.call_count == 3
+
+
+@patch("pipeline.upload_all_rows")
+def test_process_fixture_rows_uploads_rows(mock_upload, sample_fixture):
+
+    mock_upload.return_value = [{"match_event_id": 102}]
+
+    result = process_fixture_rows(sample_fixture, 19411877, MagicMock())
+
+    minute_row, event_rows = mock_upload.call_args[0][:2]
+    assert minute_row["match_minute"] == 42
+    assert [row["match_event_id"] for row in event_rows] == [101, 102, 104, 105]
+    assert result["flags"]["goal_check"] == [{"match_event_id": 102}]
+
+
+def test_process_fixture_rows_game_not_started(sample_fixture):
+
+    result = process_fixture_rows({**sample_fixture, "periods": []}, 1, MagicMock())
+
+    assert result == {"flags": "Game has not started yet.", "match_id": 1}
+
+
+@patch.dict("pipeline.ENV", {"TRANSFORM_ENGINE": "dict"}, clear=True)
+@patch("pipeline.process_fixture")
+@patch("pipeline.process_fixture_rows")
+def test_process_fixture_if_changed_uses_configured_engine(mock_rows, mock_process,
+                                                          sample_fixture):
+
+    mock_rows.return_value = {"flags": {"half_live": True}, "match_id": 1}
+
+    process_fixture_if_changed(sample_fixture, 1, MagicMock())
+
+    assert mock_rows.called
+    assert not mock_process.called
+
+
+@patch.dict("pipeline.ENV", {"TOKEN": "MYTOKEN", "BASE_URL": "api.test",
+                             "TRANSFORM_ENGINE": "dict"})
+@patch("pipeline.upload_all_rows")
+@patch("pipeline.get_connection")
+@patch("resources.HTTPSConnection")
+@patch("pipeline.run_extract")
+def test_lambda_handler_returns_run_metrics(mock_extract, mock_https, mock_get_conn,
+                                            mock_upload, sample_fixture, capsys):
+
+    mock_extract.return_value = {"data": sample_fixture}
+    mock_upload.return_value = []
+
+    result = lambda_handler({"match_id": 19411877})
+
+    assert {"extract_ms", "transform_ms", "total_ms"} <= set(result["metrics"])
+    assert '"Service": "pipeline"' in capsys.readouterr().out
+
+
+@patch.dict("pipeline.ENV", {"TOKEN": "MYTOKEN", "BASE_URL": "api.test",
+                             "TRANSFORM_ENGINE": "dict", "LIVESCORE_CACHE": "memory"})
+@patch("pipeline.upload_all_rows")
+@patch("pipeline.get_connection")
+@patch("resources.HTTPSConnection")
+@patch("pipeline.run_extract")
+@patch("pipeline.fetch_live_fixtures")
+def test_lambda_handler_reads_matches_from_the_cached_inplay_feed(
+        mock_fetch, mock_extract, mock_https, mock_get_conn, mock_upload, sample_fixture):
+
+    mock_fetch.return_value = {19411877: sample_fixture, 2: {**sample_fixture, "id": 2}}
+    mock_upload.return_value = []
+
+    first = lambda_handler({"match_id": 19411877})
+    second = lambda_handler({"match_id": 2})
+
+    assert mock_fetch.call_count == 1
+    assert not mock_extract.called
+    assert first["metrics"]["livescore_cache_misses"] == 1
+    assert second["metrics"]["livescore_cache_hits"] == 1
+    assert second["match_id"] == 2
+
+
+@patch.dict("pipeline.ENV", {"TOKEN": "MYTOKEN", "BASE_URL": "api.test",
+                             "TRANSFORM_ENGINE": "dict", "LIVESCORE_CACHE": "memory"})
+@patch("pipeline.get_connection")
+@patch("resources.HTTPSConnection")
+@patch("pipeline.run_extract")
+@patch("pipeline.fetch_live_fixtures")
+def test_lambda_handler_requests_matches_not_in_play_on_their_own(
+        mock_fetch, mock_extract, mock_https, mock_get_conn):
+
+    mock_fetch.return_value = {}
+    mock_extract.return_value = {"data": {"id": 3, "periods": [], "events": []}}
+
+    result = lambda_handler({"match_id": 3})
+
+    assert mock_extract.called
+    assert result["flags"] == "Game has not started yet."
+    assert result["next_poll_seconds"] == 120
+    assert result["metrics"]["livescore_cache_fallbacks"] == 1
+
+
+@patch.dict("pipeline.ENV", {"TOKEN": "MYTOKEN", "BASE_URL": "api.test",
+                             "TRANSFORM_ENGINE": "dict"})
+@patch("pipeline.get_connection")
+@patch("resources.HTTPSConnection")
+@patch("pipeline.run_extract")
+@patch("pipeline.time")
+def test_lambda_handler_skips_the_api_until_the_match_is_due(
+        mock_time, mock_extract, mock_https, mock_get_conn, sample_fixture):
+
+    half_time = {**sample_fixture, "periods": [
+        {"type_id": 1, "started": 1, "minutes": 47, "ticking": False}]}
+    full_time = {**half_time, "result_info": "Game ended in draw."}
+    mock_extract.side_effect = [{"data": half_time}, {"data": full_time}]
+    mock_time.side_effect = [1000, 1060, 1117, 1180, 1240]
+
+    results = [lambda_handler({"match_id": 19411877}) for _ in range(5)]
+
+    assert mock_extract.call_count == 2
+    assert [r["next_poll_seconds"] for r in results] == [120, 60, None, None, None]
+    assert "api_calls_saved" not in results[0]["metrics"]
+    assert results[1]["metrics"]["api_calls_saved"] == 1
+    assert results[1]["flags"] == results[0]["flags"]
+    assert results[3]["flags"]["game_over"]
+    assert results[4]["metrics"]["api_calls_saved"] == 1
+
+
+@patch("pipeline.upload_all_rows", return_value=[])
+def test_process_fixture_rows_deletes_stored_events_the_api_removed(mock_upload, sample_fixture):
+
+    mock_conn = MagicMock()
+    stored = [(event["id"],) for event in sample_fixture["events"]] + [(999,)]
+    mock_conn.cursor.return_value.__enter__.return_value.fetchall.return_value = stored
+
+    process_fixture_rows(sample_fixture, 19411877, mock_conn)
+
+    assert mock_upload.call_args[1]["removed_event_ids"] == [999]
@@ -0,0 +1,57 @@
+# pylint: skip-file
+"""Tests for the profiling.py script."""
+
+from unittest.mock import patch
+import logging
+
+from profiling import profile_handler, should_profile
+
+
+def handler(event=None, context=None):
+    return {"total": sum(range(event["count"]))}
+
+
+@patch.dict("profiling.ENV", {}, clear=True)
+def test_should_profile_off_by_default():
+
+    assert not should_profile()
+
+
+@patch.dict("profiling.ENV", {"PROFILE_HANDLER": "true", "PROFILE_SAMPLE_RATE": "0.25"})
+@patch("profiling.random")
+def test_should_profile_samples_invocations(mock_random):
+
+    mock_random.side_effect = [0.1, 0.5]
+
+    assert should_profile()
+    assert not should_profile()
+
+
+@patch.dict("profiling.ENV", {}, clear=True)
+@patch("profiling.write_report")
+def test_profile_handler_passes_through_when_disabled(mock_write):
+
+    assert profile_handler(handler)({"count": 10}, None) == {"total": 45}
+    assert not mock_write.called
+
+
+@patch.dict("profiling.ENV", {"PROFILE_HANDLER": "1", "PROFILE_TOP_N": "5"}, clear=True)
+def test_profile_handler_logs_report(caplog):
+
+    with caplog.at_level(logging.INFO, logger="profiling"):
+        result = profile_handler(handler)({"count": 10}, None)
+
+    assert result == {"total": 45}
+    assert "Top 5 functions by cumulative time" in caplog.text
+    assert "Top 5 allocation sites" in caplog.text
+
+
+def test_profile_handler_writes_report_to_output_dir(tmp_path):
+
+    with patch.dict("profiling.ENV", {"PROFILE_HANDLER": "1",
+                                      "PROFILE_OUTPUT": str(tmp_path)}, clear=True):
+        profile_handler(handler)({"count": 10}, None)
+
+    reports = list(tmp_path.glob("handler_*.txt"))
+    assert len(reports) == 1
+    assert "Profile of handler" in reports[0].read_text()
@@ -0,0 +1,73 @@
+# pylint: skip-file
+from json import dump
+from unittest.mock import patch, MagicMock
+
+from archive import SnapshotArchive
+from replay import replay_match, get_throughput
+
+
+def write_scrape(directory, number, data):
+    with open(directory / f"scrape_{number}.json", "w", encoding="utf-8") as f:
+        dump(data, f)
+
+
+@patch("replay.upload_all_data")
+@patch("replay.get_connection")
+def test_replay_match_loads_live_snapshots_and_skips_errors(mock_get_connection,
+                                                            mock_upload, tmp_path,
+                                                            sample_fixture):
+    mock_upload.return_value = []
+    write_scrape(tmp_path, 1, {"error": "Too many requests", "timestamp": 1.0})
+    write_scrape(tmp_path, 2, {"data": sample_fixture})
+    write_scrape(tmp_path, 3, {"data": {**sample_fixture, "periods": []}})
+
+    stats = replay_match(str(tmp_path))
+
+    assert mock_upload.call_count == 1
+    assert mock_upload.call_args.kwargs["engine"] == "copy"
+    assert stats["skipped"] == 1
+    assert stats["snapshots"] == 2
+    assert stats["minutes"] == 1
+    assert stats["rows"] == 1 + len(mock_upload.call_args.args[2])
+    mock_get_connection.return_value.close.assert_called_once()
+
+
+@patch("replay.upload_all_data")
+@patch("replay.get_connection")
+def test_replay_match_counts_failed_uploads(mock_get_connection, mock_upload,
+                                            tmp_path, sample_fixture):
+    mock_upload.return_value = None
+    write_scrape(tmp_path, 1, {"data": sample_fixture})
+
+    stats = replay_match(str(tmp_path), engine="statement")
+
+    assert stats["failed"] == 1
+    assert stats["rows"] == 0
+
+
+def test_get_throughput_sums_matches():
+    results = [{"snapshots": 90, "skipped": 0, "failed": 0, "minutes": 90, "rows": 120},
+               {"snapshots": 45, "skipped": 1, "failed": 1, "minutes": 44, "rows": 60}]
+
+    totals = get_throughput(results, 2.0)
+
+    assert totals["minutes"] == 134
+    assert totals["minutes_per_sec"] == 67.0
+    assert totals["rows_per_sec"] == 90.0
+
+
+@patch("replay.upload_all_data")
+@patch("replay.get_connection")
+def test_replay_match_reads_archives(mock_get_connection, mock_upload, tmp_path,
+                                     sample_fixture):
+    mock_upload.return_value = []
+    base_path = str(tmp_path / "match_19411877")
+    archive = SnapshotArchive(base_path)
+    archive.append({"error": "Too many requests", "timestamp": 1.0})
+    archive.append({"data": sample_fixture})
+
+    stats = replay_match(base_path + ".ndjson.gz")
+
+    assert mock_upload.call_count == 1
+    assert stats["skipped"] == 1
+    assert stats["minutes"] == 1
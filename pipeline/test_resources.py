@@ -0,0 +1,72 @@
+# pylint: skip-file
+"""Tests for the resources.py script."""
+
+from http.client import RemoteDisconnected
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import psycopg2
+from pytest import fixture
+
+from pipeline import lambda_handler
+from resources import (CONNECTIONS, get_cached_db_connection,
+                       request_with_reconnect, is_db_connection_healthy)
+
+
+@fixture(autouse=True)
+def clear_cached_connections():
+    CONNECTIONS.clear()
+
+
+def make_db_connection():
+    conn = MagicMock()
+    conn.closed = 0
+    return conn
+
+
+@patch.dict("pipeline.ENV", {"TOKEN": "MYTOKEN", "BASE_URL": "api.test"})
+@patch("pipeline.process_fixture")
+@patch("transform.get_dataframe_from_response")
+@patch("pipeline.run_extract")
+@patch("resources.HTTPSConnection")
+@patch("pipeline.get_connection")
+def test_warm_invocations_reuse_connections(mock_get_conn, mock_https, mock_extract,
+                                            mock_get_df, mock_process):
+    mock_get_conn.side_effect = make_db_connection
+    mock_process.return_value = {"flags": {}, "match_id": 1}
+
+    for _ in range(100):
+        lambda_handler({"match_id": 1})
+
+    assert mock_get_conn.call_count == 1
+    assert mock_https.call_count == 1
+    assert mock_extract.call_count == 100
+
+
+def test_closed_db_connection_reconnects():
+    factory = MagicMock(side_effect=make_db_connection)
+
+    first_conn = get_cached_db_connection(factory)
+    first_conn.closed = 1
+    second_conn = get_cached_db_connection(factory)
+
+    assert factory.call_count == 2
+    assert second_conn is not first_conn
+
+
+def test_db_connection_failing_query_is_unhealthy():
+    conn = make_db_connection()
+    conn.cursor.return_value.__enter__.return_value.execute.side_effect = \
+        psycopg2.OperationalError("server closed the connection")
+
+    assert not is_db_connection_healthy(conn)
+
+
+def test_stale_api_connection_retries_on_new_connection():
+    factory = MagicMock()
+    request = MagicMock(side_effect=[RemoteDisconnected("closed"), {"data": {}}])
+
+    result = request_with_reconnect("api.test", request, factory)
+
+    assert result == {"data": {}}
+    assert factory.call_count == 2
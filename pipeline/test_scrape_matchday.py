@@ -0,0 +1,138 @@
+# pylint: skip-file
+import asyncio
+from http.client import RemoteDisconnected
+from time import perf_counter
+from unittest.mock import patch, MagicMock
+
+from archive import SnapshotArchive
+from scrape_matchday import (ConnectionPool, RateLimiter, get_next_poll,
+                             is_match_over, scrape_match, scrape_matches)
+
+
+def build_snapshot(match_id, minute, result_info=None):
+    return {"data": {"id": match_id, "result_info": result_info,
+                     "periods": [{"type_id": 1, "ticking": True, "minutes": minute}]}}
+
+
+def test_get_next_poll_aligns_to_the_interval():
+    assert get_next_poll(125, 60) == 180
+    assert get_next_poll(180, 60) == 240
+    assert 180 <= get_next_poll(125, 60, jitter=5) <= 185
+
+
+def test_is_match_over_reads_result_info():
+    assert not is_match_over(build_snapshot(1, 45))
+    assert is_match_over(build_snapshot(1, 90, "Liverpool won after full-time."))
+    assert not is_match_over({"error": True, "status": 429})
+
+
+def test_rate_limiter_spaces_requests():
+
+    async def make_requests():
+        limiter = RateLimiter(requests_per_minute=600)
+        start = perf_counter()
+        for _ in range(3):
+            await limiter.wait()
+        return perf_counter() - start
+
+    assert asyncio.run(make_requests()) >= 0.2
+
+
+def test_pool_reconnects_once_and_keeps_the_new_connection():
+    stale, fresh = MagicMock(), MagicMock()
+    factory = MagicMock(side_effect=[stale, fresh])
+
+    def request(conn):
+        if conn is stale:
+            raise RemoteDisconnected("closed")
+        return "ok"
+
+    async def run():
+        pool = ConnectionPool("api.example.com", 1, factory)
+        result = await pool.request(request)
+        return result, pool.idle.get_nowait()
+
+    assert asyncio.run(run()) == ("ok", fresh)
+    stale.close.assert_called_once()
+
+
+@patch("scrape_matchday.prepare_snapshot", side_effect=lambda data: data)
+@patch("scrape_matchday.scrape_live_match")
+def test_scrape_matches_archives_each_match_until_it_is_over(mock_scrape, mock_prepare,
+                                                             tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    responses = {
+        1: iter([build_snapshot(1, 89), build_snapshot(1, 90, "Draw")]),
+        2: iter([{"error": True, "status": 500}, build_snapshot(2, 45),
+                 build_snapshot(2, 90, "Home won")])
+    }
+    mock_scrape.side_effect = lambda url, conn: next(
+        responses[int(url.split("?")[0].rsplit("/", 1)[1])])
+
+    results = asyncio.run(scrape_matches(
+        [1, 2], "token", pool_size=1, requests_per_minute=6000, jitter=0,
+        interval=0.01, factory=MagicMock()))
+
+    assert results == {1: 2, 2: 3}
+    assert [entry[0] for entry in SnapshotArchive("match_1").read_index()] == [89, 90]
+    assert [entry[0] for entry in SnapshotArchive("match_2").read_index()] == [-1, 45, 90]
+
+
+@patch("scrape_matchday.prepare_snapshot", side_effect=lambda data: data)
+@patch("scrape_matchday.scrape_live_match")
+def test_scrape_matches_retries_failed_polls_until_the_match_is_over(mock_scrape, mock_prepare,
+                                                                     tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    responses = {1: iter([build_snapshot(1, 44), ValueError("Bad payload"),
+                          build_snapshot(1, 90, "Draw")]),
+                 2: iter([build_snapshot(2, 90, "Draw")])}
+
+    def scrape(url, conn):
+        response = next(responses[int(url.split("?")[0].rsplit("/", 1)[1])])
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    mock_scrape.side_effect = scrape
+
+    results = asyncio.run(scrape_matches(
+        [1, 2], "token", requests_per_minute=6000, jitter=0,
+        interval=0.01, factory=MagicMock()))
+
+    assert results == {1: 2, 2: 1}
+    assert [entry[0] for entry in SnapshotArchive("match_1").read_index()] == [44, 90]
+
+
+@patch("scrape_matchday.prepare_snapshot", side_effect=lambda data: data)
+@patch("scrape_matchday.scrape_live_match", side_effect=ValueError("Bad payload"))
+def test_scrape_matches_stops_retrying_after_max_hours(mock_scrape, mock_prepare,
+                                                       tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    results = asyncio.run(scrape_matches(
+        [1], "token", requests_per_minute=6000, jitter=0, interval=0.01,
+        max_hours=0.1 / 3600, factory=MagicMock()))
+
+    assert results == {1: 0}
+    assert mock_scrape.call_count > 1
+
+
+@patch("scrape_matchday.prepare_snapshot", side_effect=lambda data: data)
+@patch("scrape_matchday.scrape_live_match")
+def test_scrape_match_stops_after_max_hours_without_a_result(mock_scrape, mock_prepare,
+                                                             tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    now = [0]
+
+    def scrape(url, conn):
+        now[0] += 3600
+        return build_snapshot(1, 0)
+
+    mock_scrape.side_effect = scrape
+
+    async def run():
+        pool = ConnectionPool("host", 1, factory=MagicMock())
+        return await scrape_match(1, "token", pool, RateLimiter(6000), interval=0.01,
+                                  jitter=0, max_hours=2, clock=lambda: now[0])
+
+    assert asyncio.run(run()) == 2
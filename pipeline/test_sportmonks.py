@@ -0,0 +1,219 @@
+# pylint: skip-file
+from io import BytesIO
+from json import dumps
+from unittest.mock import MagicMock, patch
+import gzip
+
+from pytest import fixture, raises
+
+from fake_sportmonks import FakeSportmonks
+from metrics import start_run, get_metrics
+from sportmonks import (TokenBucket, BUCKETS, get_entity, get_backoff_delay,
+                        get_json, get_quota, iter_items, read_chunks, stream_json)
+
+
+@fixture(autouse=True)
+def clear_buckets():
+    BUCKETS.clear()
+    start_run("test")
+
+
+@fixture
+def fake_api():
+    fixtures = [{"id": 1, "name": "Liverpool vs Chelsea"},
+                {"id": 2, "name": "Arsenal vs Spurs"}]
+    with FakeSportmonks(fixtures, limit=5) as fake:
+        yield fake
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_entity_maps_livescores_to_fixtures():
+    assert get_entity("fixtures/19411877?api_token=x") == "Fixture"
+    assert get_entity("livescores/inplay?api_token=x") == "Fixture"
+    assert get_entity("/v3/football/teams/8") == "Team"
+    assert get_entity("venues/3") == "Venues"
+
+
+def test_token_bucket_waits_when_empty_and_refills_over_time():
+    clock = FakeClock()
+    bucket = TokenBucket(capacity=2, period=60, clock=clock)
+
+    assert bucket.take() == 0
+    assert bucket.take() == 0
+    assert bucket.take() == 30
+
+    clock.now = 90
+    assert bucket.take() == 0
+
+
+def test_token_bucket_takes_remaining_from_the_api():
+    clock = FakeClock()
+    bucket = TokenBucket(capacity=3000, period=3600, clock=clock)
+
+    bucket.update(0, resets_in_seconds=600)
+
+    assert bucket.take(max_wait=60) is None
+    assert bucket.take(max_wait=1000) > 599
+
+
+def test_get_backoff_delay_is_capped_and_honours_retry_after():
+    assert 0 <= get_backoff_delay(0) <= 1
+    assert 0 <= get_backoff_delay(10) <= 30
+    assert get_backoff_delay(0, "12") >= 12
+
+
+def test_get_json_returns_data_and_records_quota(fake_api):
+    conn = fake_api.connect()
+
+    response = get_json(conn, "fixtures/1?api_token=x")
+
+    assert response["data"]["name"] == "Liverpool vs Chelsea"
+    assert get_quota() == {"Fixture": 4}
+    assert get_metrics()["api_requests"] == 1
+    assert get_metrics()["rate_limit_remaining"] == 4
+
+
+def test_get_json_requests_and_decodes_gzip(fake_api):
+    fake_api.fixtures[1]["events"] = [{"id": index, "minute": index} for index in range(100)]
+
+    response = get_json(fake_api.connect(), "fixtures/1")
+
+    assert len(response["data"]["events"]) == 100
+    assert get_metrics()["response_bytes"] < get_metrics()["decoded_bytes"]
+
+
+@patch("sportmonks.sleep")
+def test_get_json_retries_server_errors_with_backoff(mock_sleep, fake_api):
+    fake_api.fail_next(503, 502)
+
+    response = get_json(fake_api.connect(), "fixtures/multi/1,2?api_token=x")
+
+    assert len(response["data"]) == 2
+    assert len(fake_api.requests) == 3
+    assert mock_sleep.call_count == 2
+    assert get_metrics()["api_retries"] == 2
+
+
+@patch("sportmonks.sleep")
+def test_get_json_gives_up_after_max_retries(mock_sleep, fake_api):
+    fake_api.fail_next(500, 500, 500, 500)
+
+    response = get_json(fake_api.connect(), "fixtures/1", max_retries=3)
+
+    assert response == {"error": True, "status": 500,
+                        "reason": "Internal Server Error"}
+    assert len(fake_api.requests) == 4
+
+
+@patch("sportmonks.sleep")
+def test_get_json_does_not_retry_client_errors(mock_sleep, fake_api):
+
+    response = get_json(fake_api.connect(), "fixtures/404")
+
+    assert response["status"] == 404
+    assert len(fake_api.requests) == 1
+    mock_sleep.assert_not_called()
+
+
+@patch("sportmonks.sleep")
+def test_get_json_stops_requesting_once_quota_is_used_up(mock_sleep, fake_api):
+    conn = fake_api.connect()
+
+    for _ in range(5):
+        assert "data" in get_json(conn, "livescores/inplay")
+    response = get_json(conn, "fixtures/1")
+
+    assert response["status"] == 429
+    assert len(fake_api.requests) == 5
+    assert get_metrics()["api_throttled"] == 1
+    assert get_json(conn, "teams/1")["status"] == 404
+
+
+@patch("sportmonks.sleep")
+def test_get_json_honours_retry_after_on_429(mock_sleep, fake_api):
+    fake_api.fail_next(429, retry_after=7)
+
+    response = get_json(fake_api.connect(), "fixtures/2")
+
+    assert response["data"]["id"] == 2
+    assert max(call.args[0] for call in mock_sleep.call_args_list) >= 7
+
+
+def split_into_chunks(text, size):
+    return iter([text[i:i + size] for i in range(0, len(text), size)])
+
+
+def test_iter_items_yields_each_item_across_chunk_boundaries():
+    body = {"data": [{"id": 1, "events": [{"minute": 12}], "name": "A, \\\"B\\\" [C]"},
+                     {"id": 22, "result_info": None}, 3.5],
+            "rate_limit": {"remaining": 2999}, "timezone": "UTC"}
+    rest = {}
+
+    for size in (1, 3, 7, 1000):
+        rest.clear()
+        items = list(iter_items(split_into_chunks(dumps(body, indent=2), size), rest=rest))
+        assert items == body["data"]
+        assert rest == {"rate_limit": {"remaining": 2999}, "timezone": "UTC"}
+
+
+def test_read_chunks_inflates_at_most_a_chunk_at_a_time():
+    text = dumps({"data": [{"id": index} for index in range(1000)]})
+    res = MagicMock()
+    res.read = BytesIO(gzip.compress(text.encode())).read
+    res.getheader.return_value = "gzip"
+
+    chunks = list(read_chunks(res, size=256))
+
+    assert "".join(chunks) == text
+    assert max(len(chunk) for chunk in chunks) <= 256
+
+
+def test_iter_items_reads_numbers_cut_off_by_a_chunk():
+    rest = {}
+    list(iter_items(iter(['{"data": [], "count": 12', '345}']), rest=rest))
+    assert rest["count"] == 12345
+
+
+def test_iter_items_yields_a_single_object_and_handles_empty_arrays():
+    assert list(iter_items(iter(['{"data": {"id": 1}}']))) == [{"id": 1}]
+    assert list(iter_items(iter(['{"data": []}']))) == []
+    assert list(iter_items(iter(['{}']))) == []
+
+
+def test_iter_items_raises_on_a_cut_off_response():
+    with raises(ValueError):
+        list(iter_items(iter(['{"data": [{"id": 1}, {"id"'])))
+
+
+def test_stream_json_yields_fixtures_then_records_quota(fake_api):
+    fixtures, rest = stream_json(fake_api.connect(), "livescores/inplay?api_token=x")
+
+    assert [fixture["id"] for fixture in fixtures] == [1, 2]
+    assert rest["rate_limit"]["remaining"] == 4
+    assert get_quota() == {"Fixture": 4}
+    assert get_metrics()["response_bytes"] < get_metrics()["decoded_bytes"]
+
+
+def test_stream_json_keeps_the_connection_usable(fake_api):
+    conn = fake_api.connect()
+    fixtures, _ = stream_json(conn, "livescores/inplay?api_token=x")
+    next(fixtures)
+    fixtures.close()
+
+    assert get_json(conn, "fixtures/2?api_token=x")["data"]["id"] == 2
+
+
+@patch("sportmonks.sleep")
+def test_stream_json_returns_error_without_fixtures(mock_sleep, fake_api):
+    fake_api.fail_next(404)
+    fixtures, error = stream_json(fake_api.connect(), "fixtures/multi/1?api_token=x")
+
+    assert list(fixtures) == []
+    assert error["status"] == 404
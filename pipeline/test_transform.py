@@ -1,15 +1,21 @@
 # pylint: skip-file
 """Tests for the transform.py script."""
 
+from pathlib import Path
 from pytest import raises
 from unittest.mock import MagicMock
 import pandas as pd
 
 from transform import (
-    get_dataframe_from_response, get_statistics, get_active_period,
-    get_period_information, get_match_event_df, create_match_minute_df,
-    get_flags
+    get_dataframe_from_response, get_statistics, get_period_states,
+    get_match_event_df, create_match_minute_df,
+    get_flags, get_type_mapping, get_compiled_type_mapping, transform_data,
+    transform_fixtures
 )
+from dict_transform import transform_fixture
+from match_state import get_active_period
+from columns import MINUTE_STAT_COLUMNS, trim_fixture
+from load import get_values_from_dataframe, get_players_df, get_player_rows
 
 
 def test_get_dataframe_from_response_data_key_dict():
@@ -158,18 +164,42 @@ def test_get_active_period_gets_fallback_period_no_ticking_or_starting_value():
     assert period["period_id"] == 2
 
 
-def test_get_period_information_builds_as_expected():
+def test_get_period_states_builds_as_expected():
 
-    df = pd.DataFrame([{"periods":
+    df = pd.DataFrame([{"id": 1, "periods":
                         [{"type_id": 1, "minutes": 48, "ticking": False},
                          {"type_id": 2, "minutes": 46, "ticking": True}]
                         }])
 
-    ticking, type_id, minute = get_period_information(df)
+    states = get_period_states(df)
 
-    assert ticking
-    assert type_id == 2
-    assert minute == 46
+    assert states.at[1, "half_live"]
+    assert states.at[1, "half"] == 2
+    assert states.at[1, "match_minute"] == 46
+
+
+def test_get_period_states_matches_get_active_period_for_every_fixture():
+
+    fixtures = [
+        {"id": 1, "periods": [{"type_id": 1, "minutes": 45, "started": 1, "ticking": False},
+                              {"type_id": 2, "minutes": 60, "started": 2, "ticking": True}]},
+        {"id": 2, "periods": [{"type_id": 1, "minutes": 45, "started": 1, "ticking": False},
+                              {"type_id": 2, "minutes": 90, "started": 2, "ticking": False}]},
+        {"id": 3, "periods": [{"type_id": 1, "minutes": 45, "started": 1},
+                              {"type_id": 2, "minutes": 50}]},
+        {"id": 4, "periods": [{"type_id": 1, "minutes": 30, "ticking": True},
+                              {"type_id": 2, "minutes": 0, "ticking": True}]},
+        {"id": 5, "periods": []}
+    ]
+
+    states = get_period_states(pd.DataFrame(fixtures))
+
+    assert list(states.index) == [1, 2, 3, 4]
+    for fixture in fixtures[:4]:
+        active = get_active_period(fixture["periods"])
+        assert states.at[fixture["id"], "half"] == active["type_id"]
+        assert states.at[fixture["id"], "match_minute"] == active["minutes"]
+        assert states.at[fixture["id"], "half_live"] == active.get("ticking", False)
 
 
 def test_get_match_event_df_builds_correct_structure():
@@ -177,12 +207,13 @@ def test_get_match_event_df_builds_correct_structure():
     df = pd.DataFrame([{"events": [
         {"event_id": 1, "type_id": 15},
         {"event_id": 2, "type_id": 5}
-    ]}])
+    ]}, {"events": [{"event_id": 3, "type_id": 14}]}])
 
     event_df = get_match_event_df(df)
 
     assert "event_id" in event_df.columns
     assert "type_id" in event_df.columns
+    assert list(event_df["event_id"]) == [1, 3]
 
 
 def test_create_match_minute_df_correct_structure_home_entry():
@@ -221,10 +252,10 @@ def test_create_match_minute_df_correct_structure_away_entry():
 
 def test_get_flags_first_half():
 
-    df = pd.DataFrame([{"result_info": None}])
-    df_stats = pd.DataFrame([{"half_live": True}])
+    df = pd.DataFrame([{"id": 1, "result_info": None}])
+    df_periods = pd.DataFrame([{"half_live": True}], index=[1])
 
-    flags = get_flags(df, df_stats)
+    flags = get_flags(df, df_periods)[1]
 
     assert flags["half_live"]
     assert not flags["game_over"]
@@ -232,10 +263,10 @@ def test_get_flags_first_half():
 
 def test_get_flags_half_time():
 
-    df = pd.DataFrame([{"result_info": None}])
-    df_stats = pd.DataFrame([{"half_live": False}])
+    df = pd.DataFrame([{"id": 1, "result_info": None}])
+    df_periods = pd.DataFrame([{"half_live": False}], index=[1])
 
-    flags = get_flags(df, df_stats)
+    flags = get_flags(df, df_periods)[1]
 
     assert not flags["half_live"]
     assert not flags["game_over"]
@@ -243,10 +274,136 @@ def test_get_flags_half_time():
 
 def test_get_flags_full_time():
 
-    df = pd.DataFrame([{"result_info": "Boca won 1-1 after FT."}])
-    df_stats = pd.DataFrame([{"half_live": False}])
+    df = pd.DataFrame([{"id": 1, "result_info": "Boca won 1-1 after FT."}])
+    df_periods = pd.DataFrame([{"half_live": False}], index=[1])
 
-    flags = get_flags(df, df_stats)
+    flags = get_flags(df, df_periods)[1]
 
     assert not flags["half_live"]
     assert flags["game_over"]
+
+
+def test_compiled_type_mapping_matches_spreadsheet():
+
+    df_xlsx = get_type_mapping(str(Path(__file__).parent / "types_map_api.xlsx"))
+    df_compiled = get_compiled_type_mapping()
+
+    xlsx_map = dict(zip(df_xlsx["type_id"], df_xlsx["statistic_name"]))
+    compiled_map = dict(
+        zip(df_compiled["type_id"], df_compiled["statistic_name"]))
+
+    assert compiled_map == xlsx_map
+
+
+def test_compiled_type_mapping_built_once():
+
+    assert get_compiled_type_mapping() is get_compiled_type_mapping()
+
+
+
+def test_dict_engine_matches_pandas_engine(sample_fixture):
+
+    minute_df, event_df, flags = transform_data(
+        get_dataframe_from_response({"data": sample_fixture}))
+    minute_row, event_rows, dict_flags = transform_fixture(sample_fixture)
+
+    assert list(minute_row) == list(minute_df.columns)
+    assert get_values_from_dataframe(minute_df) == [tuple(minute_row.values())]
+
+    assert list(event_rows[0]) == list(event_df.columns)
+    assert get_values_from_dataframe(event_df) == [
+        tuple(row.values()) for row in event_rows]
+
+    assert get_values_from_dataframe(get_players_df(event_df)) == get_player_rows(event_rows)
+    assert dict_flags == flags
+
+
+def test_dict_engine_matches_pandas_engine_for_given_events(sample_fixture):
+
+    events = sample_fixture["events"][1:2]
+
+    _, event_df, _ = transform_data(
+        get_dataframe_from_response({"data": sample_fixture}), events=events)
+    _, event_rows, _ = transform_fixture(sample_fixture, events)
+
+    assert get_values_from_dataframe(event_df) == [
+        tuple(row.values()) for row in event_rows]
+
+
+def test_dict_engine_matches_pandas_engine_without_events(sample_fixture):
+
+    fixture = {**sample_fixture, "events": [], "result_info": "Game ended in draw."}
+
+    minute_df, event_df, flags = transform_data(
+        get_dataframe_from_response({"data": fixture}))
+    minute_row, event_rows, dict_flags = transform_fixture(fixture)
+
+    assert get_values_from_dataframe(minute_df) == [tuple(minute_row.values())]
+    assert event_df.empty and event_rows == []
+    assert dict_flags == flags
+
+
+def test_both_engines_keep_only_stored_stats_and_event_types(sample_fixture):
+    fixture = {**sample_fixture, "statistics": sample_fixture["statistics"] + [
+        {"id": 13, "fixture_id": 19411877, "type_id": 41, "participant_id": 8,
+            "data": {"value": 2}, "location": "home"}]}
+    fixture["events"] = fixture["events"] + [
+        {"id": 106, "fixture_id": 19411877, "participant_id": 8, "type_id": 21,
+            "player_id": 1002, "related_player_id": None, "player_name": "Mohamed Salah",
+            "related_player_name": None, "minute": 44}]
+
+    minute_df, event_df, _ = transform_data(get_dataframe_from_response({"data": fixture}))
+    minute_row, event_rows, _ = transform_fixture(fixture)
+
+    assert "shots_off_target_home" not in minute_df.columns
+    assert set(minute_row) - {"match_id", "match_minute", "half"} <= set(MINUTE_STAT_COLUMNS)
+    assert 106 not in event_df["match_event_id"].values
+    assert [row["match_event_id"] for row in event_rows] == [101, 102, 104, 105]
+
+
+def test_trimmed_payload_gives_the_same_rows(sample_fixture):
+    trimmed = trim_fixture(sample_fixture)
+
+    assert "name" not in trimmed
+    assert all(set(event) <= {"id", "fixture_id", "participant_id", "type_id", "player_id",
+                              "related_player_id", "player_name", "related_player_name",
+                              "minute"} for event in trimmed["events"])
+    assert transform_fixture(trimmed) == transform_fixture(sample_fixture)
+
+    minute_df, event_df, _ = transform_data(get_dataframe_from_response({"data": trimmed}))
+    full_minute_df, full_event_df, _ = transform_data(
+        get_dataframe_from_response({"data": sample_fixture}))
+    assert get_values_from_dataframe(minute_df) == get_values_from_dataframe(full_minute_df)
+    assert get_values_from_dataframe(event_df) == get_values_from_dataframe(full_event_df)
+
+
+def test_transform_fixtures_matches_transforming_each_fixture(sample_fixture):
+    second = {**sample_fixture, "id": 2, "result_info": "Game ended in draw.",
+              "periods": [{"type_id": 2, "started": 1, "minutes": 90, "ticking": False}],
+              "statistics": [{**stat, "fixture_id": 2} for stat in sample_fixture["statistics"][:4]],
+              "events": [{**event, "fixture_id": 2, "id": event["id"] + 100}
+                         for event in sample_fixture["events"][:2]]}
+    not_started = {"id": 3, "result_info": None, "periods": [], "statistics": [], "events": []}
+    fixtures = [sample_fixture, second, not_started]
+
+    minute_df, event_df, flags = transform_fixtures(
+        get_dataframe_from_response({"data": fixtures}))
+
+    assert set(flags) == {19411877, 2}
+    for fixture in fixtures[:2]:
+        minute_row, event_rows, fixture_flags = transform_fixture(fixture)
+        rows = minute_df[minute_df["match_id"] == fixture["id"]]
+        assert get_values_from_dataframe(rows[list(minute_row)]) == [tuple(minute_row.values())]
+        assert sorted(event_df[event_df["match_id"] == fixture["id"]]["match_event_id"]) == [
+            row["match_event_id"] for row in event_rows]
+        assert flags[fixture["id"]] == fixture_flags
+
+
+def test_transform_fixtures_transforms_only_given_events(sample_fixture):
+    second = {**sample_fixture, "id": 2}
+
+    _, event_df, _ = transform_fixtures(
+        get_dataframe_from_response({"data": [sample_fixture, second]}),
+        events={19411877: sample_fixture["events"][1:2]})
+
+    assert list(event_df["match_event_id"]) == [102]
@@ -0,0 +1,144 @@
+# pylint: skip-file
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+from pytest import fixture
+
+from fake_sportmonks import FakeSportmonks
+from match_state import PROCESSED_EVENTS
+from pipeline import FINGERPRINT_STORES
+from scrape_matchday import ConnectionPool, RateLimiter
+from sportmonks import BUCKETS
+from worker import Worker, get_active_matches, is_game_over, send_goal_notifications
+
+
+@fixture(autouse=True)
+def clear_state():
+    BUCKETS.clear()
+    FINGERPRINT_STORES.clear()
+    PROCESSED_EVENTS.clear()
+
+
+def build_worker(fake, clock=lambda: 0.0):
+    api_pool = ConnectionPool("127.0.0.1", 2, lambda host: fake.connect())
+    return Worker(api_pool, MagicMock(), RateLimiter(6000), interval=0.01, jitter=0,
+                  clock=clock)
+
+
+def test_get_active_matches_reads_kick_offs_in_utc():
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value.__enter__.return_value
+    mock_cursor.fetchall.return_value = [(1, datetime(2025, 1, 11, 19))]
+
+    now = datetime(2025, 1, 11, 20, tzinfo=timezone.utc)
+    matches = get_active_matches(mock_conn, now)
+
+    assert matches == {1: datetime(2025, 1, 11, 19, tzinfo=timezone.utc)}
+    assert mock_cursor.execute.call_args[0][1] == (datetime(2025, 1, 11, 20),
+                                                   datetime(2025, 1, 11, 17))
+
+
+def test_is_game_over_ignores_matches_not_started():
+    assert is_game_over({"flags": {"half_live": False, "game_over": True}})
+    assert not is_game_over({"flags": {"half_live": True, "game_over": False}})
+    assert not is_game_over({"flags": "Game has not started yet."})
+
+
+@patch.dict("worker.ENV", {"TOKEN": "MYTOKEN", "TRANSFORM_ENGINE": "dict"})
+@patch("worker.process_fixture_if_changed")
+def test_worker_polls_a_match_until_its_game_is_over(mock_process):
+    mock_process.side_effect = [
+        {"flags": "Game has not started yet.", "match_id": 1},
+        {"flags": {"half_live": True, "game_over": False, "goal_check": []}, "match_id": 1},
+        {"flags": {"half_live": False, "game_over": True, "goal_check": []}, "match_id": 1}]
+
+    with FakeSportmonks([{"id": 1, "periods": []}]) as fake:
+        worker = build_worker(fake)
+        asyncio.run(worker.poll_match(1, datetime(2025, 1, 1, tzinfo=timezone.utc)))
+
+    assert mock_process.call_count == 3
+    assert worker.retired == {1}
+    assert len(fake.requests) == 3
+
+
+@patch.dict("worker.ENV", {"TOKEN": "MYTOKEN", "TRANSFORM_ENGINE": "dict"})
+@patch("worker.process_fixture_if_changed")
+def test_worker_keeps_polling_after_a_failed_request(mock_process):
+    mock_process.return_value = {
+        "flags": {"half_live": False, "game_over": True, "goal_check": []}, "match_id": 1}
+
+    with FakeSportmonks([{"id": 1}]) as fake:
+        fake.fail_next(404)
+        worker = build_worker(fake)
+        asyncio.run(worker.poll_match(1, datetime(2025, 1, 1, tzinfo=timezone.utc)))
+
+    assert len(fake.requests) == 2
+    assert mock_process.call_count == 1
+
+
+@patch.dict("worker.ENV", {"TOKEN": "MYTOKEN", "TRANSFORM_ENGINE": "dict"})
+@patch("worker.process_fixture_if_changed")
+def test_worker_stops_polling_at_full_time(mock_process):
+    mock_process.return_value = {"flags": "Game has not started yet.", "match_id": 1}
+
+    with FakeSportmonks([{"id": 1, "periods": [], "result_info": "Postponed."}]) as fake:
+        worker = build_worker(fake)
+        asyncio.run(worker.poll_match(1, datetime(2025, 1, 1, tzinfo=timezone.utc)))
+
+    assert len(fake.requests) == 1
+    assert worker.retired == {1}
+
+
+@patch.dict("worker.ENV", {"TOKEN": "MYTOKEN", "TRANSFORM_ENGINE": "dict"})
+@patch("worker.process_fixture_if_changed")
+def test_poll_once_scales_the_cadence_to_the_worker_interval(mock_process):
+    periods = [{"type_id": 2, "minutes": 92, "ticking": True}]
+
+    with FakeSportmonks([{"id": 1, "periods": periods, "events": []}]) as fake:
+        worker = build_worker(fake)
+        _, poll_seconds = worker.poll_once(1, fake.connect())
+
+    assert poll_seconds == 0.005
+
+
+@patch.dict("worker.ENV", {"TRANSFORM_ENGINE": "dict"})
+def test_worker_retires_matches_past_the_window():
+    kick_off = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    with FakeSportmonks() as fake:
+        worker = build_worker(fake, clock=lambda: kick_off.timestamp() + 4 * 3600)
+        asyncio.run(worker.poll_match(1, kick_off))
+
+    assert worker.retired == {1}
+    assert fake.requests == []
+
+
+@patch.dict("worker.ENV", {"TRANSFORM_ENGINE": "dict"})
+@patch("worker.get_active_matches")
+def test_refresh_picks_up_new_matches_and_skips_retired(mock_active):
+    kick_off = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    mock_active.return_value = {1: kick_off, 2: kick_off}
+
+    async def run(worker):
+        worker.poll_match = MagicMock(side_effect=lambda match_id, _: asyncio.sleep(0))
+        worker.retired.add(2)
+        await worker.refresh()
+        await asyncio.gather(*worker.tasks.values())
+        return worker
+
+    with FakeSportmonks() as fake:
+        worker = asyncio.run(run(build_worker(fake)))
+
+    assert list(worker.tasks) == [1]
+    assert worker.db_pool.putconn.called
+
+
+@patch.dict("worker.ENV", {"NOTIFICATION_LAMBDA": "notify"})
+@patch("boto3.client")
+def test_send_goal_notifications_only_invokes_for_new_goals(mock_client):
+    send_goal_notifications({"flags": {"goal_check": []}, "match_id": 1})
+    assert not mock_client.called
+
+    send_goal_notifications({"flags": {"goal_check": [{"minute": 30}]}, "match_id": 1})
+    assert mock_client.return_value.invoke.call_args[1]["FunctionName"] == "notify"
@@ -1,15 +1,15 @@
 """Transform data for upload to our database."""
 
-from os import environ as ENV
-from http.client import HTTPSConnection
 import logging
 from json import load
-from datetime import datetime, timezone
+from functools import cache
 
 import pandas as pd
-from dotenv import load_dotenv
 
-from extract import run_extract
+from type_map import TYPE_MAP
+from columns import (FIXTURE_FIELDS, EVENT_FIELDS, EVENT_TYPE_IDS,
+                     MINUTE_STAT_COLUMNS, MINUTE_RENAMES, EVENT_RENAMES)
+from match_state import get_period_state
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(
@@ -18,78 +18,6 @@ logging.basicConfig(
     datefmt="%Y-%m-%dT%H:%M:%S"
 )
 
-STATS_COLUMNS = [
-    "accurate_crosses_away",
-    "accurate_crosses_home",
-    "ball_possession_away",
-    "ball_safe_away",
-    "ball_safe_home",
-    "goal_attempts_away",
-    "goal_attempts_home",
-    "goal_kicks_away",
-    "goal_kicks_home",
-    "injuries_away",
-    "injuries_home",
-    "long_passes_away",
-    "long_passes_home",
-    "shots_off_target_away",
-    "shots_off_target_home",
-    "successful_dribbles_percentage_away",
-    "successful_dribbles_percentage_home",
-    "successful_passes_percentage_home",
-    "successful_passes_percentage_away",
-    "throwins_away",
-    "throwins_home",
-    "assists_away",
-    "assists_home",
-    "goals_away",
-    "goals_home",
-    "substitutions_away",
-    "substitutions_home",
-    "yellowcards_away",
-    "yellowcards_home",
-    "redcards_away",
-    "redcards_home",
-    "penalties_away",
-    "penalties_home"
-]
-
-BULK_COLUMNS = [
-    "league_id",
-    "season_id",
-    "sport_id",
-    "stage_id",
-    "group_id",
-    "aggregate_id",
-    "round_id",
-    "state_id",
-    "venue_id",
-    "name",
-    "starting_at",
-    "leg",
-    "details",
-    "length",
-    "placeholder",
-    "has_odds",
-    "has_premium_odds",
-    "starting_at_timestamp",
-]
-
-EVENT_COLUMNS = [
-    "period_id",
-    "section",
-    "result",
-    "info",
-    "addition",
-    "extra_minute",
-    "injured",
-    "on_bench",
-    "coach_id",
-    "sub_type_id",
-    "detailed_period_id",
-    "sort_order"
-]
-
 
 def get_dataframe_from_response(data: dict) -> pd.DataFrame:
     """
@@ -123,83 +51,62 @@ def get_dataframe_from_json(file_path: str) -> pd.DataFrame:
     return get_dataframe_from_response(data)
 
 
-def drop_bulk_columns(df: pd.DataFrame, columns_to_remove: list[str]) -> pd.DataFrame:
-    """Drops unnecessary columns from the extracted data."""
+def keep_columns(df: pd.DataFrame, columns_to_keep: list[str]) -> pd.DataFrame:
+    """Returns the DataFrame with only the columns we store, in their current order."""
 
-    logger.info("Dropping unnecessary columns from request.")
-    return df.drop(columns=columns_to_remove, errors="ignore")
+    return df[[column for column in df.columns if column in columns_to_keep]]
 
 
 def get_statistics(df: pd.DataFrame) -> pd.DataFrame:
-    """Gets the statistics rows and returns them as a DataFrame."""
+    """Gets the statistics rows of every fixture and returns them as one DataFrame."""
 
-    match_id = df.at[0, "id"]
-    df_stats = pd.json_normalize(df["statistics"].iloc[0])
-    df_stats["match_id"] = match_id
+    df_stats = pd.json_normalize(
+        [statistic for statistics in df["statistics"] for statistic in statistics])
+    df_stats["match_id"] = df["id"].repeat(df["statistics"].map(len)).to_numpy()
 
     logger.info("Created statistics dataframe.")
     return df_stats
 
 
-def get_active_period(periods: list[dict]) -> dict:
-    """Returns the current period that is in play."""
-
-    for period in periods:
-        if period.get("ticking", False):
-
-            logger.info("Found active period.")
-            return period
-
-    for period in reversed(periods):
-        if 'started' in period:
-
-            logger.info("Found last active period.")
-            return period
-
-    return periods[-1]
-
-
-def get_period_information(df: pd.DataFrame) -> tuple[bool, int, int]:
-    """Returns the the state of the half, the current half and the minute."""
-
-    periods = df.at[0, "periods"]
-    active_period = get_active_period(periods)
+def get_period_states(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns the state of the half, the current half and the minute of every fixture
+    with periods, indexed by match_id.
+    A fixture only has a few periods, so each is read with match_state.get_period_state,
+    the same as the dict engine.
+    """
 
-    ticking = active_period.get("ticking", False)
-    type_id = active_period.get("type_id", -1)
-    minute = active_period.get("minutes", -1)
+    periods = df.set_index("id")["periods"]
+    periods = periods[periods.map(bool)]
 
-    logger.info("Is half live: %s. Current half: %s. Current minute: %s.",
-                ticking, type_id, minute)
-    return (ticking, type_id, minute)
+    logger.info("Found the period state of %s fixtures.", len(periods))
+    return pd.DataFrame(periods.map(get_period_state).tolist(),
+                        columns=["half_live", "half", "match_minute"],
+                        index=periods.index.rename("match_id"))
 
 
-def append_period_to_statistics(df: pd.DataFrame, df_stats: pd.DataFrame) -> pd.DataFrame:
-    """Returns a statistics dataframe with period information."""
+def append_period_to_statistics(df_periods: pd.DataFrame,
+                                df_stats: pd.DataFrame) -> pd.DataFrame:
+    """Returns a statistics dataframe with the period information of each row's fixture."""
 
-    ticking, type_id, minute = get_period_information(df)
-    df_stats["half_live"] = ticking
-    df_stats["half"] = type_id
-    df_stats["match_minute"] = minute
+    df_stats = df_stats.join(df_periods, on="match_id", how="inner")
 
     logger.info(
         "Successfully appended statistics with current game state information.")
     return df_stats.drop(columns=['id', 'fixture_id'], errors="ignore")
 
 
-def get_match_event_df(df: pd.DataFrame) -> pd.DataFrame:
-    """Returns the DataFrame for the match_event table."""
+def get_match_event_df(df: pd.DataFrame, events: list[list[dict]] = None) -> pd.DataFrame:
+    """
+    Returns the DataFrame for the match_event table, with only the event types we store.
+    Takes the events of every fixture in df, or the lists of events given.
+    """
 
-    events = df.at[0, "events"]
+    if events is None:
+        events = df["events"]
     logger.info("Found current match events.")
-    return pd.DataFrame(events)
-
-
-def drop_event_columns(df: pd.DataFrame, columns_to_remove: list[str]) -> pd.DataFrame:
-    """Drops events not necessary to our design."""
-
-    logger.info("Dropping unnecessary event information.")
-    return df.drop(columns=columns_to_remove, errors="ignore")
+    return pd.DataFrame([event for fixture_events in events for event in fixture_events
+                         if event.get("type_id") in EVENT_TYPE_IDS])
 
 
 def map_event_to_type(df_map: pd.DataFrame, df_event: pd.DataFrame) -> pd.DataFrame:
@@ -209,20 +116,15 @@ def map_event_to_type(df_map: pd.DataFrame, df_event: pd.DataFrame) -> pd.DataFr
     return df_event.merge(df_map, on="type_id", how="inner")
 
 
-def prepare_events(df: pd.DataFrame, columns_to_remove: list[str],
+def prepare_events(df: pd.DataFrame, columns_to_keep: list[str],
                    df_map: pd.DataFrame) -> pd.DataFrame:
     """Returns the prepared events DataFrame."""
 
-    df = drop_event_columns(df, columns_to_remove)
+    logger.info("Keeping the event fields we store.")
+    df = keep_columns(df, columns_to_keep)
     df_events = map_event_to_type(df_map, df)
 
-    df_events = df_events.rename(columns={
-        "id": "match_event_id",
-        "fixture_id": "match_id",
-        "participant_id": "team_id",
-        "statistic_name": "type_name",
-        "type_id": "event_type_id"
-    })
+    df_events = df_events.rename(columns=EVENT_RENAMES)
 
     logger.info("match_event dataframe ready for upload.")
     return df_events
@@ -242,6 +144,20 @@ def get_type_mapping(file_path: str) -> pd.DataFrame:
     return df_mapping
 
 
+@cache
+def get_compiled_type_mapping() -> pd.DataFrame:
+    """
+    Returns the type map built from the compiled type_map module.
+    This is cached, so it is only built once per container.
+    """
+
+    df_mapping = pd.DataFrame(list(TYPE_MAP.items()),
+                              columns=["type_id", "statistic_name"])
+
+    logger.info("Loaded the compiled type map dataframe.")
+    return df_mapping
+
+
 def create_match_minute_df(df_stats: pd.DataFrame, df_map: pd.DataFrame) -> pd.DataFrame:
     """Returns the match_minute DataFrame resembling our ERD."""
 
@@ -259,61 +175,85 @@ def create_match_minute_df(df_stats: pd.DataFrame, df_map: pd.DataFrame) -> pd.D
     return df_minute
 
 
-def drop_unwanted_stats(df: pd.DataFrame, columns_to_remove: list[str]) -> pd.DataFrame:
-    """Drops stats not necessary to our design."""
+def keep_stored_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """Returns the renamed match_minute DataFrame with only the statistics we store."""
 
-    logger.info("Dropping unwanted statistics.")
-    return df.drop(columns=columns_to_remove, errors="ignore")
+    logger.info("Keeping the statistics we store.")
+    return keep_columns(df, ["match_id", "match_minute", "half", *MINUTE_STAT_COLUMNS])
 
 
-def transform_data(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
-    """Runs the transformation process."""
+def transform_fixtures(df: pd.DataFrame, df_map: pd.DataFrame = None,
+                       events: dict[int, list[dict]] = None
+                       ) -> tuple[pd.DataFrame, pd.DataFrame, dict[int, dict]]:
+    """
+    Runs the transformation process on many fixtures in one pass,
+    returning one match_minute_stats row per fixture, every fixture's events,
+    and the flags of each fixture by match_id.
+    Fixtures without periods have not started, and are left out.
+    When events are given by match_id, only those are transformed instead of every event in df.
+    """
 
-    df = drop_bulk_columns(df, BULK_COLUMNS)
-    df_map = get_type_mapping("/var/task/types_map_api.xlsx")
-    df_match_event = get_match_event_df(df)
+    df = keep_columns(df, FIXTURE_FIELDS)
+    if df_map is None:
+        df_map = get_compiled_type_mapping()
+    df_match_event = get_match_event_df(
+        df, None if events is None else [events.get(match_id, []) for match_id in df["id"]])
 
     if df_match_event.empty:
         df_events = df_match_event
     else:
-        df_events = prepare_events(df_match_event, EVENT_COLUMNS, df_map)
+        df_events = prepare_events(df_match_event, EVENT_FIELDS, df_map)
 
-    df_stats = append_period_to_statistics(df, get_statistics(df))
+    df_periods = get_period_states(df)
+    df_stats = append_period_to_statistics(df_periods, get_statistics(df))
 
     df_minute = create_match_minute_df(df_stats, df_map)
-    df_minute = drop_unwanted_stats(df_minute, STATS_COLUMNS)
-    df_minute = df_minute.rename(columns={
-        "ball_possession_home": "possession_home",
-        "dangerous_attacks_away": "danger_attacks_away",
-        "dangerous_attacks_home": "danger_attacks_home",
-        "shots_insidebox_home": "shots_inside_home",
-        "shots_insidebox_away": "shots_inside_away",
-        "shots_outsidebox_home": "shots_outside_home",
-        "shots_outsidebox_away": "shots_outside_away",
-        "shots_total_home": "shots_home",
-        "shots_total_away": "shots_away"
-    })
-
-    game_status = get_flags(df, df_stats)
-    logger.info("Is game over: %s", game_status["game_over"])
+    df_minute = keep_stored_stats(df_minute.rename(columns=MINUTE_RENAMES))
+
+    flags = get_flags(df, df_periods)
+    logger.info("Transformed %s fixtures.", len(flags))
     logger.info("Transform handing off to load ...")
+    return df_minute, df_events, flags
+
+
+def transform_data(df: pd.DataFrame, df_map: pd.DataFrame = None,
+                   events: list[dict] = None) -> tuple[pd.DataFrame, pd.DataFrame, dict]:
+    """
+    Runs the transformation process on a single fixture.
+    When events are given, only those are transformed instead of every event in df.
+    """
+
+    match_id = df["id"].iloc[0]
+    df_minute, df_events, flags = transform_fixtures(
+        df, df_map, None if events is None else {match_id: events})
+
+    game_status = flags[match_id]
+    logger.info("Is game over: %s", game_status["game_over"])
     return df_minute, df_events, game_status
 
 
-def get_flags(df: pd.DataFrame, df_stats: pd.DataFrame) -> dict:
-    """Returns a dict of the game state flags."""
+def get_flags(df: pd.DataFrame, df_periods: pd.DataFrame) -> dict[int, dict]:
+    """Returns a dict of the game state flags of each fixture with periods, by match_id."""
 
-    half_live = df_stats["half_live"].iloc[0]
-    result_info = df["result_info"].iloc[0]
+    result_info = dict(zip(df["id"], df["result_info"]))
 
     return {
-        "half_live": bool(half_live),
-        "game_over": result_info is not None
+        match_id: {
+            "half_live": bool(half_live),
+            "game_over": pd.notna(result_info[match_id])
+        }
+        for match_id, half_live in zip(df_periods.index, df_periods["half_live"])
     }
 
 
 if __name__ == "__main__":
 
+    from os import environ as ENV
+    from http.client import HTTPSConnection
+
+    from dotenv import load_dotenv
+    from extract import run_extract
+
     load_dotenv()
 
     api_token = ENV["TOKEN"]
@@ -0,0 +1,739 @@
+"""
+Type map compiled from types_map_api.xlsx by compile_type_map.py.
+Do not edit by hand, regenerate it with `python compile_type_map.py`.
+"""
+# pylint: skip-file
+
+TYPE_MAP = {
+    1: '1st_half',
+    2: '2nd_half',
+    3: 'et',
+    5: 'penalty_shootout',
+    6: 'referee',
+    7: 'referee_two',
+    8: 'referee_three',
+    9: 'referee_four',
+    10: 'var',
+    11: 'lineup',
+    12: 'bench',
+    13: 'sidelined',
+    14: 'goal',
+    15: 'owngoal',
+    16: 'penalty',
+    17: 'missed_penalty',
+    18: 'substitution',
+    19: 'yellowcard',
+    20: 'redcard',
+    21: 'yellowredcard',
+    22: 'penalty_shootout_miss',
+    23: 'penalty_shootout_goal',
+    24: 'goalkeeper',
+    25: 'defender',
+    26: 'midfielder',
+    27: 'attacker',
+    28: 'unknown',
+    29: 'video',
+    30: 'clip',
+    31: 'file',
+    32: 'probability',
+    33: 'valuebet',
+    34: 'corners',
+    35: 'neutral_venue',
+    36: 'kickoff',
+    37: 'match_details',
+    39: 'et_2nd_half',
+    40: 'captain',
+    41: 'shots_off_target',
+    42: 'shots_total',
+    43: 'attacks',
+    44: 'dangerous_attacks',
+    45: 'ball_possession',
+    46: 'ball_safe',
+    47: 'penalties',
+    49: 'shots_insidebox',
+    50: 'shots_outsidebox',
+    51: 'offsides',
+    52: 'goals',
+    53: 'goal_kicks',
+    54: 'goal_attempts',
+    55: 'free_kicks',
+    56: 'fouls',
+    57: 'saves',
+    58: 'shots_blocked',
+    59: 'substitutions',
+    60: 'throwins',
+    61: 'beats',
+    62: 'long_passes',
+    63: 'short_passes',
+    64: 'hit_woodwork',
+    65: 'successful_headers',
+    66: 'successful_interceptions',
+    67: 'successful_centers',
+    68: 'substitutions_overtime',
+    69: 'offsides_overtime',
+    70: 'headers',
+    71: 'last_substitution',
+    72: 'first_substitution',
+    73: 'successful_center',
+    75: 'corners_overtime',
+    76: 'goalkeeper_come_outs',
+    77: 'challenges',
+    78: 'tackles',
+    79: 'assists',
+    80: 'passes',
+    81: 'successful_passes',
+    82: 'successful_passes_percentage',
+    83: 'redcards',
+    84: 'yellowcards',
+    85: 'yellowred_cards',
+    86: 'shots_on_target',
+    87: 'injuries',
+    88: 'goals_conceded',
+    91: 'first_offside',
+    92: 'last_offside',
+    94: 'dispossessed',
+    95: 'offsides_provoked',
+    96: 'fouls_drawn',
+    97: 'blocked_shots',
+    98: 'total_crosses',
+    99: 'accurate_crosses',
+    100: 'interceptions',
+    101: 'clearances',
+    102: 'clearances_won',
+    103: 'punches',
+    104: 'saves_inside_box',
+    105: 'total_duels',
+    106: 'duels_won',
+    107: 'aerials_won',
+    108: 'dribbled_attempts',
+    109: 'successful_dribbles',
+    110: 'dribbled_past',
+    111: 'penalties_scored',
+    112: 'penalties_misses',
+    113: 'penalties_saved',
+    114: 'penalties_committed',
+    115: 'penalties_won',
+    116: 'accurate_passes',
+    117: 'key_passes',
+    118: 'rating',
+    119: 'minutes_played',
+    120: 'touches',
+    121: 'turn_over',
+    122: 'long_balls',
+    123: 'long_balls_won',
+    124: 'through_balls',
+    125: 'through_balls_won',
+    126: 'corner',
+    129: 'overall_matches',
+    130: 'overall_wins',
+    131: 'overall_draws',
+    132: 'overall_lost',
+    133: 'overall_scored',
+    134: 'overall_conceded',
+    135: 'home_matches',
+    136: 'home_wins',
+    137: 'home_draws',
+    138: 'home_lost',
+    139: 'home_scored',
+    140: 'home_conceded',
+    141: 'away_matches',
+    142: 'away_wins',
+    143: 'away_draws',
+    144: 'away_lost',
+    145: 'away_scored',
+    146: 'away_conceded',
+    147: 'promotion',
+    148: 'centre_back',
+    149: 'defensive_midfield',
+    150: 'attacking_midfield',
+    151: 'centre_forward',
+    152: 'left_wing',
+    153: 'central_midfield',
+    154: 'right_back',
+    155: 'left_back',
+    156: 'right_wing',
+    157: 'left_midfield',
+    158: 'right_midfield',
+    159: 'formation',
+    160: 'ball_coordinates',
+    161: 'home_participant_colors',
+    162: 'away_participant_colors',
+    163: 'secondary_striker',
+    164: 'has_standing',
+    165: 'has_topscorers',
+    168: '8th_finals',
+    169: 'points',
+    170: 'head_to_head',
+    171: 'goal_difference',
+    172: 'split_points_rule',
+    173: 'points',
+    174: 'goals_for',
+    175: 'goals_against',
+    176: 'streak',
+    179: 'overall_goal_difference',
+    180: 'uefa_champions_league',
+    181: 'uefa_europa_league',
+    182: 'relegation',
+    183: 'championship_round',
+    184: 'relegation_round',
+    185: 'home_points',
+    186: 'away_points',
+    187: 'total_points',
+    188: 'matches',
+    189: 'total_teams',
+    190: 'matches_ended_in_draw',
+    191: 'number_of_goals',
+    192: 'btts',
+    193: 'cards',
+    194: 'cleansheet',
+    195: 'goalkeeper_cleansheet',
+    196: 'scoring_minutes',
+    197: 'goal_line',
+    201: 'win_percentage',
+    202: 'defeat_percentage',
+    203: 'draw_percentage',
+    204: 'participant_most_scored',
+    205: 'participant_most_conceded',
+    206: 'participant_most_scored_per_match',
+    207: 'participant_most_conceded_per_match',
+    208: 'goal_topscorer',
+    209: 'assist_topscorer',
+    210: 'card_topscorer',
+    211: 'highest_rated_player',
+    212: 'highest_rated_team',
+    213: 'conceded_scoring_minutes',
+    214: 'win',
+    215: 'draw',
+    216: 'lost',
+    217: 'major_league',
+    218: 'loan_transfer',
+    219: 'transfer',
+    220: 'free_transfer',
+    221: 'coach',
+    222: 'provides_news',
+    223: 'group_stage',
+    224: 'knock_out',
+    225: 'qualifying',
+    226: 'assistant_coach',
+    227: 'goalkeeping_coach',
+    228: 'forward_coach',
+    229: 'preferred_foot',
+    230: 'rule_color',
+    231: 'btts_probability',
+    232: 'htft_probability',
+    233: 'first_half_winner_probability',
+    234: 'over_under_1_5_probability',
+    235: 'over_under_2_5_probability',
+    236: 'over_under_3_5_probability',
+    237: 'fulltime_result_probability',
+    238: 'team_to_score_first_probability',
+    239: 'double_chance_probability',
+    240: 'correct_score_probability',
+    241: 'historical_log_loss',
+    242: 'model_hit_ratio',
+    243: 'model_predictability',
+    244: 'model_predictive_power',
+    245: 'models_log_loss',
+    246: 'uefa_champions_league_qualifiers',
+    247: 'uefa_cup',
+    248: 'intertoto_cup',
+    249: 'relegation_play_off',
+    250: 'possible__relegation',
+    251: 'promotion_group',
+    252: 'relegation_group',
+    254: 'champions_league_qualifiers_play_off',
+    255: 'next_round',
+    256: 'semi_finals',
+    257: 'final_tournament',
+    258: 'intercontinental_play_off',
+    259: 'final_tournament_or_play_offs',
+    260: 'afc_champions_league_qualifiers',
+    261: 'afc_cup',
+    262: 'possible_8th_finals',
+    263: 'uefa_europa_league_play_off',
+    264: 'promotion_play_off',
+    265: 'uefa_europa_league_qualifiers',
+    266: 'middle_play_off',
+    267: 'champion',
+    268: 'conmebol_libertadores',
+    269: 'final_series_play_offs',
+    270: 'possible_final',
+    271: 'possible_final_tournament',
+    272: 'possible_next_round',
+    273: 'caf_champions_league',
+    274: 'caf_confederation_cup',
+    275: 'quarter_finals',
+    276: 'possible_semi_finals',
+    277: 'world_cup',
+    278: 'play_off',
+    279: 'final_series',
+    280: 'final',
+    281: 'concacaf_champions_league',
+    282: 'lower_table_round',
+    283: 'caf_champions_league_qualifiers',
+    284: 'afc_champions_league',
+    285: 'cfu_club_championship',
+    286: 'conmebol_libertadores_qualifiers',
+    287: 'conmebol_sudamericana',
+    288: 'champion_play_off',
+    289: 'uefa_conference_league_qualifiers',
+    290: 'afc_cup_play_offs',
+    291: 'championship_round_play_offs',
+    292: 'possible_promotion_play_off',
+    293: 'uefa_conference_league_play_offs',
+    294: '3rd_place_final',
+    295: 'bottom_play_offs',
+    296: 'ofc_champions_league',
+    297: 'possible_quarter_finals',
+    298: '16th_finals',
+    299: 'uefa_conference_league_qualifiers_play_off',
+    300: 'preliminary_promotion_play_off',
+    301: 'final_round_play_off',
+    302: 'caf_confederation_cup_qualifiers',
+    303: '5th_8th_place_play_offs',
+    304: '5th_place_final',
+    305: '7th_place_final',
+    306: 'final_serie',
+    307: 'play_offs',
+    308: '9th_place_final',
+    309: '11th_place_final',
+    310: 'possible_final_series',
+    311: 'possible_play_off',
+    312: 'possible_relegation_play_off',
+    313: 'possible_promotion',
+    314: 'var_moments',
+    315: 'outgroup_matches',
+    316: 'championship_round_relegation_round',
+    321: 'appearances',
+    322: 'lineups',
+    323: 'bench',
+    324: 'own_goals',
+    326: 'home_over_under_3_5_probability',
+    327: 'away_over_under_3_5_probability',
+    328: 'away_over_under_2_5_probability',
+    330: 'home_over_under_2_5_probability',
+    331: 'home_over_under_1_5_probability',
+    332: 'away_over_under_1_5_probability',
+    333: 'away_over_under_0_5_probability',
+    334: 'home_over_under_0_5_probability',
+    335: 'over_under_0_5_probability',
+    336: 'ill',
+    337: 'cruciate_ligament_rupture',
+    339: 'groin_injury',
+    531: 'knock',
+    532: 'calf_injury',
+    533: 'thigh_problems',
+    534: 'fibula_fracture',
+    535: 'hamstring_injury',
+    536: 'knee_injury',
+    537: 'ankle_injury',
+    538: 'covid_19',
+    540: 'knee_surgery',
+    541: 'ankle_fracture',
+    542: 'metatarsal_fracture',
+    543: 'pubitis',
+    544: 'thigh_muscle_rupture',
+    545: 'shoulder_injury',
+    546: 'ruptured_cruciate_ligament',
+    547: 'fitness',
+    548: 'groin_surgery',
+    549: 'foot_injury',
+    550: 'concussion',
+    551: 'hip_injury',
+    552: 'leg_injury',
+    553: 'inguinal_hernia',
+    554: 'muscle_injury',
+    555: 'thumb_injury',
+    556: 'heart_condition',
+    557: 'cruciate_ligament_injury',
+    558: 'foot_surgery',
+    559: 'calculates_trophies',
+    560: 'caretaker_manager',
+    561: 'suspended',
+    562: 'twisted_knee',
+    563: 'skip_season_topscorers_calculation',
+    567: 'pitch',
+    568: 'offside',
+    569: 'shot_on_target',
+    570: 'shot_off_target',
+    571: 'error_lead_to_goal',
+    573: 'none',
+    574: 'referees',
+    575: 'failed_to_score',
+    578: 'attendance',
+    580: 'big_chances_created',
+    581: 'big_chances_missed',
+    582: 'clearance_offline',
+    583: 'last_man_tackle',
+    584: 'good_high_claim',
+    585: 'tear_in_joint_capsule',
+    587: 'unknown_injury',
+    588: 'adductor_problems',
+    589: 'muscle_fatigue',
+    590: 'rest',
+    591: 'distortion_of_the_ankle',
+    592: 'ruptured_nkee_ligament',
+    593: 'thigh_muscle_strain',
+    594: 'mensical_injury',
+    595: 'back_injury',
+    596: 'biceps_femoris_muscle_injury',
+    597: 'tear_in_abductor_muscle',
+    598: 'muscular_problems',
+    599: 'torn_muscle_blend',
+    600: 'dead_leg',
+    601: 'abdominal_influenza',
+    602: 'femoral_fracture',
+    603: 'achilles_tendon_problems',
+    604: 'achilles_tendon_rupture',
+    605: 'hip_problems',
+    606: 'fractured_finger',
+    607: 'bruised_foot',
+    608: 'surgery',
+    609: 'torn_knee_ligament',
+    610: 'flu',
+    611: 'fractured_jaw',
+    612: 'heel_bone_injury',
+    613: 'hashtag',
+    614: 'herniated_disc',
+    615: 'peroneus_tendon_injury',
+    616: 'fractured_eye_socket',
+    618: 'ruptured_knee_ligament',
+    619: 'back_trouble',
+    620: 'ruptured_ankle',
+    621: 'syndesmotic_ligament_tear',
+    622: 'pulled_hamstring_at_adductors',
+    623: 'fractured_toe',
+    624: 'facial_fracture',
+    625: 'acromioclavicular_separation',
+    626: 'frontal_bone_fracture',
+    627: 'cancer',
+    628: 'fractured_leg',
+    629: 'injury',
+    630: 'head_injury',
+    631: 'cheekbone_fracture',
+    632: 'torn_muscle_fibre',
+    633: 'cartilage_damage',
+    636: 'ruptured_meniscus',
+    637: 'inflammation',
+    638: 'fractured_arm',
+    639: 'arthroscopie',
+    640: 'lumbago',
+    641: 'lymphoma',
+    642: 'pubalgia',
+    643: 'tibia_fracture',
+    644: 'mensical_laceration',
+    645: 'patella_rupture',
+    646: 'forearm_fracture',
+    647: 'disrupted_calf_muscle',
+    648: 'medial_collateral_ligament_injury',
+    649: 'fractured_rib',
+    650: 'bruised_rib',
+    651: 'sideband_tear_in_knee',
+    652: 'cold',
+    653: 'gastric_problems',
+    654: 'virus_infection',
+    655: 'traffic_accident',
+    656: 'shinbone_injury',
+    658: 'bruise',
+    659: 'nose_surgery',
+    660: 'nose_injury',
+    661: 'calf_problems',
+    662: 'back_bruise',
+    663: 'pneumonia',
+    664: 'hand_injury',
+    665: 'quarantine',
+    666: 'collarbone_fracture',
+    667: 'torn_muscle_bundle',
+    669: 'abscess',
+    670: 'medial_collateral_ligament_tear',
+    671: 'ankle_surgery',
+    672: 'ankle_problems',
+    673: 'toe_injury',
+    674: 'cals_sclerosis',
+    675: 'appendectomy',
+    676: 'eye_injury',
+    677: 'minor_knock',
+    678: 'overstretching',
+    679: 'knee_inflammation',
+    680: 'fatigue_fracture',
+    681: 'inflamed_ligaments_of_the_knee',
+    682: 'sprain',
+    683: 'bruised_knee',
+    684: 'chickenpox',
+    687: 'knee_problems',
+    688: 'heelspur',
+    690: 'tendon_irritation',
+    691: 'fever',
+    692: 'arch_pain',
+    693: 'achilles_irritation',
+    694: 'muscle_fiber_tear',
+    695: 'flesh_wound',
+    696: 'meniscus_damage',
+    697: 'calf_muscle_strain',
+    700: 'fractured_hand',
+    701: 'fractured_foot',
+    702: 'stretched_ligament',
+    703: 'compression_of_spinal',
+    704: 'bone_bruise',
+    705: 'torn_collateral_ligament',
+    706: 'sprained_ankle',
+    708: 'torn_muscle',
+    709: 'arm_injury',
+    711: 'heel_pain',
+    712: 'metatarsal_bone_bruise',
+    713: 'finger_injury',
+    714: 'partial_damage_to_the_cruciate_ligament',
+    715: 'torn_meniscus',
+    716: 'pelvis_injury',
+    717: 'ruptured_ankle_aigament',
+    718: 'torn_tendon',
+    720: 'fibula_shaft_fractures',
+    721: 'stomach_complaints',
+    722: 'dental_surgery',
+    723: 'whiplash',
+    724: 'pubis_bone_irritation',
+    726: 'shoulder_fracture',
+    728: 'torn_ligament',
+    729: 'nasal_bone_fracture',
+    730: 'mononucleosis',
+    731: 'bone_chipping',
+    733: 'vertebra_injury',
+    734: 'pubis_bone_contusion',
+    735: 'fracture_of_the_orbit',
+    736: 'stress_response_of_the_bone',
+    737: 'infection',
+    738: 'umbilical_hernia',
+    739: 'hamstring_contusion',
+    740: 'adductors_avulsion',
+    741: 'hand_fracture',
+    742: 'fissure_of_the_fibula',
+    743: 'appendicitis',
+    744: 'contracture',
+    745: 'neck_injury',
+    746: 'navicular_bone_fracture',
+    747: 'scaphoid_operation',
+    748: 'fracture',
+    750: 'ligament_problems',
+    752: 'facial_injury',
+    753: 'abdominal_muscles_injury',
+    755: 'elbow_injury',
+    756: 'double_torn_ligament',
+    757: 'food_poisoning',
+    758: 'bruised_hip',
+    759: 'bruised_ankle',
+    760: 'torn_lateral_collateral_ligament',
+    761: 'capsular_rupture_in_the_ankle',
+    762: 'tonsillitis',
+    764: 'insect_bite',
+    767: 'patella_problems',
+    768: 'intraarticular_ligament_fissure',
+    769: 'hairline_crack_in_the_foot',
+    770: 'problems_with_the_right_hip_flexor',
+    771: 'lumbar_vertebrae_problems',
+    773: 'angina',
+    774: 'tarsal_rupture',
+    775: 'medial_collateral_ligament_avulsion',
+    776: 'abdominal_strain',
+    777: 'ruptured_lateral_collateral_ligament',
+    779: 'plantar_fascia',
+    782: 'sideband_strain_in_the_knee',
+    784: 'cervical_spine_injury',
+    785: 'ruptured_syndesmotic_ligament',
+    786: 'cheek_bone_contusion',
+    787: 'laceration',
+    788: 'wirst_injury',
+    789: 'shin_bone_bruise',
+    790: 'sinus_fracture',
+    791: 'ruptured_sideband_in_the_knee',
+    792: 'broken_wrist',
+    793: 'pinched_nerve',
+    794: 'bronchitis',
+    795: 'cheekbone_surgery',
+    796: 'fractured_skull',
+    797: 'ruptured_intraarticular_ligament_initiation_in_the_ankle',
+    798: 'tendonitis',
+    799: 'sideband_tear',
+    800: 'edema_in_the_knee',
+    801: 'rupture_of_the_timpanum',
+    804: 'tendon_crack',
+    805: 'ruptured_ligaments',
+    806: 'muscle_bruise',
+    807: 'bone_inflammation',
+    808: 'cracked_lung',
+    809: 'compartment_syndrome',
+    810: 'sideband_injury',
+    811: 'bursitis',
+    812: 'lumbar_vertebra_fracture',
+    814: 'muscle_partial_avulsion',
+    815: 'tibia_and_fibula_fracture',
+    816: 'pneumothorax',
+    817: 'testicular_cancer',
+    818: 'ruptured_sideband',
+    819: 'contused_laceration',
+    821: 'patella_tendon_irritation',
+    822: 'cruciate_ligament_stretch',
+    824: 'problems_with_the_left_hip_flexor',
+    825: 'bone_buckling',
+    826: 'fractured_thumb',
+    828: 'fractured_kneecap',
+    829: 'problems_with_the_hip_flexor',
+    830: 'screws_nails_removal',
+    831: 'infected_wound',
+    832: 'toothache',
+    833: 'rupture_of_the_pattella',
+    835: 'muscular_hairline_crack',
+    836: 'chest_injury',
+    837: 'intestial_virus',
+    839: 'cruciate_ligament_strain',
+    842: 'pelvic_tumor',
+    843: 'meniscus_irritation',
+    844: 'skin_disease',
+    846: 'strain_in_the_thigh_and_gluteal_muscles',
+    847: 'ankle_inflammation',
+    849: 'impingement_syndrome',
+    851: 'fracture_dislocation_of_the_ankle',
+    853: 'cut',
+    854: 'capsular_tear',
+    855: 'coccyx_contusion',
+    856: 'sciatic_problem',
+    858: 'blockade_in_the_spinal',
+    859: 'laceration_of_the_capsule',
+    860: 'fracture_of_the_lower_leg',
+    861: 'burns',
+    862: 'dislocation_of_the_patella',
+    864: 'cervical_fracture',
+    865: 'ruptured_sideband_in_the_ankle',
+    866: 'midface_fracture',
+    867: 'meningitis',
+    868: 'kidney_problems',
+    869: 'testicular_disruption',
+    870: 'inflamation_of_biceps',
+    872: 'bullet_wound',
+    874: 'hairline_crack_in_calfbone',
+    875: 'femoral_neck_fracture',
+    876: 'periostitis',
+    877: 'collapsed_lung',
+    878: 'internal_bleeding_in_the_thigh',
+    879: 'tooth_inflammation',
+    883: 'circulation_problems',
+    885: 'sepsis',
+    886: 'strain_of_the_patella',
+    889: 'marrow_bulge',
+    890: 'tibial_plateau_contusion',
+    892: 'malaria',
+    893: 'jumpers_knee',
+    894: 'blood_clot_in_the_lungs',
+    895: 'open_wound',
+    896: 'bruise_on_ankle',
+    901: 'hearing_impairment',
+    905: 'ulnar_fracture',
+    908: 'intraarticular_ligament_crack_in_the_ankle',
+    909: 'overstretching_of_the_syndesmotic_ligament',
+    915: 'longitudinal_crack_in_the_tendon',
+    918: 'knee_cyst',
+    919: 'bowel_surgery',
+    920: 'inflamed_head_of_fibula',
+    922: 'fracture_of_the_humerus_head',
+    923: 'cyst_on_the_paw',
+    924: 'stroke',
+    926: 'allergic_reaction',
+    927: 'bruise_on_the_shin',
+    929: 'stiffness',
+    937: 'patella_tendon_luxation',
+    944: 'varicose_veins',
+    945: 'lung_contusion',
+    947: 'bone_bruise_syndrom',
+    948: 'bruised_acromioclavicular',
+    950: 'venous_occlusion',
+    957: 'inflammation_in_spine',
+    958: 'shingles',
+    967: 'heel_cyst',
+    968: 'depression',
+    972: 'vestibular_disorder',
+    974: 'splenic_infarct',
+    978: 'swine_flu',
+    982: 'pancratitis',
+    983: 'basal_skull_fracture',
+    984: 'partial_demolition_of_the_plantar_fascia',
+    985: 'coma',
+    986: 'hailrine_crack_in_lumbar_vertebra',
+    987: 'kidney_tumour',
+    989: 'pelvic_obliquity',
+    991: 'kidney_stone_surgery',
+    994: 'brain_haemorrhage',
+    995: 'bruised_pelvis',
+    1000: 'neuropathy',
+    1003: 'hole_in_the_eardrum',
+    1009: 'scissure',
+    1017: 'neck_bruise',
+    1020: 'hearing_trauma',
+    1043: 'corn',
+    1068: 'craze_in_the_middle_finger',
+    1083: 'coccyx_fistula',
+    1488: 'accurate_pass_percentage',
+    1489: 'treatments',
+    1490: 'man_of_match',
+    1491: 'duels_lost',
+    1492: 'promotion_world_cup_play_offs',
+    1493: 'promotion_europa_league_playoffs',
+    1494: 'ranking_of_third_placed_teams',
+    1495: 'roughing',
+    1496: 'foul',
+    1497: 'argument',
+    1498: 'violent_conduct',
+    1499: 'handball',
+    1500: 'dangerous_play',
+    1501: 'time_wasting',
+    1502: 'persitent_fouling',
+    1503: 'simulation',
+    1504: 'entering_field_unallowed',
+    1505: 'professional_last_man_foul',
+    1506: 'off_the_ball_foul',
+    1507: 'penalty_scored',
+    1508: 'penalty_shot_off_target',
+    1509: 'penalty_saved_by_goalkeeper',
+    1510: 'hit_the_post',
+    1511: 'holding',
+    1512: 'goal_disallowed',
+    1513: 'elbowing',
+    1514: 'offside',
+    1515: 'diving',
+    1516: 'tripping',
+    1517: 'handling',
+    1518: 'taking_of_shirt',
+    1519: 'free_kick',
+    1520: 'long_distance_shot',
+    1521: 'left_foot_shot',
+    1522: 'right_foot_shot',
+    1523: 'tactical_sub',
+    1524: 'sub_because_of_injury',
+    1525: 'current',
+    1526: 'goal_difference_goals_scored',
+    1527: 'counter_attacks',
+    1533: 'successful_crosses_percentage',
+    1535: 'goalkeeper_goals_conceded',
+    1584: 'accurate_passes_percentage',
+    1585: 'corners_over_under_10_5_probability',
+    1600: 'penalty_topscorer',
+    1601: 'missed_penalty_topscorer',
+    1604: '9th_12th_place_play_offs',
+    1605: 'successful_dribbles_percentage',
+    1675: 'highlight',
+    1677: 'shots',
+    1678: 'head_to_head_ranking_prev_stage',
+    1679: 'over_under_4_5_probability',
+    1680: 'split_points_up_rule',
+    1682: 'doubtful',
+    1683: 'corners_over_under_5_probability',
+    1684: 'corners_over_under_11_probability',
+    1685: 'corners_over_under_6_probability',
+    1686: 'corners_over_under_7_probability',
+    1687: 'corners_over_under_9_probability',
+    1688: 'corners_over_under_10_probability',
+    1689: 'corners_over_under_8_probability',
+    1690: 'corners_over_under_4_probability',
+    1692: 'suspension',
+    1693: 'not_available',
+    1694: 'header',
+    1695: 'shot',
+}
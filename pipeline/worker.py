@@ -0,0 +1,263 @@
+"""
+A long-running worker that polls every live match from one container process,
+as an alternative to a schedule, Step Functions run and Lambda invocation per match per minute.
+It picks up matches from the match table by match_date, polls each with asyncio at a cadence
+set by its state (see match_state.get_poll_interval), and writes through the same transform
+and load code as the Lambda.
+The type map, a pool of database connections, the API connections and each match's
+fingerprint and processed events stay in memory between polls, so there are no cold starts.
+A match is retired once its game is over, at full time, or MAX_MATCH_HOURS after kick off.
+"""
+
+from argparse import ArgumentParser
+from datetime import datetime, timedelta, timezone
+from http.client import HTTPSConnection
+from json import dumps
+from os import environ as ENV
+from time import time
+import asyncio
+import logging
+
+from psycopg2 import InterfaceError, OperationalError
+from psycopg2.extensions import connection
+from psycopg2.pool import ThreadedConnectionPool
+
+from extract import run_extract
+from match_state import DEFAULT_POLL_SECONDS, get_poll_interval
+from metrics import start_run, add_metric, set_metric, finish_run
+from pipeline import get_transform_engine, process_fixture_if_changed
+from scrape_matchday import ConnectionPool, RateLimiter, get_next_poll
+
+logger = logging.getLogger(__name__)
+
+API_HOST = "api.sportmonks.com"
+MAX_MATCH_HOURS = 3
+
+
+def create_db_pool(size: int) -> ThreadedConnectionPool:
+    """Returns a pool of up to size connections to the database, shared by every match."""
+
+    return ThreadedConnectionPool(
+        1, size,
+        host=ENV["DB_HOST"],
+        dbname=ENV["DB_NAME"],
+        user=ENV["DB_USER"],
+        password=ENV["DB_PASS"],
+        port=ENV["DB_PORT"]
+    )
+
+
+def get_active_matches(db_conn: connection, now: datetime,
+                       hours: float = MAX_MATCH_HOURS) -> dict[int, datetime]:
+    """
+    Returns the kick off of each match that started in the last hours, by match_id.
+    match_date is stored in UTC without a time zone.
+    """
+
+    now = now.astimezone(timezone.utc).replace(tzinfo=None)
+    with db_conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT match_id, match_date FROM match WHERE match_date <= %s AND match_date > %s",
+            (now, now - timedelta(hours=hours)))
+        rows = cursor.fetchall()
+    db_conn.rollback()
+
+    return {match_id: match_date.replace(tzinfo=timezone.utc) for match_id, match_date in rows}
+
+
+def is_game_over(result: dict) -> bool:
+    """Returns True once a match's output says its game is over."""
+
+    return isinstance(result["flags"], dict) and result["flags"]["game_over"]
+
+
+def send_goal_notifications(result: dict) -> None:
+    """
+    Invokes the notification Lambda with a match's output when it has new goals,
+    as Step Functions does after each pipeline run. Does nothing without NOTIFICATION_LAMBDA.
+    """
+
+    if not ENV.get("NOTIFICATION_LAMBDA") or not isinstance(result["flags"], dict) \
+            or not result["flags"]["goal_check"]:
+        return
+
+    import boto3  # pylint: disable=import-outside-toplevel
+    boto3.client("lambda").invoke(FunctionName=ENV["NOTIFICATION_LAMBDA"],
+                                  InvocationType="Event", Payload=dumps(result, default=str))
+    logger.info("Sent %s new goals of %s to be notified.",
+                len(result["flags"]["goal_check"]), result["match_id"])
+
+
+class Worker:
+    """
+    Polls every active match until its game is over.
+    interval is the seconds between polls at the default cadence,
+    which the match's state shortens or lengthens.
+    """
+
+    def __init__(self, api_pool: ConnectionPool, db_pool: ThreadedConnectionPool,
+                 limiter: RateLimiter, *, interval: float = 60, jitter: float = 5,
+                 clock=time):
+        self.api_pool = api_pool
+        self.db_pool = db_pool
+        self.limiter = limiter
+        self.interval = interval
+        self.jitter = jitter
+        self.clock = clock
+        self.df_map = None
+        self.tasks: dict[int, asyncio.Task] = {}
+        self.retired: set[int] = set()
+
+        if get_transform_engine() == "pandas":
+            from transform import get_compiled_type_mapping  # pylint: disable=import-outside-toplevel
+            self.df_map = get_compiled_type_mapping()
+
+    def run_with_db_connection(self, function):
+        """Returns function(db_conn) on a pooled connection, discarding it if it broke."""
+
+        db_conn = self.db_pool.getconn()
+        try:
+            result = function(db_conn)
+        except (InterfaceError, OperationalError):
+            self.db_pool.putconn(db_conn, close=True)
+            raise
+        self.db_pool.putconn(db_conn)
+        return result
+
+    def poll_once(self, match_id: int,
+                  api_conn: HTTPSConnection) -> tuple[dict | None, float | None]:
+        """
+        Extracts, transforms and loads a match once, returning its output,
+        or None if the request failed, and the seconds until its next poll,
+        or None at full time.
+        """
+
+        raw_data = run_extract(match_id, ENV["TOKEN"], api_conn)
+        if not isinstance(raw_data.get("data"), dict):
+            logger.info("%s request failed: %s.", match_id, raw_data.get("reason"))
+            add_metric("failed_polls", 1)
+            return None, self.interval
+
+        result = self.run_with_db_connection(
+            lambda db_conn: process_fixture_if_changed(
+                raw_data["data"], match_id, db_conn, self.df_map))
+
+        poll_seconds = get_poll_interval(raw_data["data"])
+        if poll_seconds is None:
+            return result, None
+        return result, self.interval * poll_seconds / DEFAULT_POLL_SECONDS
+
+    async def poll_match(self, match_id: int, kick_off: datetime) -> None:
+        """
+        Polls a match at the cadence its state asks for, aligned to the clock,
+        until it is retired.
+        """
+
+        retire_at = kick_off.timestamp() + MAX_MATCH_HOURS * 3600
+
+        while self.clock() < retire_at:
+            await self.limiter.wait()
+            try:
+                result, poll_seconds = await self.api_pool.request(
+                    lambda api_conn: self.poll_once(match_id, api_conn))
+                add_metric("polls", 1)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error("Polling %s failed: %s.", match_id, e)
+                add_metric("failed_polls", 1)
+                result, poll_seconds = None, self.interval
+
+            if result is not None:
+                await asyncio.to_thread(send_goal_notifications, result)
+                if is_game_over(result):
+                    logger.info("%s is over.", match_id)
+                    break
+
+            if poll_seconds is None:
+                logger.info("%s is at full time.", match_id)
+                break
+
+            await asyncio.sleep(max(get_next_poll(self.clock(), poll_seconds, self.jitter)
+                                    - self.clock(), 0))
+
+        self.retired.add(match_id)
+        logger.info("Retired %s.", match_id)
+
+    async def refresh(self) -> None:
+        """Starts polling every active match not already being polled or retired."""
+
+        now = datetime.fromtimestamp(self.clock(), timezone.utc)
+        matches = await asyncio.to_thread(
+            self.run_with_db_connection, lambda db_conn: get_active_matches(db_conn, now))
+
+        for match_id in [match_id for match_id, task in self.tasks.items() if task.done()]:
+            del self.tasks[match_id]
+        self.retired &= set(matches)
+
+        for match_id, kick_off in matches.items():
+            if match_id not in self.tasks and match_id not in self.retired:
+                logger.info("Picked up %s.", match_id)
+                self.tasks[match_id] = asyncio.create_task(self.poll_match(match_id, kick_off))
+
+        set_metric("active_matches", len(self.tasks))
+
+    async def run(self, refresh_seconds: float = 60, cycles: int = None) -> None:
+        """
+        Refreshes the active matches every refresh_seconds, printing each cycle's metrics,
+        forever or for the given number of cycles.
+        """
+
+        cycle = 0
+        while cycles is None or cycle < cycles:
+            start_run("pipeline", handler="worker")
+            try:
+                await self.refresh()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error("Refreshing active matches failed: %s.", e)
+
+            await asyncio.sleep(refresh_seconds)
+            finish_run()
+            cycle += 1
+
+        await asyncio.gather(*self.tasks.values())
+
+
+async def run_worker(*, pool_size: int = 4, db_pool_size: int = 4,
+                     requests_per_minute: float = 50, jitter: float = 5,
+                     factory=HTTPSConnection) -> None:
+    """Runs the worker until it is stopped."""
+
+    api_pool = ConnectionPool(API_HOST, pool_size, factory)
+    db_pool = create_db_pool(db_pool_size)
+    worker = Worker(api_pool, db_pool, RateLimiter(requests_per_minute), jitter=jitter)
+
+    try:
+        await worker.run()
+    finally:
+        api_pool.close()
+        db_pool.closeall()
+
+
+def main() -> None:
+    """Runs the worker with the options given on the command line."""
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--pool-size", type=int, default=4,
+                        help="API connections shared by every match")
+    parser.add_argument("--db-pool-size", type=int, default=4,
+                        help="most database connections shared by every match")
+    parser.add_argument("--rate", type=float, default=50,
+                        help="most requests per minute across every match")
+    parser.add_argument("--jitter", type=float, default=5,
+                        help="most seconds each poll is delayed past the minute")
+    args = parser.parse_args()
+
+    asyncio.run(run_worker(pool_size=args.pool_size, db_pool_size=args.db_pool_size,
+                           requests_per_minute=args.rate, jitter=args.jitter))
+
+
+if __name__ == "__main__":
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    main()
@@ -0,0 +1,85 @@
+"""
+Per-run metrics for a Lambda handler.
+A run's metrics are printed as one JSON line in CloudWatch Embedded Metric Format,
+which CloudWatch Logs turns into metrics, and returned for the handler's result.
+The same module is copied into each service that reports metrics.
+"""
+
+from contextlib import contextmanager
+from json import dumps
+from time import perf_counter, time
+
+NAMESPACE = "c17-football"
+
+RUN = {"service": None, "started": None, "properties": {}, "values": {}, "units": {}}
+
+
+def start_run(service: str, **properties) -> None:
+    """Starts a new run, discarding any metrics recorded before it."""
+
+    RUN["service"] = service
+    RUN["started"] = perf_counter()
+    RUN["properties"] = properties
+    RUN["values"] = {}
+    RUN["units"] = {}
+
+
+def add_metric(name: str, value: float, unit: str = "Count") -> None:
+    """Adds to a metric of the current run, so repeated stages are summed."""
+
+    RUN["values"][name] = RUN["values"].get(name, 0) + value
+    RUN["units"][name] = unit
+
+
+def set_metric(name: str, value: float, unit: str = "Count") -> None:
+    """Sets a metric of the current run, for levels such as quota left, where the last value counts."""
+
+    RUN["values"][name] = value
+    RUN["units"][name] = unit
+
+
+@contextmanager
+def timed(name: str):
+    """Adds the time taken by the block to a metric of the current run, in milliseconds."""
+
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        add_metric(name, (perf_counter() - start) * 1000, "Milliseconds")
+
+
+def get_metrics() -> dict:
+    """Returns the metrics of the current run."""
+
+    return {name: round(value, 3) for name, value in RUN["values"].items()}
+
+
+def build_emf_record(metrics: dict) -> dict:
+    """Returns the metrics as a CloudWatch Embedded Metric Format record."""
+
+    return {
+        "_aws": {
+            "Timestamp": int(time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": NAMESPACE,
+                "Dimensions": [["Service"]],
+                "Metrics": [{"Name": name, "Unit": RUN["units"][name]}
+                            for name in metrics]
+            }]
+        },
+        "Service": RUN["service"],
+        **{key: str(value) for key, value in RUN["properties"].items()},
+        **metrics
+    }
+
+
+def finish_run() -> dict:
+    """Records the total time of the run, prints its EMF line and returns its metrics."""
+
+    if RUN["started"] is not None:
+        add_metric("total_ms", (perf_counter() - RUN["started"]) * 1000, "Milliseconds")
+
+    metrics = get_metrics()
+    print(dumps(build_emf_record(metrics)), flush=True)
+    return metrics
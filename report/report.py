@@ -1,18 +1,27 @@
+"""
+Generates and uploads the match report.
+xhtml2pdf and boto3 are only imported once the report has been generated,
+so a failed generation does not pay for them.
+"""
+from __future__ import annotations
+
 import logging
 from os import makedirs, environ as ENV
 from os.path import join
-
-from dotenv import load_dotenv
-from xhtml2pdf import pisa
-from boto3 import client
-from botocore.exceptions import ClientError
+from typing import TYPE_CHECKING
 
 from report_commentary import generate_match_report
 from html_report import generate_html
+from metrics import start_run, timed, finish_run
+from profiling import profile_handler
+
+if TYPE_CHECKING:
+    from botocore.client import BaseClient
 
 
-def connect_to_s3_client(config) -> client:
+def connect_to_s3_client(config) -> BaseClient:
     """Connects to the S3 bucket."""
+    from boto3 import client  # pylint: disable=import-outside-toplevel
     return client("s3",  aws_access_key_id=config["AWS_ACCESS_KEY_ID"],
                   aws_secret_access_key=config["AWS_SECRET_ACCESS_KEY"],
                   aws_session_token=config["AWS_SESSION_TOKEN"])
@@ -20,6 +29,7 @@ def connect_to_s3_client(config) -> client:
 
 def upload_file(config: dict, local_path: str, s3_name: str) -> bool:
     """Upload a file to an S3 bucket."""
+    from botocore.exceptions import ClientError  # pylint: disable=import-outside-toplevel
 
     s3_client = connect_to_s3_client(config)
 
@@ -34,6 +44,7 @@ def upload_file(config: dict, local_path: str, s3_name: str) -> bool:
 
 def html_to_pdf(html_content: str, output_path: str) -> bool:
     """Convert HTML to PDF using xhtml2pdf."""
+    from xhtml2pdf import pisa  # pylint: disable=import-outside-toplevel
     try:
         with open(output_path, "wb") as result_file:
             pdf = pisa.CreatePDF(html_content, dest=result_file)
@@ -52,38 +63,46 @@ def generate_complete_report(config: dict, match_id: int, output_dir: str) -> di
     report = generate_match_report(config, match_id)
 
     logging.info("Creating HTML report...")
-    html_content = generate_html(report)
+    with timed("html_ms"):
+        html_content = generate_html(report)
 
     logging.info("Converting to PDF...")
     pdf_filename = f"match_{match_id}_report.pdf"
     pdf_path = join(output_dir, pdf_filename)
-    pdf_success = html_to_pdf(html_content, pdf_path)
+    with timed("pdf_ms"):
+        pdf_success = html_to_pdf(html_content, pdf_path)
     if pdf_success:
-        upload_file(config, pdf_path, f"reports/{pdf_filename}")
+        with timed("upload_ms"):
+            upload_file(config, pdf_path, f"reports/{pdf_filename}")
 
 
-def lambda_handler(event, context) -> None:
+@profile_handler
+def lambda_handler(event, context) -> dict:
     """
     AWS Lambda handler function.
 
     Args:
         event: Lambda event data
         context: Lambda context object
-    """
-    load_dotenv()
 
+    Returns:
+        Dictionary with the run's metrics
+    """
     match_id = event["match_id"]
     if not match_id:
         raise ValueError("match_id is required in the event")
 
+    start_run("report", match_id=match_id)
     generate_complete_report(
         ENV,
         match_id,
         output_dir="/tmp/reports",
     )
+    return {"metrics": finish_run()}
 
 
 if __name__ == "__main__":
+    from dotenv import load_dotenv
     load_dotenv()
 
     match_id = 19367880
@@ -5,6 +5,7 @@ from openai import OpenAI
 import pandas as pd
 
 from report_data import get_match_data
+from metrics import timed
 
 
 class MatchEvent(BaseModel):
@@ -102,7 +103,8 @@ def generate_match_report(config: dict, match_id: int) -> MatchReport:
     """Generate AI-powered match report."""
     client = get_openai_client(config)
 
-    match_data = get_match_data(config, match_id)
+    with timed("data_ms"):
+        match_data = get_match_data(config, match_id)
     match_info = match_data['match_info']
 
     stats_data = pd.DataFrame(match_data['match_stats'])
@@ -110,15 +112,16 @@ def generate_match_report(config: dict, match_id: int) -> MatchReport:
 
     prompt = create_match_analysis_prompt(
         match_info, stats_data, events_data)
-    chat_completion = client.beta.chat.completions.parse(
-        messages=[
-            {"role": "system", "content": "You are an expert football commentator and analyst. Generate engaging match reports with insightful commentary using only the stats provided."},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.2,
-        model="gpt-4.1-nano",
-        response_format=MatchReport,
-    )
+    with timed("ai_ms"):
+        chat_completion = client.beta.chat.completions.parse(
+            messages=[
+                {"role": "system", "content": "You are an expert football commentator and analyst. Generate engaging match reports with insightful commentary using only the stats provided."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.2,
+            model="gpt-4.1-nano",
+            response_format=MatchReport,
+        )
 
     try:
         return MatchReport.model_validate(json.loads(chat_completion.choices[0].message.content))
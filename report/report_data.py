@@ -3,6 +3,8 @@ from psycopg2 import connect
 from psycopg2.extras import RealDictCursor
 from psycopg2.extensions import connection
 
+from resources import get_cached_db_connection
+
 
 def get_db_connection(config: dict) -> connection:
     """Creates and returns a connection to the PostgreSQL
@@ -63,19 +65,23 @@ def get_match_data(config: dict, match_id: int) -> dict[str]:
     ORDER BY mms.match_minute, mms.half, me.match_event_id
     """
 
-    conn = get_db_connection(config)
-    with conn.cursor() as cur:
-        cur.execute(match_query, (match_id,))
-        match_info = cur.fetchone()
+    conn = get_cached_db_connection(lambda: get_db_connection(config))
+    try:
+        with conn.cursor() as cur:
+            cur.execute(match_query, (match_id,))
+            match_info = cur.fetchone()
+
+            if not match_info:
+                raise ValueError(f"Match with ID {match_id} not found")
 
-        if not match_info:
-            raise ValueError(f"Match with ID {match_id} not found")
+            cur.execute(stats_query, (match_id,))
+            match_stats = cur.fetchall()
 
-        cur.execute(stats_query, (match_id,))
-        match_stats = cur.fetchall()
+            cur.execute(events_query, (match_id,))
+            match_events = cur.fetchall()
+    finally:
+        conn.rollback()
 
-        cur.execute(events_query, (match_id,))
-        match_events = cur.fetchall()
     return {
         'match_info': dict(match_info),
         'match_stats': [dict(stat) for stat in match_stats],
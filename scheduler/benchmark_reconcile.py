@@ -0,0 +1,103 @@
+"""
+Measures creating a matchday's schedules against the fake Scheduler API, one request at a time
+with create_match_schedule against reconcile_schedules on its thread pool,
+then reconciling again after some kick offs move and some fixtures are postponed.
+Each request takes --latency seconds, and with --rate the API throttles requests over it per second.
+"""
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from fake_scheduler import FakeScheduler
+from reconcile import reconcile_schedules, WORKERS
+from scheduler import build_match_schedule, create_match_schedule
+
+PREFIX = "c17-football"
+GROUP = f"{PREFIX}-2025-06-13-fixtures"
+CONFIG = {"TARGET_ARN": "arn:aws:lambda:eu-west-2:000000000000:function:pipeline",
+          "ROLE_ARN": "arn:aws:iam::000000000000:role/scheduler"}
+
+
+def build_matches(count: int) -> list[dict]:
+    """Returns count synthetic matches, kicking off every 15 minutes from noon."""
+
+    return [{"match_id": match_id, "fixture_name": f"Team {match_id} vs Team {match_id + 1}",
+             "start_time": f"2025-06-13 {12 + match_id % 10:02d}:{15 * (match_id % 4):02d}:00"}
+            for match_id in range(count)]
+
+
+def create_one_at_a_time(fake: FakeScheduler, matches: list[dict]) -> None:
+    """Creates every match's schedule one request at a time, as process_daily_schedules did."""
+
+    scheduler_client = fake.connect()
+    for match in matches:
+        create_match_schedule(scheduler_client, match, GROUP, CONFIG, PREFIX)
+
+
+def reconcile(fake: FakeScheduler, matches: list[dict], workers: int,
+              pace: float = None) -> dict[str, int]:
+    """Reconciles the group with every match's schedule on the thread pool."""
+
+    return reconcile_schedules(
+        fake.connect(workers), GROUP, f"{PREFIX}-",
+        [build_match_schedule(match, GROUP, CONFIG, PREFIX) for match in matches],
+        workers=workers, requests_per_second=pace)
+
+
+def run(function, fake: FakeScheduler, *args) -> tuple[float, int]:
+    """Returns the seconds taken by function and the requests it made."""
+
+    requests = len(fake.requests)
+    start = perf_counter()
+    function(fake, *args)
+    return perf_counter() - start, len(fake.requests) - requests
+
+
+def main() -> None:
+    """Prints the time and requests of each way of scheduling the matchday."""
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--fixtures", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="seconds each request takes")
+    parser.add_argument("--rate", type=int, help="most requests per second before throttling")
+    parser.add_argument("--pace", type=float,
+                        help="requests per second the reconciler spreads its requests to")
+    parser.add_argument("--moved", type=int, default=50, help="kick offs moved before rerunning")
+    parser.add_argument("--postponed", type=int, default=20,
+                        help="fixtures postponed before rerunning")
+    args = parser.parse_args()
+
+    matches = build_matches(args.fixtures)
+    moved = [{**match, "start_time": f"2025-06-13 {int(match["start_time"][11:13]) + 1}"
+                                     f"{match["start_time"][13:]}"}
+             for match in matches[:args.moved]]
+    rerun = moved + matches[args.moved:len(matches) - args.postponed]
+
+    print(f"{'run':<34}{'seconds':>9}{'requests':>10}{'throttled':>11}")
+    with FakeScheduler(args.latency, args.rate) as fake:
+        fake.groups[GROUP] = {}
+        seconds, requests = run(create_one_at_a_time, fake, matches)
+        print(f"{'create one at a time':<34}{seconds:>9.2f}{requests:>10}{fake.throttled:>11}")
+
+    with FakeScheduler(args.latency, args.rate) as fake:
+        fake.groups[GROUP] = {}
+        seconds, requests = run(reconcile, fake, matches, args.workers, args.pace)
+        print(f"{f'reconcile, {args.workers} workers':<34}{seconds:>9.2f}{requests:>10}"
+              f"{fake.throttled:>11}")
+
+        throttled = fake.throttled
+        seconds, requests = run(reconcile, fake, rerun, args.workers, args.pace)
+        print(f"{f'rerun, {args.moved} moved, {args.postponed} postponed':<34}{seconds:>9.2f}"
+              f"{requests:>10}{fake.throttled - throttled:>11}")
+        print(f"rerun left {len(fake.groups[GROUP])} schedules, "
+              f"{sum(schedule["StartDate"] != build_match_schedule(match, GROUP, CONFIG, PREFIX)
+                     ["StartDate"].timestamp()
+                     for match in rerun
+                     for schedule in [fake.groups[GROUP][f"{PREFIX}-{match["match_id"]}"]])}"
+              " with the wrong kick off")
+
+
+if __name__ == "__main__":
+    main()
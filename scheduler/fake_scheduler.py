@@ -0,0 +1,212 @@
+"""
+A local stand-in for the EventBridge Scheduler API, for testing and benchmarking schedule
+changes without an AWS account. It keeps schedule groups and schedules in memory and
+answers a boto3 scheduler client over HTTP on localhost, with an optional latency per
+request, and ThrottlingException once more than rate requests are made in a second.
+It can also be told to fail the next requests with given errors.
+"""
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from json import dumps, loads
+from threading import Thread, Lock
+from time import monotonic, sleep
+from urllib.parse import parse_qs, unquote, urlparse
+
+from boto3 import client
+from botocore.config import Config
+
+from reconcile import WORKERS
+
+PAGE_SIZE = 100
+ERROR_STATUSES = {"ThrottlingException": 429, "InternalServerException": 500,
+                  "ConflictException": 409, "ResourceNotFoundException": 404,
+                  "ValidationException": 400}
+
+
+class FakeSchedulerHandler(BaseHTTPRequestHandler):
+    """Answers requests from the FakeScheduler it belongs to."""
+
+    def handle_request(self):
+        """Sends the fake API's response to the request."""
+
+        length = int(self.headers.get("Content-Length") or 0)
+        body = loads(self.rfile.read(length)) if length else {}
+
+        status, response, headers = self.server.fake.handle(self.command, self.path, body)
+        data = dumps(response).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_DELETE = handle_request
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Keeps test output quiet."""
+
+
+class FakeSchedulerServer(ThreadingHTTPServer):
+    """Serves each request on its own thread, queueing the connections of a whole thread pool."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def build_error(status: int, code: str, message: str) -> tuple[int, dict, dict]:
+    """Returns an error response the way the API sends it."""
+
+    return status, {"Message": message}, {"x-amzn-ErrorType": code}
+
+
+class FakeScheduler:
+    """
+    A fake EventBridge Scheduler API.
+    Use it as a context manager, and get a boto3 client for it with connect().
+    """
+
+    def __init__(self, latency: float = 0, rate: int = None):
+        self.latency = latency
+        self.rate = rate
+        self.groups: dict[str, dict[str, dict]] = {}
+        self.requests: list[tuple[str, str]] = []
+        self.throttled = 0
+        self.failures: list[str] = []
+        self.window = (0, 0)
+        self.lock = Lock()
+
+        self.server = FakeSchedulerServer(("127.0.0.1", 0), FakeSchedulerHandler)
+        self.server.fake = self
+        self.thread = Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def port(self) -> int:
+        """The port the fake API is listening on."""
+        return self.server.server_address[1]
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def connect(self, max_pool_connections: int = WORKERS) -> client:
+        """Returns a boto3 scheduler client for the fake API, which does not retry itself."""
+
+        return client("scheduler", endpoint_url=f"http://127.0.0.1:{self.port}",
+                      region_name="eu-west-2", aws_access_key_id="fake-key",
+                      aws_secret_access_key="fake-secret",
+                      config=Config(max_pool_connections=max_pool_connections,
+                                    retries={"total_max_attempts": 1}))
+
+    def fail_next(self, *codes: str) -> None:
+        """Makes the next requests fail with these error codes, in order."""
+        self.failures.extend(codes)
+
+    def is_throttled(self) -> bool:
+        """Counts a request against this second's rate, returning True if it is over it."""
+
+        second = int(monotonic())
+        count = self.window[1] + 1 if self.window[0] == second else 1
+        self.window = (second, count)
+        return self.rate is not None and count > self.rate
+
+    def handle(self, method: str, path: str, body: dict) -> tuple[int, dict, dict]:
+        """Returns the status, body and headers for a request."""
+
+        if self.latency:
+            sleep(self.latency)
+
+        url = urlparse(path)
+        parts = [unquote(part) for part in url.path.strip("/").split("/")]
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+
+        with self.lock:
+            self.requests.append((method, url.path))
+            if self.failures:
+                code = self.failures.pop(0)
+                return build_error(ERROR_STATUSES[code], code, "Fake failure.")
+
+            if self.is_throttled():
+                self.throttled += 1
+                return build_error(429, "ThrottlingException", "Rate exceeded.")
+
+            if parts[0] == "schedule-groups":
+                return self.handle_group(method, parts[1] if len(parts) > 1 else None, query)
+            if parts[0] == "schedules":
+                return self.handle_schedule(method, parts[1] if len(parts) > 1 else None,
+                                            query, body)
+            return build_error(404, "ResourceNotFoundException", "Unknown resource.")
+
+    def handle_group(self, method: str, name: str | None,
+                     query: dict) -> tuple[int, dict, dict]:
+        """Creates, lists and deletes schedule groups."""
+
+        if method == "GET" and name is None:
+            groups = [{"Name": group, "State": "ACTIVE"} for group in self.groups
+                      if group.startswith(query.get("NamePrefix", ""))]
+            return 200, {"ScheduleGroups": groups}, {}
+
+        if method == "POST":
+            if name in self.groups:
+                return build_error(409, "ConflictException", f"{name} already exists.")
+            self.groups[name] = {}
+            return 200, {"ScheduleGroupArn": f"arn:fake:schedule-group/{name}"}, {}
+
+        if method == "DELETE" and name in self.groups:
+            del self.groups[name]
+            return 200, {}, {}
+
+        return build_error(404, "ResourceNotFoundException", f"{name} does not exist.")
+
+    def handle_schedule(self, method: str, name: str | None, query: dict,
+                        body: dict) -> tuple[int, dict, dict]:
+        """Creates, reads, updates, lists and deletes schedules."""
+
+        group_name = body.get("GroupName") or query.get("groupName") \
+            or query.get("ScheduleGroup") or "default"
+        schedules = self.groups.setdefault(group_name, {}) if group_name == "default" \
+            else self.groups.get(group_name)
+        if schedules is None:
+            return build_error(404, "ResourceNotFoundException", f"{group_name} does not exist.")
+
+        if method == "GET" and name is None:
+            return 200, self.list_schedules(schedules, group_name, query), {}
+
+        if method == "POST":
+            if name in schedules:
+                return build_error(409, "ConflictException", f"{name} already exists.")
+            schedules[name] = {**body, "Name": name, "GroupName": group_name}
+            return 200, {"ScheduleArn": f"arn:fake:schedule/{group_name}/{name}"}, {}
+
+        if name not in schedules:
+            return build_error(404, "ResourceNotFoundException", f"{name} does not exist.")
+
+        if method == "GET":
+            return 200, schedules[name], {}
+        if method == "PUT":
+            schedules[name] = {**body, "Name": name, "GroupName": group_name}
+            return 200, {"ScheduleArn": f"arn:fake:schedule/{group_name}/{name}"}, {}
+
+        del schedules[name]
+        return 200, {}, {}
+
+    @staticmethod
+    def list_schedules(schedules: dict[str, dict], group_name: str, query: dict) -> dict:
+        """Returns a page of the schedule summaries in a group, and the token of the next."""
+
+        names = [name for name in schedules if name.startswith(query.get("NamePrefix", ""))]
+        start = int(query.get("NextToken", 0))
+        page_size = int(query.get("MaxResults", PAGE_SIZE))
+
+        page = {"Schedules": [{"Name": name, "GroupName": group_name,
+                               "State": schedules[name].get("State", "ENABLED")}
+                              for name in names[start:start + page_size]]}
+        if start + page_size < len(names):
+            page["NextToken"] = str(start + page_size)
+        return page
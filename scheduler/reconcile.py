@@ -0,0 +1,191 @@
+"""
+Reconciles the schedules in a schedule group with the schedules wanted for its fixtures.
+Lists the group's existing schedules, diffs them against the wanted ones, and creates,
+updates (when a kick off moves) and deletes (when a fixture is postponed) only what changed.
+Requests run on a bounded thread pool, optionally paced to the account's request quota,
+and throttled or failed requests are retried with backoff, so a matchday of hundreds
+of fixtures is not spent waiting on one request at a time.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from random import uniform
+from time import sleep
+import logging
+
+from boto3 import client
+from botocore.exceptions import (BotoCoreError, ClientError, HTTPClientError,
+                                 ConnectionError as EndpointError)
+
+from sportmonks import TokenBucket
+
+WORKERS = 16
+MAX_RETRIES = 5
+BASE_DELAY = 0.5
+MAX_DELAY = 10.0
+RETRY_ERRORS = {"ThrottlingException", "InternalServerException"}
+
+
+def get_error_code(error: ClientError) -> str:
+    """Returns the API's error code of a failed request."""
+    return error.response.get("Error", {}).get("Code", "")
+
+
+def call_with_retries(request, max_retries: int = MAX_RETRIES,
+                      bucket: TokenBucket = None) -> tuple[dict, int]:
+    """
+    Returns request()'s response and the number of retries it took.
+    Throttled and server errors, and dropped connections, are retried
+    with full jitter backoff, up to max_retries times.
+    With a bucket, each attempt first waits for a token from it.
+    """
+
+    attempt = 0
+    while True:
+        if bucket is not None:
+            sleep(bucket.take(float("inf")))
+        try:
+            return request(), attempt
+        except ClientError as e:
+            if get_error_code(e) not in RETRY_ERRORS or attempt == max_retries:
+                raise
+        except (EndpointError, HTTPClientError):
+            if attempt == max_retries:
+                raise
+        sleep(uniform(0, min(MAX_DELAY, BASE_DELAY * 2 ** attempt)))
+        attempt += 1
+
+
+def list_schedule_names(scheduler_client: client, group_name: str, name_prefix: str) -> list[str]:
+    """Returns the names of the schedules in a group starting with name_prefix."""
+
+    paginator = scheduler_client.get_paginator("list_schedules")
+    return [schedule["Name"]
+            for page in paginator.paginate(GroupName=group_name, NamePrefix=name_prefix)
+            for schedule in page["Schedules"]]
+
+
+def get_existing_schedule(scheduler_client: client, name: str, group_name: str, *,
+                          max_retries: int = MAX_RETRIES,
+                          bucket: TokenBucket = None) -> tuple[dict | None, int]:
+    """
+    Returns a listed schedule and the retries getting it took,
+    or None if it has been deleted since it was listed.
+    """
+
+    try:
+        return call_with_retries(
+            lambda: scheduler_client.get_schedule(Name=name, GroupName=group_name),
+            max_retries, bucket)
+    except ClientError as e:
+        if get_error_code(e) != "ResourceNotFoundException":
+            raise
+        return None, 0
+
+
+def get_schedule_changes(wanted: dict[str, dict],
+                         existing: dict[str, dict]) -> dict[str, list[str]]:
+    """
+    Returns the names of the schedules to create, update and delete,
+    given the wanted and existing schedules by name. A schedule is updated
+    when its start date, and so its fixture's kick off, has moved.
+    """
+
+    return {
+        "create": [name for name in wanted if name not in existing],
+        "update": [name for name in wanted if name in existing
+                   and existing[name].get("StartDate") != wanted[name]["StartDate"]],
+        "delete": [name for name in existing if name not in wanted]
+    }
+
+
+def apply_change(scheduler_client: client, action: str, name: str, group_name: str,
+                 schedule: dict = None, *, max_retries: int = MAX_RETRIES,
+                 bucket: TokenBucket = None) -> tuple[str, int]:
+    """
+    Creates, updates or deletes a schedule, returning the action taken and its retries.
+    A schedule created since it was listed is updated, one deleted since is created,
+    and one already deleted is left alone.
+    """
+
+    requests = {
+        "create": lambda: scheduler_client.create_schedule(**schedule),
+        "update": lambda: scheduler_client.update_schedule(**schedule),
+        "delete": lambda: scheduler_client.delete_schedule(Name=name, GroupName=group_name)
+    }
+    fallbacks = {("create", "ConflictException"): "update",
+                 ("update", "ResourceNotFoundException"): "create",
+                 ("delete", "ResourceNotFoundException"): None}
+
+    try:
+        _, retries = call_with_retries(requests[action], max_retries, bucket)
+        return action, retries
+    except ClientError as e:
+        if (action, get_error_code(e)) not in fallbacks:
+            raise
+        fallback = fallbacks[(action, get_error_code(e))]
+        if fallback is None:
+            return action, 0
+        return apply_change(scheduler_client, fallback, name, group_name, schedule,
+                            max_retries=max_retries, bucket=bucket)
+
+
+def reconcile_schedules(scheduler_client: client, group_name: str, name_prefix: str,
+                        wanted: list[dict], *, workers: int = WORKERS,
+                        max_retries: int = MAX_RETRIES,
+                        requests_per_second: float = None) -> dict[str, int]:
+    """
+    Makes the schedules in a group starting with name_prefix match the wanted ones,
+    given as create_schedule arguments, and returns the number of schedules
+    created, updated, deleted, unchanged and failed, and the requests retried.
+    With requests_per_second, requests are spread evenly to stay under that quota.
+    A schedule deleted since it was listed is created again, and a failed schedule
+    is logged and left for the next run.
+    """
+
+    bucket = TokenBucket(1, 1 / requests_per_second) if requests_per_second else None
+    wanted = {schedule["Name"]: schedule for schedule in wanted}
+    names, retries = call_with_retries(
+        lambda: list_schedule_names(scheduler_client, group_name, name_prefix),
+        max_retries, bucket)
+    kept = [name for name in names if name in wanted]
+
+    with ThreadPoolExecutor(workers) as executor:
+        futures = {executor.submit(get_existing_schedule, scheduler_client, name, group_name,
+                                   max_retries=max_retries, bucket=bucket): name
+                   for name in kept}
+        existing, failed = {}, []
+        for future, name in futures.items():
+            try:
+                schedule, get_retries = future.result()
+            except (ClientError, BotoCoreError) as e:
+                logging.error("Failed to get schedule %s: %s.", name, e)
+                failed.append(name)
+                continue
+            retries += get_retries
+            if schedule is not None:
+                existing[name] = schedule
+        existing.update({name: {} for name in names if name not in wanted})
+
+        changes = get_schedule_changes(
+            {name: schedule for name, schedule in wanted.items() if name not in failed},
+            existing)
+        futures = {executor.submit(apply_change, scheduler_client, action, name, group_name,
+                                   wanted.get(name), max_retries=max_retries, bucket=bucket): name
+                   for action, action_names in changes.items() for name in action_names}
+
+        counts = {"created": 0, "updated": 0, "deleted": 0, "failed": len(failed),
+                  "retries": retries}
+        for future, name in futures.items():
+            try:
+                action, retries = future.result()
+            except (ClientError, BotoCoreError) as e:
+                logging.error("Failed to reconcile schedule %s: %s.", name, e)
+                counts["failed"] += 1
+                continue
+            counts[{"create": "created", "update": "updated", "delete": "deleted"}[action]] += 1
+            counts["retries"] += retries
+
+    counts["unchanged"] = (len(wanted) - len(failed)
+                           - len(changes["create"]) - len(changes["update"]))
+    logging.info("Reconciled %s schedules in %s: %s.", len(wanted), group_name, counts)
+    return counts
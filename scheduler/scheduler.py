@@ -1,37 +1,44 @@
 """Scheduler that runs daily to create schedules for tomorrow's matches."""
 from os import environ as ENV
-from json import loads, dumps
+from json import dumps
 import logging
 from http.client import HTTPSConnection
 from datetime import datetime, timedelta, timezone
 
-from dotenv import load_dotenv
 from boto3 import client
+from botocore.config import Config
+
+from metrics import start_run, add_metric, timed, finish_run
+from profiling import profile_handler
+from reconcile import reconcile_schedules, WORKERS
+from sportmonks import get_json, API_HOST
+
+# Postponed, cancelled and deleted fixtures, which are not played on their date.
+UNPLAYED_STATE_IDS = {10, 12, 20}
 
 
 def connect_to_scheduler_client(config: dict) -> client:
-    """Connects to the Eventbridge scheduler."""
+    """
+    Connects to the Eventbridge scheduler, with a connection for each reconcile worker.
+    Retries are left to reconcile.call_with_retries.
+    """
     return client("scheduler", aws_access_key_id=config["AWS_ACCESS_KEY_ID"],
                   aws_secret_access_key=config["AWS_SECRET_ACCESS_KEY"],
-                  aws_session_token=config["AWS_SESSION_TOKEN"])
+                  aws_session_token=config["AWS_SESSION_TOKEN"],
+                  config=Config(max_pool_connections=WORKERS,
+                                retries={"total_max_attempts": 1}))
 
 
 def get_all_daily_fixtures(conn: HTTPSConnection, config: dict) -> dict:
     """Get the fixtures happening tomorrow."""
     date = (datetime.now(timezone.utc) +
             timedelta(days=1)).strftime('%Y-%m-%d')
-    conn.request(
-        "GET", f"/v3/football/fixtures/date/{date}?api_token={config[
-            "API_KEY"]}&include=participants")
-    res = conn.getresponse()
-    data = res.read()
-    data_str = data.decode("utf-8")
+    response = get_json(
+        conn, f"fixtures/date/{date}?api_token={config["API_KEY"]}&include=participants")
 
-    if res.status == 200:
-        return loads(data_str)["data"]
-    return {"error": True,
-            "status": res.status,
-            "reason": res.reason}
+    if "error" in response:
+        return response
+    return response["data"]
 
 
 def extract_team_data(team: dict, prefix: str) -> dict:
@@ -61,9 +68,10 @@ def get_single_fixture(fixture: dict) -> dict:
 
 
 def get_data_from_fixtures(conn: HTTPSConnection, config: dict) -> list[dict]:
-    """Get today's fixtures and extract relevant data."""
+    """Get tomorrow's fixtures and extract relevant data, skipping postponed fixtures."""
     fixtures = get_all_daily_fixtures(conn, config)
-    return [get_single_fixture(fixture) for fixture in fixtures]
+    return [get_single_fixture(fixture) for fixture in fixtures
+            if fixture.get("state_id") not in UNPLAYED_STATE_IDS]
 
 
 def manage_schedule_groups(scheduler_client: client, current_group: str, schedule_prefix: str) -> None:
@@ -95,30 +103,37 @@ def manage_schedule_groups(scheduler_client: client, current_group: str, schedul
         logging.error("Error during group cleanup: %s.", e)
 
 
-def create_match_schedule(scheduler_client: client, match: dict,
-                          group_name: str, config: dict, schedule_prefix: str) -> None:
-    """Create a single match schedule."""
+def build_match_schedule(match: dict, group_name: str, config: dict,
+                         schedule_prefix: str) -> dict:
+    """Build the create_schedule arguments of a single match schedule."""
     start_time = datetime.strptime(
         match["start_time"], "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
     end_time = start_time + timedelta(hours=3)
 
-    schedule_name = f"{schedule_prefix}-{match["match_id"]}"
+    return {
+        "Name": f"{schedule_prefix}-{match["match_id"]}",
+        "GroupName": group_name,
+        "ScheduleExpression": 'cron(* * * * ? *)',
+        "StartDate": start_time,
+        "EndDate": end_time,
+        "FlexibleTimeWindow": {'Mode': 'OFF'},
+        "Target": {
+            'Arn': config["TARGET_ARN"],
+            'RoleArn': config["ROLE_ARN"],
+            'Input': dumps(match)
+        },
+        "State": 'ENABLED',
+        "Description": f"Schedule for fixture: {match['fixture_name']}"
+    }
+
+
+def create_match_schedule(scheduler_client: client, match: dict,
+                          group_name: str, config: dict, schedule_prefix: str) -> None:
+    """Create a single match schedule."""
+    schedule = build_match_schedule(match, group_name, config, schedule_prefix)
+    schedule_name = schedule["Name"]
     try:
-        scheduler_client.create_schedule(
-            Name=schedule_name,
-            GroupName=group_name,
-            ScheduleExpression='cron(* * * * ? *)',
-            StartDate=start_time.isoformat(),
-            EndDate=end_time.isoformat(),
-            FlexibleTimeWindow={'Mode': 'OFF'},
-            Target={
-                'Arn': config["TARGET_ARN"],
-                'RoleArn': config["ROLE_ARN"],
-                'Input': dumps(match)
-            },
-            State='ENABLED',
-            Description=f"Schedule for fixture: {match['fixture_name']}"
-        )
+        scheduler_client.create_schedule(**schedule)
         logging.info("Created schedule: %s.", schedule_name)
 
     except scheduler_client.exceptions.ConflictException:
@@ -133,23 +148,32 @@ def process_daily_schedules(config: dict, schedule_prefix: str) -> dict:
 
     scheduler_client = connect_to_scheduler_client(config)
 
-    api_conn = HTTPSConnection("api.sportmonks.com")
-    fixtures = get_data_from_fixtures(api_conn, config)
-    api_conn.close()
+    with timed("extract_ms"):
+        api_conn = HTTPSConnection(API_HOST)
+        fixtures = get_data_from_fixtures(api_conn, config)
+        api_conn.close()
+    add_metric("fixtures", len(fixtures))
 
-    if not fixtures:
-        return {"statusCode": 200, "body": "No fixtures found today", "matches": []}
+    with timed("schedule_ms"):
+        manage_schedule_groups(scheduler_client, group_name, schedule_prefix)
 
-    manage_schedule_groups(scheduler_client, group_name, schedule_prefix)
+        requests_per_second = config.get("SCHEDULER_REQUESTS_PER_SECOND")
+        counts = reconcile_schedules(
+            scheduler_client, group_name, f"{schedule_prefix}-",
+            [build_match_schedule(match, group_name, config, schedule_prefix)
+             for match in fixtures],
+            requests_per_second=float(requests_per_second) if requests_per_second else None)
 
-    for match in fixtures:
-        create_match_schedule(scheduler_client, match,
-                              group_name, config, schedule_prefix)
+    for name, count in counts.items():
+        add_metric(f"schedules_{name}", count)
 
-    return {"statusCode": 200, "body": f"Created {len(fixtures)} schedules in group {group_name}",
+    return {"statusCode": 200,
+            "body": (f"Created {counts["created"]} schedules, updated {counts["updated"]} "
+                     f"and deleted {counts["deleted"]} in group {group_name}"),
             "matches": fixtures}
 
 
+@profile_handler
 def lambda_handler(event, context):
     """
     AWS Lambda handler function.
@@ -159,12 +183,15 @@ def lambda_handler(event, context):
         context: Lambda context object
 
     Returns:
-        Dictionary with status code and response body
+        Dictionary with status code, response body and the run's metrics
     """
-    load_dotenv()
-    return process_daily_schedules(ENV, 'c17-football')
+    start_run("scheduler")
+    result = process_daily_schedules(ENV, 'c17-football')
+    result["metrics"] = finish_run()
+    return result
 
 
 if __name__ == "__main__":
+    from dotenv import load_dotenv
     load_dotenv()
     result = process_daily_schedules(ENV, 'c17-football')
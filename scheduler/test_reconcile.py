@@ -0,0 +1,148 @@
+# pylint: skip-file
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+from pytest import raises
+
+from fake_scheduler import FakeScheduler
+from reconcile import call_with_retries, get_schedule_changes, reconcile_schedules
+
+GROUP = "c17-football-2025-06-13-fixtures"
+
+
+def build_schedule(match_id, hour=19):
+    return {"Name": f"c17-football-{match_id}", "GroupName": GROUP,
+            "ScheduleExpression": "cron(* * * * ? *)",
+            "StartDate": datetime(2025, 6, 13, hour, tzinfo=timezone.utc),
+            "FlexibleTimeWindow": {"Mode": "OFF"},
+            "Target": {"Arn": "arn:aws:lambda:target", "RoleArn": "arn:aws:iam::role"}}
+
+
+def build_error(code):
+    return ClientError({"Error": {"Code": code, "Message": ""}}, "CreateSchedule")
+
+
+def test_get_schedule_changes():
+    wanted = {name: {"StartDate": 1} for name in ("a", "b", "c")}
+    existing = {"a": {"StartDate": 1}, "b": {"StartDate": 2}, "d": {}}
+
+    assert get_schedule_changes(wanted, existing) == {
+        "create": ["c"], "update": ["b"], "delete": ["d"]}
+
+
+@patch("reconcile.sleep")
+def test_call_with_retries_retries_throttled_requests(mock_sleep):
+    request = MagicMock(side_effect=[build_error("ThrottlingException"), {"ok": True}])
+
+    assert call_with_retries(request) == ({"ok": True}, 1)
+    assert mock_sleep.call_count == 1
+
+
+@patch("reconcile.sleep")
+def test_call_with_retries_raises_other_errors_and_gives_up(mock_sleep):
+    with raises(ClientError):
+        call_with_retries(MagicMock(side_effect=build_error("ValidationException")))
+    with raises(ClientError):
+        call_with_retries(MagicMock(side_effect=build_error("ThrottlingException")),
+                          max_retries=2)
+
+    assert mock_sleep.call_count == 2
+
+
+@patch("reconcile.sleep")
+def test_call_with_retries_waits_for_the_bucket(mock_sleep):
+    bucket = MagicMock()
+    bucket.take.return_value = 0.02
+
+    call_with_retries(MagicMock(return_value={}), bucket=bucket)
+
+    mock_sleep.assert_called_once_with(0.02)
+
+
+def test_reconcile_schedules_creates_updates_and_deletes():
+    with FakeScheduler() as fake:
+        scheduler_client = fake.connect()
+        scheduler_client.create_schedule_group(Name=GROUP)
+        for match_id in (1, 2, 3):
+            scheduler_client.create_schedule(**build_schedule(match_id))
+
+        counts = reconcile_schedules(scheduler_client, GROUP, "c17-football-",
+                                     [build_schedule(1), build_schedule(2, hour=20),
+                                      build_schedule(4)])
+
+        schedules = fake.groups[GROUP]
+
+    assert counts == {"created": 1, "updated": 1, "deleted": 1, "failed": 0,
+                      "retries": 0, "unchanged": 1}
+    assert sorted(schedules) == ["c17-football-1", "c17-football-2", "c17-football-4"]
+    assert schedules["c17-football-2"]["StartDate"] == datetime(
+        2025, 6, 13, 20, tzinfo=timezone.utc).timestamp()
+
+
+@patch("reconcile.sleep")
+def test_reconcile_schedules_retries_throttled_requests(mock_sleep):
+    with FakeScheduler() as fake:
+        scheduler_client = fake.connect()
+        scheduler_client.create_schedule_group(Name=GROUP)
+        fake.fail_next("ThrottlingException", "InternalServerException")
+
+        counts = reconcile_schedules(scheduler_client, GROUP, "c17-football-",
+                                     [build_schedule(match_id) for match_id in range(5)])
+
+        assert len(fake.groups[GROUP]) == 5
+
+    assert counts["created"] == 5
+    assert counts["retries"] == 2
+    assert mock_sleep.call_count == 2
+
+
+def test_reconcile_schedules_updates_schedules_created_since_listing():
+    with FakeScheduler() as fake:
+        scheduler_client = fake.connect()
+        scheduler_client.create_schedule_group(Name=GROUP)
+        scheduler_client.create_schedule(**build_schedule(1))
+
+        with patch("reconcile.list_schedule_names", return_value=[]):
+            counts = reconcile_schedules(scheduler_client, GROUP, "c17-football-",
+                                         [build_schedule(1, hour=20)])
+
+        start_date = fake.groups[GROUP]["c17-football-1"]["StartDate"]
+
+    assert counts["updated"] == 1
+    assert start_date == datetime(2025, 6, 13, 20, tzinfo=timezone.utc).timestamp()
+
+
+def test_reconcile_schedules_creates_schedules_deleted_since_listing():
+    with FakeScheduler() as fake:
+        scheduler_client = fake.connect()
+        scheduler_client.create_schedule_group(Name=GROUP)
+
+        with patch("reconcile.list_schedule_names", return_value=["c17-football-1"]):
+            counts = reconcile_schedules(scheduler_client, GROUP, "c17-football-",
+                                         [build_schedule(1)])
+
+        assert list(fake.groups[GROUP]) == ["c17-football-1"]
+
+    assert counts["created"] == 1
+    assert counts["failed"] == 0
+
+
+def test_reconcile_schedules_carries_on_when_getting_a_schedule_fails():
+    with FakeScheduler() as fake:
+        scheduler_client = fake.connect()
+        scheduler_client.create_schedule_group(Name=GROUP)
+        scheduler_client.create_schedule(**build_schedule(1))
+
+        with patch.object(scheduler_client, "get_schedule",
+                          side_effect=build_error("ValidationException")):
+            counts = reconcile_schedules(scheduler_client, GROUP, "c17-football-",
+                                         [build_schedule(1, hour=20), build_schedule(2)])
+
+        schedules = fake.groups[GROUP]
+
+    assert counts == {"created": 1, "updated": 0, "deleted": 0, "failed": 1,
+                      "retries": 0, "unchanged": 0}
+    assert sorted(schedules) == ["c17-football-1", "c17-football-2"]
+    assert schedules["c17-football-1"]["StartDate"] == datetime(
+        2025, 6, 13, 19, tzinfo=timezone.utc).timestamp()
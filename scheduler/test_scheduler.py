@@ -10,9 +10,13 @@ from scheduler import (
     manage_schedule_groups,
     extract_team_data,
     process_daily_schedules,
-    get_single_fixture
+    get_single_fixture,
+    get_all_daily_fixtures,
+    lambda_handler
 )
 
+COUNTS = {"created": 1, "updated": 0, "deleted": 0, "failed": 0, "retries": 0, "unchanged": 0}
+
 
 def test_extract_team_data_home(sample_fixture_data):
     team = sample_fixture_data[0]["participants"][0]
@@ -46,6 +50,25 @@ def test_extract_team_data_away(sample_fixture_data):
     assert result == expected
 
 
+@patch("scheduler.get_json")
+def test_get_all_daily_fixtures_requests_tomorrow_through_client(mock_get_json,
+                                                                 sample_fixture_data, config):
+    mock_get_json.return_value = {"data": sample_fixture_data,
+                                  "rate_limit": {"remaining": 2999}}
+    fixtures = get_all_daily_fixtures(MagicMock(), config)
+
+    assert fixtures == sample_fixture_data
+    assert mock_get_json.call_args[0][1].startswith("fixtures/date/")
+    assert "include=participants" in mock_get_json.call_args[0][1]
+
+
+@patch("scheduler.get_json")
+def test_get_all_daily_fixtures_returns_client_errors(mock_get_json, config):
+    mock_get_json.return_value = {"error": True, "status": 429, "reason": "Fixture quota used up"}
+
+    assert get_all_daily_fixtures(MagicMock(), config)["status"] == 429
+
+
 @patch("scheduler.get_all_daily_fixtures")
 def test_get_data_from_fixtures(mock_get_all, sample_fixture_data, config):
     conn = MagicMock()
@@ -57,6 +80,16 @@ def test_get_data_from_fixtures(mock_get_all, sample_fixture_data, config):
     assert "team_data" in data[0]
 
 
+@patch("scheduler.get_all_daily_fixtures")
+def test_get_data_from_fixtures_skips_postponed(mock_get_all, sample_fixture_data, config):
+    mock_get_all.return_value = [{**sample_fixture_data[0], "state_id": 1},
+                                 {**sample_fixture_data[0], "id": 102, "state_id": 10}]
+
+    data = get_data_from_fixtures(MagicMock(), config)
+
+    assert [match["match_id"] for match in data] == [101]
+
+
 def test_create_match_schedule_success(sample_fixture_data, config):
     scheduler_client = MagicMock()
 
@@ -102,33 +135,60 @@ def test_manage_schedule_groups_deletes_old():
 @patch("scheduler.HTTPSConnection")
 @patch("scheduler.connect_to_scheduler_client")
 @patch("scheduler.get_data_from_fixtures")
-def test_process_daily_schedules_no_fixtures(mock_get_data, mock_connect, mock_https, config):
+@patch("scheduler.manage_schedule_groups")
+@patch("scheduler.reconcile_schedules")
+def test_process_daily_schedules_no_fixtures_deletes_existing_schedules(
+        mock_reconcile, mock_manage_groups, mock_get_data, mock_connect, mock_https, config):
     mock_get_data.return_value = []
     mock_connect.return_value = MagicMock()
     mock_https.return_value = MagicMock()
+    mock_reconcile.return_value = {**COUNTS, "created": 0, "deleted": 2}
 
     result = process_daily_schedules(config, "c17-football")
 
     assert result["statusCode"] == 200
-    assert result["body"] == "No fixtures found today"
+    assert "deleted 2" in result["body"]
     assert result["matches"] == []
+    assert mock_reconcile.call_args[0][3] == []
 
 
 @patch("scheduler.HTTPSConnection")
 @patch("scheduler.connect_to_scheduler_client")
 @patch("scheduler.get_data_from_fixtures")
 @patch("scheduler.manage_schedule_groups")
-@patch("scheduler.create_match_schedule")
-def test_process_daily_schedules_with_fixtures(mock_create_schedule, mock_manage_groups,
+@patch("scheduler.reconcile_schedules")
+def test_process_daily_schedules_with_fixtures(mock_reconcile, mock_manage_groups,
                                                mock_get_data, mock_connect, mock_https,
                                                sample_fixture_data, config):
     processed_fixtures = [get_single_fixture(sample_fixture_data[0])]
     mock_get_data.return_value = processed_fixtures
     mock_connect.return_value = MagicMock()
     mock_https.return_value = MagicMock()
+    mock_reconcile.return_value = COUNTS
 
     result = process_daily_schedules(config, "c17-football")
 
     assert result["statusCode"] == 200
     assert "Created 1 schedules" in result["body"]
     assert result["matches"] == processed_fixtures
+    assert mock_reconcile.call_args[0][2] == "c17-football-"
+    assert mock_reconcile.call_args[0][3][0]["Name"] == "c17-football-101"
+
+
+@patch("scheduler.HTTPSConnection")
+@patch("scheduler.connect_to_scheduler_client")
+@patch("scheduler.get_data_from_fixtures")
+@patch("scheduler.manage_schedule_groups")
+@patch("scheduler.reconcile_schedules")
+def test_lambda_handler_returns_run_metrics(mock_reconcile, mock_manage_groups,
+                                            mock_get_data, mock_connect, mock_https,
+                                            sample_fixture_data, config):
+    mock_get_data.return_value = [get_single_fixture(sample_fixture_data[0])]
+    mock_reconcile.return_value = COUNTS
+
+    with patch.dict("scheduler.ENV", config):
+        result = lambda_handler({}, None)
+
+    assert result["metrics"]["fixtures"] == 1
+    assert result["metrics"]["schedules_created"] == 1
+    assert {"extract_ms", "schedule_ms", "total_ms"} <= set(result["metrics"])
@@ -3,6 +3,13 @@ from unittest.mock import MagicMock
 
 from pytest import fixture
 
+from resources import CONNECTIONS
+
+
+@fixture(autouse=True)
+def clear_cached_connections():
+    CONNECTIONS.clear()
+
 
 @fixture
 def mock_conn():
@@ -8,6 +8,8 @@ from os import environ as ENV
 
 from psycopg2.extensions import connection
 
+from resources import request_with_reconnect
+
 
 def validate_required_keys(event: dict) -> None:
     """Validates that all required top-level fields are present in the event."""
@@ -65,18 +67,20 @@ def validate_timestamp(timestamp: str) -> None:
 
 
 def fetch_entity_name(entity: str, entity_id: int) -> str:
-    """Fetches entity name (team/league/season) by ID using raw HTTPSConnection."""
-    conn = HTTPSConnection("api.sportmonks.com")
+    """Fetches entity name (team/league/season) by ID over a kept-alive HTTPSConnection."""
     token = ENV["SPORTMONKS_API_TOKEN"]
 
-    conn.request(
-        "GET",
-        f"/v3/football/{entity}/{entity_id}?api_token={token}",
-        headers={}
-    )
-    res = conn.getresponse()
-    body = res.read().decode("utf-8")
-    conn.close()
+    def request_entity(conn: HTTPSConnection):
+        conn.request(
+            "GET",
+            f"/v3/football/{entity}/{entity_id}?api_token={token}",
+            headers={}
+        )
+        res = conn.getresponse()
+        return res, res.read().decode("utf-8")
+
+    res, body = request_with_reconnect(
+        "api.sportmonks.com", request_entity, HTTPSConnection)
 
     if res.status != 200:
         raise ValueError(
@@ -2,12 +2,14 @@ from logging import getLogger
 from json import dumps
 from os import environ as ENV
 
-from dotenv import load_dotenv
 from psycopg2 import connect
 from psycopg2.extensions import connection
 
 from extract_transform import validate_and_transform_data
 from load_data import load_master_data
+from resources import get_cached_db_connection, close_cached_connection
+from metrics import start_run, add_metric, timed, finish_run
+from profiling import profile_handler
 
 
 def get_db_connection(config: dict) -> connection:
@@ -22,25 +24,28 @@ def get_db_connection(config: dict) -> connection:
     )
 
 
+@profile_handler
 def lambda_handler(event: list[dict], context):
     """Lambda entry point for processing and storing match master data."""
-    load_dotenv()
     logger = getLogger()
-    conn = None
+    start_run("seed_master_data")
     try:
-        conn = get_db_connection(ENV)
+        conn = get_cached_db_connection(lambda: get_db_connection(ENV))
         results = []
 
         for match_event in event["matches"]:
             try:
                 logger.info("Received match info.")
 
-                transformed_data = validate_and_transform_data(
-                    match_event, conn)
+                with timed("transform_ms"):
+                    transformed_data = validate_and_transform_data(
+                        match_event, conn)
                 logger.info("Transformed match: %s.",
                             match_event.get("match_id"))
 
-                load_master_data(transformed_data, conn)
+                with timed("load_ms"):
+                    load_master_data(transformed_data, conn)
+                add_metric("matches_seeded", 1)
                 logger.info("Successfully loaded match: %s.",
                             transformed_data["match_id"])
 
@@ -51,31 +56,32 @@ def lambda_handler(event: list[dict], context):
 
             except Exception as e:
                 logger.error("Failed to process match: %s.", str(e))
+                add_metric("matches_failed", 1)
                 results.append({
                     "match_id": match_event["match_id"],
                     "status_code": 200,
                     "error": str(e)
                 })
 
-        conn.close()
         return {
             "status_code": 200,
             "body": dumps({
                 "message": "Scheduled matches seeded.",
                 "results": results
-            })
+            }),
+            "metrics": finish_run()
         }
 
     except Exception as e:
         logger.error("Insert master data pipeline failed: %s.", str(e))
-        if conn:
-            conn.close()
+        close_cached_connection("db")
         raise RuntimeError("Error at runtime.")
 
 
 if __name__ == "__main__":
     event = [{'match_id': 19367875, 'league_id': 1034, 'season_id': 25044, 'fixture_name': 'Gwangju vs Seoul', 'start_time': '2025-06-13 10:30:00', 'team_data': [{'team_1_team_id': 4370, 'team_1_name': 'Gwangju', 'team_1_code': None, 'team_1_image': 'https://cdn.sportmonks.com/images/soccer/teams/18/4370.png', 'team_1_location': 'home'}, {
         'team_2_team_id': 672, 'team_2_name': 'Seoul', 'team_2_code': None, 'team_2_image': 'https://cdn.sportmonks.com/images/soccer/teams/0/672.png', 'team_2_location': 'away'}]}]
+    from dotenv import load_dotenv
     load_dotenv()
     logger = getLogger()
     logger.info("Received match info.")
@@ -0,0 +1,96 @@
+"""
+Opt-in profiling of a Lambda handler with cProfile and tracemalloc.
+Set PROFILE_HANDLER=true to profile a PROFILE_SAMPLE_RATE fraction of invocations,
+reporting the PROFILE_TOP_N hottest functions and allocation sites to the log,
+or to a file in the PROFILE_OUTPUT directory when it is set.
+The same module is copied into each service, as each Lambda image is built from its own directory.
+"""
+
+from datetime import datetime, timezone
+from functools import wraps
+from io import StringIO
+from os import environ as ENV, makedirs
+from os.path import join
+from random import random
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def should_profile() -> bool:
+    """Returns whether this invocation is sampled for profiling."""
+
+    if ENV.get("PROFILE_HANDLER", "").lower() not in ("1", "true", "yes"):
+        return False
+
+    return random() < float(ENV.get("PROFILE_SAMPLE_RATE", "1"))
+
+
+def build_report(name: str, profiler, snapshot, top_n: int) -> str:
+    """Returns the hottest functions by cumulative time, and the largest allocation sites."""
+
+    import pstats  # pylint: disable=import-outside-toplevel
+
+    output = StringIO()
+    output.write(f"Profile of {name}\n\nTop {top_n} functions by cumulative time:\n")
+    pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(top_n)
+
+    output.write(f"Top {top_n} allocation sites:\n")
+    for statistic in snapshot.statistics("lineno")[:top_n]:
+        output.write(f"{statistic}\n")
+
+    return output.getvalue()
+
+
+def write_report(name: str, report: str) -> None:
+    """Writes the report to a file in PROFILE_OUTPUT, or to the log when it is not set."""
+
+    output_dir = ENV.get("PROFILE_OUTPUT")
+    if not output_dir:
+        logger.info(report)
+        return
+
+    makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    path = join(output_dir, f"{name}_{timestamp}.txt")
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(report)
+    logger.info("Wrote profile of %s to %s.", name, path)
+
+
+def profile_handler(handler):
+    """
+    Decorates a Lambda handler to run sampled invocations under cProfile and tracemalloc.
+    Unsampled invocations only pay for reading the environment.
+    """
+
+    @wraps(handler)
+    def wrapper(event=None, context=None):
+
+        if not should_profile():
+            return handler(event, context)
+
+        import cProfile  # pylint: disable=import-outside-toplevel
+        import tracemalloc  # pylint: disable=import-outside-toplevel
+
+        already_tracing = tracemalloc.is_tracing()
+        if not already_tracing:
+            tracemalloc.start()
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return handler(event, context)
+
+        finally:
+            profiler.disable()
+            snapshot = tracemalloc.take_snapshot()
+            if not already_tracing:
+                tracemalloc.stop()
+
+            top_n = int(ENV.get("PROFILE_TOP_N", "20"))
+            write_report(handler.__name__,
+                         build_report(handler.__name__, profiler, snapshot, top_n))
+
+    return wrapper
@@ -0,0 +1,90 @@
+"""
+Connections kept open across warm Lambda invocations.
+A warm container keeps its module state, so connections cached here are
+health checked and reused, instead of opened on every invocation.
+"""
+
+from http.client import HTTPSConnection, HTTPException
+import logging
+
+import psycopg2
+
+CONNECTIONS = {}
+
+
+def is_db_connection_healthy(conn) -> bool:
+    """Returns if a database connection is open and answering queries."""
+
+    if conn.closed:
+        return False
+
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        conn.rollback()
+        return True
+
+    except psycopg2.Error:
+        return False
+
+
+def close_cached_connection(name: str) -> None:
+    """Closes and forgets a cached connection, ignoring errors from a broken one."""
+
+    conn = CONNECTIONS.pop(name, None)
+    if conn is None:
+        return
+
+    try:
+        conn.close()
+    except (psycopg2.Error, OSError) as e:
+        logging.info("Error closing %s connection: %s", name, e)
+
+
+def get_cached_connection(name: str, factory, is_healthy):
+    """Returns the cached connection, opening a new one if it is missing or unhealthy."""
+
+    conn = CONNECTIONS.get(name)
+    if conn is not None and is_healthy(conn):
+        return conn
+
+    if conn is not None:
+        logging.info("Cached %s connection is unhealthy, reconnecting.", name)
+        close_cached_connection(name)
+
+    logging.info("Opening %s connection.", name)
+    CONNECTIONS[name] = factory()
+    return CONNECTIONS[name]
+
+
+def get_cached_db_connection(factory):
+    """Returns the database connection kept open across invocations."""
+
+    return get_cached_connection("db", factory, is_db_connection_healthy)
+
+
+def get_cached_api_connection(host: str, factory=None):
+    """
+    Returns the keep-alive API connection kept open across invocations.
+    A stale socket only shows itself on the next request,
+    so failures are handled by request_with_reconnect.
+    """
+
+    factory = factory or HTTPSConnection
+    return get_cached_connection(f"api:{host}", lambda: factory(host),
+                                 lambda conn: True)
+
+
+def request_with_reconnect(host: str, request, factory=None):
+    """
+    Returns request(conn) run on the cached API connection.
+    If the server closed the kept-alive socket, it retries once on a new connection.
+    """
+
+    try:
+        return request(get_cached_api_connection(host, factory))
+
+    except (HTTPException, ConnectionError) as e:
+        logging.info("API connection to %s failed: %s. Reconnecting.", host, e)
+        close_cached_connection(f"api:{host}")
+        return request(get_cached_api_connection(host, factory))
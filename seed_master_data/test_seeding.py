@@ -7,6 +7,7 @@ from extract_transform import (
     check_entity_in_db, check_competition_exists, check_season_exists,
     check_team_exists
 )
+from handler import lambda_handler
 
 
 def test_validate_required_keys_missing_field():
@@ -202,3 +203,34 @@ def test_check_team_exists_team2_in_db(mock_conn):
     insert_needed = check_team_exists(mock_conn, team_data)
 
     assert not insert_needed
+
+
+@patch("handler.load_master_data")
+@patch("handler.validate_and_transform_data")
+@patch("handler.get_db_connection")
+def test_warm_invocations_reuse_db_connection(mock_get_conn, mock_transform, mock_load):
+    """Test the database connection is opened once across warm invocations."""
+    conn = MagicMock()
+    conn.closed = 0
+    mock_get_conn.return_value = conn
+    mock_transform.return_value = {"match_id": 101}
+
+    for _ in range(100):
+        lambda_handler({"matches": [{"match_id": 101}]}, None)
+
+    assert mock_get_conn.call_count == 1
+    assert not conn.close.called
+
+
+@patch("handler.load_master_data")
+@patch("handler.validate_and_transform_data")
+@patch("handler.get_db_connection")
+def test_lambda_handler_returns_run_metrics(mock_get_conn, mock_transform, mock_load):
+    """Test seeded and failed matches are counted in the run's metrics."""
+    mock_get_conn.return_value = MagicMock(closed=0)
+    mock_transform.side_effect = [{"match_id": 101}, ValueError("bad match")]
+
+    result = lambda_handler({"matches": [{"match_id": 101}, {"match_id": 102}]}, None)
+
+    assert result["metrics"]["matches_seeded"] == 1
+    assert result["metrics"]["matches_failed"] == 1
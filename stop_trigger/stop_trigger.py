@@ -3,9 +3,10 @@ from logging import getLogger, Logger
 from os import environ as ENV
 from json import dumps
 
-from dotenv import load_dotenv
 from boto3 import client
 
+from profiling import profile_handler
+
 
 def connect_to_scheduler_client(config: dict) -> client:
     """Connects to the EventBridge scheduler."""
@@ -47,6 +48,7 @@ def process_schedule_deletion(config: dict, match_id: int, schedule_prefix: str)
     delete_scheduler(scheduler, schedule_name, group_names)
 
 
+@profile_handler
 def lambda_handler(event, context):
     """
         Main Lambda handler function
@@ -56,7 +58,6 @@ def lambda_handler(event, context):
             Dictionary with status code and response body
     """
     try:
-        load_dotenv()
         logger = getLogger()
         logger.info("Received event: %s.", dumps(event))
         match_id = event.get("match_id")
@@ -84,5 +85,6 @@ def lambda_handler(event, context):
 
 
 if __name__ == "__main__":
+    from dotenv import load_dotenv
     load_dotenv()
     process_schedule_deletion(ENV, 123, "c17-football")